@@ -9,6 +9,9 @@ This script provides complete BCH decoding:
 - Chase algorithm for soft-decision decoding
 """
 
+import threading
+from array import array
+
 import numpy as np
 
 # Primitive polynomials for each field (represented as integers, LSB = constant term)
@@ -25,10 +28,106 @@ BCH_PARAMS = {
 }
 
 
+# Largest field for which the dense multiplication table is offered
+MAX_TABLE_M = 10
+
+
+# ============================================================================
+# PROCESS-WIDE CACHE (fields, code constants)
+# ============================================================================
+
+_REGISTRY = {}
+_REGISTRY_LOCK = threading.RLock()
+
+
+def cached(key, builder):
+    """
+    Return the process-wide object stored under key, building it on first use
+    
+    Thread-safe: builder() runs at most once per key until clear_cache().
+    Keys are tuples starting with a kind tag, e.g. ('field', m, poly).
+    """
+    obj = _REGISTRY.get(key)
+    if obj is None:
+        with _REGISTRY_LOCK:
+            obj = _REGISTRY.get(key)
+            if obj is None:
+                obj = builder()
+                _REGISTRY[key] = obj
+    return obj
+
+
+def clear_cache():
+    """Drop every cached field, table and code constant"""
+    with _REGISTRY_LOCK:
+        _REGISTRY.clear()
+
+
+def get_field(m, primitive_poly=None, use_tables=False):
+    """Shared GaloisField for (m, primitive_poly); default poly from PRIMITIVE_POLYS"""
+    if primitive_poly is None:
+        primitive_poly = PRIMITIVE_POLYS[m]
+    gf = cached(('field', m, primitive_poly), lambda: GaloisField(m, primitive_poly))
+    if use_tables and gf.mul_table is None:
+        with _REGISTRY_LOCK:
+            if gf.mul_table is None:
+                gf.enable_tables()
+    return gf
+
+
+def generator_polynomial(gf, t):
+    """
+    Generator polynomial of the t-error-correcting narrow-sense BCH code
+    
+    g(X) = LCM of the minimal polynomials of alpha^1 .. alpha^2t.
+    
+    Returns:
+        Integer with bit i = coefficient of X^i
+    """
+    g = [1]
+    seen = set()
+    for i in range(1, 2 * t + 1):
+        if i % gf.n in seen:
+            continue
+        # Cyclotomic coset of i: roots alpha^(i*2^k) of the same minimal polynomial
+        coset = []
+        e = i % gf.n
+        while e not in coset:
+            coset.append(e)
+            e = (2 * e) % gf.n
+        seen.update(coset)
+        for e in coset:
+            # g(X) *= (X + alpha^e)
+            root = gf.exp_table[e]
+            shifted = [0] + g
+            g = [a ^ gf.multiply(root, b) for a, b in zip(shifted, g + [0])]
+    return sum((c & 1) << i for i, c in enumerate(g))
+
+
+def get_code(code_type):
+    """
+    Shared per-code constants for code_type 1, 2 or 3
+    
+    Returns:
+        Dict with the BCH_PARAMS entries plus
+        'gf': shared GaloisField (table mode enabled)
+        'generator': generator polynomial as an integer (bit i = X^i),
+                     also used by gen_pattern's encoder
+    """
+    def build():
+        params = BCH_PARAMS[code_type]
+        gf = get_field(params['m'], use_tables=True)
+        code = dict(params)
+        code['gf'] = gf
+        code['generator'] = generator_polynomial(gf, params['t'])
+        return code
+    return cached(('code', code_type), build)
+
+
 class GaloisField:
     """Galois Field GF(2^m) arithmetic"""
     
-    def __init__(self, m, primitive_poly):
+    def __init__(self, m, primitive_poly, use_tables=False):
         self.m = m
         self.primitive_poly = primitive_poly
         self.n = (1 << m) - 1  # 2^m - 1
@@ -38,6 +137,11 @@ class GaloisField:
         self.log_table = [0] * (self.n + 1)
         
         self._build_tables()
+        
+        self.mul_table = None  # [2^m, 2^m] uint16 view, set by enable_tables()
+        self.inv_table = None  # [2^m] uint16 view, inv_table[0] = 0
+        if use_tables:
+            self.enable_tables()
     
     def _build_tables(self):
         """Build exponent and logarithm tables"""
@@ -83,6 +187,50 @@ class GaloisField:
         if a == 0:
             raise ValueError("Cannot invert zero")
         return self.exp_table[self.n - self.log_table[a]]
+    
+    def enable_tables(self):
+        """
+        Switch multiply/inverse to dense table lookups (m <= MAX_TABLE_M)
+        
+        The (2^m x 2^m) product table and the inverse table are contiguous
+        uint16 buffers shared by every field object with the same (m,
+        primitive_poly); mul_table / inv_table expose them as NumPy views
+        for the batched decoder stages. For m = 10 the product table is 2 MB.
+        """
+        if self.m > MAX_TABLE_M:
+            raise ValueError(f"Table mode supports m <= {MAX_TABLE_M}, got m={self.m}")
+        
+        def build():
+            size = self.n + 1
+            exp_np = np.asarray(self.exp_table, dtype=np.uint16)
+            log_np = np.asarray(self.log_table, dtype=np.int64)
+            mul = exp_np[log_np[:, None] + log_np[None, :]]
+            mul[0, :] = 0
+            mul[:, 0] = 0
+            inv = np.zeros(size, dtype=np.uint16)
+            inv[1:] = exp_np[self.n - log_np[1:]]
+            return array('H', mul.tobytes()), array('H', inv.tobytes())
+        
+        self._mul, self._inv = cached(('mul_table', self.m, self.primitive_poly), build)
+        self._mul_flat = np.frombuffer(self._mul, dtype=np.uint16)
+        self.mul_table = self._mul_flat.reshape(self.n + 1, self.n + 1)
+        self.inv_table = np.frombuffer(self._inv, dtype=np.uint16)
+        
+        # Closures over local buffers: no attribute lookups per product
+        mul, inv, m = self._mul, self._inv, self.m
+        
+        def multiply(a, b):
+            """Multiply two elements in GF(2^m) with the dense product table"""
+            return mul[(a << m) | b]
+        
+        def inverse(a):
+            """Compute multiplicative inverse of a with the inverse table"""
+            if a == 0:
+                raise ValueError("Cannot invert zero")
+            return inv[a]
+        
+        self.multiply = multiply
+        self.inverse = inverse
 
 
 def parse_llr_input(lines, code_type):
@@ -129,10 +277,71 @@ def compute_syndromes(r, gf, t):
                 alpha_power = gf.alpha_power(i * j)
                 S_i = gf.add(S_i, alpha_power)
         syndromes.append(S_i)
-    
+
     return syndromes
 
 
+def syndrome_index_table(gf, t, n):
+    """
+    Precomputed syndrome constants: table[i-1][j] = alpha^(i*j mod gf.n)
+
+    Returns:
+        uint16 array of shape [2t, n]
+    """
+    i = np.arange(1, 2 * t + 1, dtype=np.int64)[:, None]
+    j = np.arange(n, dtype=np.int64)[None, :]
+    exp_table = np.asarray(gf.exp_table[:gf.n], dtype=np.uint16)
+    return exp_table[(i * j) % gf.n]
+
+
+def _syndrome_bit_matrix(gf, t, n):
+    """
+    Bit-sliced form of syndrome_index_table, shape [n, 2t*m]
+
+    Column (i-1)*m + b holds bit b of alpha^(i*j) for every position j, so
+    (r @ H) mod 2 gives bit b of S_i directly.
+    """
+    def build():
+        table = syndrome_index_table(gf, t, n)
+        bits = (table[:, :, None] >> np.arange(gf.m, dtype=np.uint16)) & 1
+        return np.ascontiguousarray(bits.transpose(1, 0, 2).reshape(n, 2 * t * gf.m),
+                                    dtype=np.float32)
+    return cached(('syndrome_bits', gf.m, gf.primitive_poly, t, n), build)
+
+
+def compute_syndromes_batch(R, gf, t, chunk=65536):
+    """
+    Vectorized syndrome calculation for a batch of received words
+
+    Gives the same values as compute_syndromes, but for all words at once:
+    every syndrome bit is the parity of r against one column of the
+    precomputed alpha^(i*j) bit matrix.
+
+    Args:
+        R: Received words, array-like of shape [batch, n] (or [n]) with 0/1 entries
+        gf: Galois Field object
+        t: Error correction capability
+        chunk: Number of words converted to float32 per step (bounds memory)
+
+    Returns:
+        int64 array of shape [batch, 2t]; row b is [S_1, ..., S_2t] of R[b]
+    """
+    R = np.asarray(R, dtype=np.uint8)
+    if R.ndim == 1:
+        R = R[None, :]
+    batch, n = R.shape
+
+    H = _syndrome_bit_matrix(gf, t, n)
+    weights = np.int64(1) << np.arange(gf.m, dtype=np.int64)
+    S = np.empty((batch, 2 * t), dtype=np.int64)
+    for start in range(0, batch, chunk):
+        block = R[start:start + chunk]
+        # Popcounts are at most n < 2^24, so float32 accumulation is exact
+        parity = (block.astype(np.float32) @ H).astype(np.int64) & 1
+        S[start:start + chunk] = (parity.reshape(-1, 2 * t, gf.m) * weights).sum(axis=2)
+    return S
+
+
 def berlekamp_massey(syndromes, gf, t):
     """
     Berlekamp-Massey algorithm to find error locator polynomial
@@ -140,17 +349,14 @@ def berlekamp_massey(syndromes, gf, t):
     Returns:
         sigma: Error locator polynomial coefficients [σ_0, σ_1, ..., σ_l]
                where σ(X) = σ_0 + σ_1*X + σ_2*X^2 + ... + σ_l*X^l
-        l: Degree of error locator polynomial
+        l: Degree of error locator polynomial; l > t means the word is
+           undecodable (sigma is then truncated to t+1 coefficients)
     """
-    # Initialize
+    # Row mu holds sigma^(mu); sigma^(-1)(X) = 1, d_(-1) = 1, l_(-1) = 0
     sigma = [[0] * (t + 1) for _ in range(2 * t + 1)]
     l = [0] * (2 * t + 1)
     d = [0] * (2 * t + 1)
-    
-    # σ^(-1)(X) = 1
-    sigma[-1 + 1][0] = 1  # Shift index by 1
-    l[-1 + 1] = 0
-    d[-1 + 1] = 1
+    sigma_minus1 = [1] + [0] * t
     
     # σ^(0)(X) = 1
     sigma[0][0] = 1
@@ -159,48 +365,38 @@ def berlekamp_massey(syndromes, gf, t):
     d[0] = syndromes[0]
     
     for mu in range(2 * t):
-        if d[mu] == 0:
-            # No correction needed
-            sigma[mu + 1] = sigma[mu].copy()
-            l[mu + 1] = l[mu]
-        else:
-            # Find the best candidate ρ
-            if mu == 0:
-                # First iteration with d_0 ≠ 0
-                rho = -1 + 1  # Index shift
-                sigma[mu + 1] = sigma[mu].copy()
-                sigma[mu + 1][1] = gf.multiply(d[mu], gf.inverse(d[rho]))
-                l[mu + 1] = 1
+        sigma[mu + 1] = sigma[mu].copy()
+        l[mu + 1] = l[mu]
+        if d[mu] != 0:
+            # Find ρ < μ where d_ρ ≠ 0 and (ρ - l_ρ) is maximum; ρ = -1 if none
+            rho = -1
+            max_val = -1
+            for i in range(mu):
+                if d[i] != 0 and (i - l[i]) > max_val:
+                    rho = i
+                    max_val = i - l[i]
+            
+            if rho == -1:
+                d_rho, l_rho, sigma_rho = 1, 0, sigma_minus1
             else:
-                # Find ρ where d_ρ ≠ 0 and (ρ - l_ρ) is maximum
-                rho = -1
-                max_val = -1
-                for i in range(mu):
-                    if d[i] != 0 and (i - l[i]) > max_val:
-                        rho = i
-                        max_val = i - l[i]
-                
-                if rho == -1:
-                    rho = -1 + 1
-                
-                # Compute correction factor
-                d_mu_inv_d_rho = gf.multiply(d[mu], gf.inverse(d[rho]))
-                
-                # Update σ^(μ+1) = σ^(μ) + (d_μ / d_ρ) * X^(μ-ρ) * σ^(ρ)
-                sigma[mu + 1] = sigma[mu].copy()
-                shift = mu - rho
-                for i in range(t + 1):
-                    if i + shift <= t and sigma[rho][i] != 0:
-                        correction = gf.multiply(d_mu_inv_d_rho, sigma[rho][i])
-                        sigma[mu + 1][i + shift] = gf.add(sigma[mu + 1][i + shift], correction)
-                
-                # Update degree
-                l[mu + 1] = max(l[mu], l[rho] + shift)
-        
-        # Compute next discrepancy d_{μ+1}
+                d_rho, l_rho, sigma_rho = d[rho], l[rho], sigma[rho]
+            
+            # Update σ^(μ+1) = σ^(μ) + (d_μ / d_ρ) * X^(μ-ρ) * σ^(ρ)
+            d_mu_inv_d_rho = gf.multiply(d[mu], gf.inverse(d_rho))
+            shift = mu - rho
+            for i in range(t + 1):
+                if i + shift <= t and sigma_rho[i] != 0:
+                    correction = gf.multiply(d_mu_inv_d_rho, sigma_rho[i])
+                    sigma[mu + 1][i + shift] = gf.add(sigma[mu + 1][i + shift], correction)
+            
+            # Update degree
+            l[mu + 1] = max(l[mu], l_rho + shift)
+        
+        # Compute next discrepancy d_{μ+1} (sigma is truncated to degree t;
+        # once l > t the word is undecodable and the value no longer matters)
         if mu + 1 < 2 * t:
             d[mu + 1] = syndromes[mu + 1]
-            for i in range(1, l[mu + 1] + 1):
+            for i in range(1, min(l[mu + 1], t) + 1):
                 if sigma[mu + 1][i] != 0:
                     d[mu + 1] = gf.add(d[mu + 1], 
                                        gf.multiply(sigma[mu + 1][i], syndromes[mu + 1 - i]))
@@ -208,6 +404,65 @@ def berlekamp_massey(syndromes, gf, t):
     return sigma[2 * t], l[2 * t]
 
 
+def berlekamp_massey_inversionless(syndromes, gf, t):
+    """
+    Simplified inversionless Berlekamp-Massey (SiBM) for binary BCH codes
+
+    Only two working polynomials are kept: the locator sigma(X) and the
+    correction polynomial B(X). Each step updates
+        sigma <- gamma * sigma + delta * X * B
+    with delta the discrepancy and gamma the last nonzero discrepancy, so
+    no field inversion is needed. For binary codes S_2j = S_j^2 makes every
+    odd-step discrepancy zero; those steps are skipped (B is shifted by X^2
+    instead of X), leaving t iterations instead of 2t.
+
+    The locator has the same roots and degree as the one of berlekamp_massey
+    for correctable words, scaled by the nonzero constant sigma_0.
+
+    Returns:
+        sigma: Error locator coefficients [σ_0, σ_1, ..., σ_t] (scaled)
+        l: Degree of error locator polynomial (> t: uncorrectable)
+        stats: Dict with 'iterations', 'multiplies' (GF multiplies done;
+               products with a zero operand or the initial gamma = 1 are
+               skipped) and 'inversions' (always 0)
+    """
+    sigma = [1] + [0] * t
+    B = [1] + [0] * t
+    gamma = 1
+    l = 0
+    multiplies = 0
+
+    for k in range(t):
+        # delta = coefficient of X^(2k+1) in S(X) * sigma(X)
+        delta = 0
+        for i in range(min(l, t, 2 * k) + 1):
+            if sigma[i] != 0 and syndromes[2 * k - i] != 0:
+                delta ^= gf.multiply(sigma[i], syndromes[2 * k - i])
+                multiplies += 1
+
+        new_sigma = [0] * (t + 1)
+        for i in range(t + 1):
+            if sigma[i] != 0 and gamma != 1:
+                new_sigma[i] = gf.multiply(gamma, sigma[i])
+                multiplies += 1
+            else:
+                new_sigma[i] = sigma[i]
+            if i > 0 and delta != 0 and B[i - 1] != 0:
+                new_sigma[i] ^= gf.multiply(delta, B[i - 1])
+                multiplies += 1
+
+        if delta != 0 and l <= k:
+            # Length change: B <- X * sigma (odd step included)
+            B = [0] + sigma[:t]
+            l = 2 * k + 1 - l
+            gamma = delta
+        else:
+            B = [0, 0] + B[:t - 1]
+        sigma = new_sigma
+
+    return sigma, l, {'iterations': t, 'multiplies': multiplies, 'inversions': 0}
+
+
 def chien_search(sigma, l, gf, n):
     """
     Chien search to find error locations
@@ -238,6 +493,251 @@ def chien_search(sigma, l, gf, n):
     return sorted(error_locations)
 
 
+def quadratic_table(gf):
+    """
+    Solutions of y^2 + y = c in GF(2^m), built once per field
+
+    Returns:
+        List of size 2^m; entry c holds one root y (the other is y ^ 1),
+        or -1 when y^2 + y = c has no solution in the field
+    """
+    def build():
+        table = [-1] * (gf.n + 1)
+        for y in range(gf.n + 1):
+            c = gf.multiply(y, y) ^ y
+            if table[c] == -1:
+                table[c] = y
+        return table
+    return cached(('quadratic_table', gf.m, gf.primitive_poly), build)
+
+
+def cubic_table(gf):
+    """
+    Solutions of z^3 + z = d in GF(2^m), built once per field
+
+    Returns:
+        List of size 2^m; entry d holds the list of all roots z (0 to 3)
+    """
+    def build():
+        table = [[] for _ in range(gf.n + 1)]
+        for z in range(gf.n + 1):
+            table[gf.multiply(gf.multiply(z, z), z) ^ z].append(z)
+        return table
+    return cached(('cubic_table', gf.m, gf.primitive_poly), build)
+
+
+def _gf_sqrt(x, gf):
+    """Square root in GF(2^m): x^(2^(m-1))"""
+    if x == 0:
+        return 0
+    return gf.exp_table[(gf.log_table[x] * ((gf.n + 1) // 2)) % gf.n]
+
+
+def _cubic_roots(sigma, gf):
+    """
+    All roots X of sigma_3 X^3 + sigma_2 X^2 + sigma_1 X + sigma_0
+
+    Monic form X^3 + a X^2 + b X + c; X = y + a gives y^3 + p y + q with
+    p = a^2 + b, q = a b + c. For p != 0, y = sqrt(p) z gives
+    z^3 + z = q / sqrt(p)^3, looked up in cubic_table; for p = 0 the roots
+    are the cube roots of q.
+    """
+    mul = gf.multiply
+    lead_inv = gf.inverse(sigma[3])
+    a, b, c = (mul(sigma[i], lead_inv) for i in (2, 1, 0))
+    p = mul(a, a) ^ b
+    q = mul(a, b) ^ c
+
+    if p == 0:
+        if q == 0:
+            return [a]
+        log_q = gf.log_table[q]
+        if gf.n % 3:
+            # x -> x^3 is a bijection: one cube root
+            return [gf.exp_table[(log_q * pow(3, -1, gf.n)) % gf.n] ^ a]
+        if log_q % 3:
+            return []
+        third = gf.n // 3
+        return [gf.exp_table[log_q // 3 + k * third] ^ a for k in range(3)]
+
+    s = _gf_sqrt(p, gf)
+    d = mul(q, gf.inverse(mul(mul(s, s), s)))
+    return [mul(s, z) ^ a for z in cubic_table(gf)[d]]
+
+
+def _affine_roots(B, C, D, gf):
+    """
+    All roots z of z^4 + B z^2 + C z + D
+
+    L(z) = z^4 + B z^2 + C z is linear over GF(2), so the roots are the
+    solutions of the m x m binary system L(z) = D: a particular solution
+    plus the kernel of L (at most 4 roots, since deg L = 4).
+    """
+    mul = gf.multiply
+    basis = []     # (reduced column, combination of unit vectors), pivot = top bit
+    kernel = []
+    for i in range(gf.m):
+        z = 1 << i
+        v = mul(mul(z, z), mul(z, z)) ^ mul(B, mul(z, z)) ^ mul(C, z)
+        combo = z
+        for bv, bc in basis:
+            if v ^ bv < v:
+                v ^= bv
+                combo ^= bc
+        if v:
+            basis.append((v, combo))
+            basis.sort(reverse=True)
+        else:
+            kernel.append(combo)
+
+    v, particular = D, 0
+    for bv, bc in basis:
+        if v ^ bv < v:
+            v ^= bv
+            particular ^= bc
+    if v:
+        return []
+
+    roots = [particular]
+    for k in kernel:
+        roots += [r ^ k for r in roots]
+    return roots
+
+
+def _quartic_roots(sigma, gf):
+    """
+    All roots X of sigma_4 X^4 + ... + sigma_0
+
+    Monic form X^4 + a_3 X^3 + a_2 X^2 + a_1 X + a_0. For a_3 = 0 it is
+    already affine. Otherwise X = y + e with e^2 = a_1 / a_3 removes the
+    linear term, and y = 1/z turns
+        y^4 + a_3 y^3 + b y^2 + d   into   z^4 + (b/d) z^2 + (a_3/d) z + 1/d
+    which is affine. d = 0 means e is a repeated root (the derivative
+    a_3 X^2 + a_1 vanishes there); the rest then solves y^2 + a_3 y + b = 0.
+    """
+    mul = gf.multiply
+    lead_inv = gf.inverse(sigma[4])
+    a3, a2, a1, a0 = (mul(sigma[i], lead_inv) for i in (3, 2, 1, 0))
+    if a3 == 0:
+        return _affine_roots(a2, a1, a0, gf)
+
+    e = _gf_sqrt(mul(a1, gf.inverse(a3)), gf)
+    e2 = mul(e, e)
+    b = mul(a3, e) ^ a2
+    d = mul(e2, e2) ^ mul(a3, mul(e2, e)) ^ mul(a2, e2) ^ mul(a1, e) ^ a0
+    if d == 0:
+        # y^2 (y^2 + a_3 y + b): y = a_3 w with w^2 + w = b / a_3^2
+        w = quadratic_table(gf)[mul(b, gf.inverse(mul(a3, a3)))]
+        if w == -1:
+            return [e]
+        return [e] + [mul(a3, root_w) ^ e for root_w in (w, w ^ 1)]
+    d_inv = gf.inverse(d)
+    zs = _affine_roots(mul(b, d_inv), mul(a3, d_inv), d_inv, gf)
+    return [gf.inverse(z) ^ e for z in zs]
+
+
+def _roots_to_locations(roots, gf, n):
+    """Error positions j < n of locator roots X = alpha^(-j), ascending"""
+    locations = set()
+    for x in roots:
+        if x:
+            j = (-gf.log_table[x]) % gf.n
+            if j < n:
+                locations.add(j)
+    return sorted(locations)
+
+
+def chien_search_fast(sigma, l, gf, n):
+    """
+    Chien search with closed-form solvers and early termination
+
+    Gives the same result as chien_search:
+    - l = 1: the single root alpha^(-j) = sigma_0 / sigma_1 directly
+    - l = 2: substitute X = (sigma_1/sigma_2)*y to get y^2 + y = c, then
+             look y up in quadratic_table
+    - l = 3: reduce to z^3 + z = d and look z up in cubic_table
+    - l = 4: reduce to an affine polynomial and solve it as a binary
+             linear system (see _quartic_roots)
+    - l > 4: chien_scan
+
+    Returns:
+        error_locations: List of error positions (sorted in ascending order)
+    """
+    degree = max((i for i in range(len(sigma)) if sigma[i] != 0), default=0)
+    if degree != l or sigma[0] == 0:
+        # Degenerate locator; only a full scan reproduces chien_search here
+        return chien_search(sigma, l, gf, n)
+    if l == 0:
+        return []
+
+    log_table = gf.log_table
+    if l == 1:
+        j = (log_table[sigma[1]] - log_table[sigma[0]]) % gf.n
+        return [j] if j < n else []
+
+    if l == 2:
+        if sigma[1] == 0:
+            # X^2 = sigma_0 / sigma_2 has the single root sqrt(sigma_0 / sigma_2)
+            log_x = (log_table[sigma[0]] - log_table[sigma[2]]) * ((gf.n + 1) // 2)
+            j = (-log_x) % gf.n
+            return [j] if j < n else []
+        # c = sigma_0 * sigma_2 / sigma_1^2
+        log_c = (log_table[sigma[0]] + log_table[sigma[2]] - 2 * log_table[sigma[1]]) % gf.n
+        y = quadratic_table(gf)[gf.exp_table[log_c]]
+        if y == -1:
+            return []
+        log_scale = log_table[sigma[1]] - log_table[sigma[2]]
+        error_locations = []
+        for root_y in (y, y ^ 1):
+            j = (-(log_scale + log_table[root_y])) % gf.n
+            if j < n:
+                error_locations.append(j)
+        return sorted(error_locations)
+
+    if l == 3:
+        return _roots_to_locations(_cubic_roots(sigma, gf), gf, n)
+    if l == 4:
+        return _roots_to_locations(_quartic_roots(sigma, gf), gf, n)
+
+    return chien_scan(sigma, l, gf, n)
+
+
+def chien_scan(sigma, l, gf, n):
+    """
+    Position-by-position Chien search with early termination
+
+    One log-domain register per coefficient, each stepped by alpha^(-i) per
+    position (as in S_CHI_HARD of bch.v); stops as soon as l roots have
+    been found. Requires sigma_0 != 0 and deg(sigma) = l.
+
+    Returns:
+        error_locations: List of error positions (sorted in ascending order)
+    """
+    # Log-domain registers: reg_i = log(sigma_i * alpha^(-i*j)) at position j
+    log_table = gf.log_table
+    exp_table = gf.exp_table
+    field_n = gf.n
+    terms = [(log_table[sigma[i]], field_n - i) for i in range(1, l + 1) if sigma[i] != 0]
+    regs = [log_s for log_s, _ in terms]
+    steps = [step for _, step in terms]
+    sigma_0 = sigma[0]
+
+    error_locations = []
+    for j in range(n):
+        result = sigma_0
+        for k in range(len(regs)):
+            result ^= exp_table[regs[k]]
+            regs[k] += steps[k]
+            if regs[k] >= field_n:
+                regs[k] -= field_n
+        if result == 0:
+            error_locations.append(j)
+            if len(error_locations) == l:
+                break
+
+    return error_locations
+
+
 def correct_errors(r, error_locations):
     """
     Correct errors in received polynomial
@@ -251,9 +751,11 @@ def correct_errors(r, error_locations):
     return corrected
 
 
-def decode_bch(r, gf, t, n, verbose=True):
+def decode_bch(r, gf, t, n, verbose=True, solver='bm'):
     """
     Complete BCH hard-decision decoding process
+
+    solver selects the key-equation solver (see solve_key_equation).
     """
     if verbose:
         print("\n" + "="*70)
@@ -283,8 +785,13 @@ def decode_bch(r, gf, t, n, verbose=True):
         print("\n  => Non-zero syndromes detected: Errors present")
     
     # Step 2: Berlekamp-Massey algorithm
-    sigma, l = berlekamp_massey(syndromes, gf, t)
-    
+    sigma, l = solve_key_equation(syndromes, gf, t, solver)
+
+    if l > t:
+        if verbose:
+            print(f"\n  => DECODING FAILED: Locator degree {l} exceeds t={t}")
+        return False, [], None
+
     if verbose:
         print("\nStep 2: Berlekamp-Massey Algorithm")
         print("-" * 70)
@@ -299,7 +806,7 @@ def decode_bch(r, gf, t, n, verbose=True):
         print(", ".join(coef_strs) + "]")
     
     # Step 3: Chien search
-    error_locations = chien_search(sigma, l, gf, n)
+    error_locations = chien_search_fast(sigma, l, gf, n)
     
     if verbose:
         print("\nStep 3: Chien Search")
@@ -330,6 +837,434 @@ def decode_bch(r, gf, t, n, verbose=True):
     return True, error_locations, corrected
 
 
+# ============================================================================
+# BATCHED HARD-DECISION DECODING
+# ============================================================================
+
+def _gf_arrays(gf):
+    """NumPy copies of the exp/log tables of gf (built once per field)"""
+    def build():
+        return (np.asarray(gf.exp_table, dtype=np.int64),
+                np.asarray(gf.log_table, dtype=np.int64))
+    return cached(('gf_arrays', gf.m, gf.primitive_poly), build)
+
+
+def _gf_multiply_batch(a, b, gf):
+    """Element-wise GF(2^m) product of two integer arrays"""
+    if gf.mul_table is not None:
+        return gf._mul_flat[(a << gf.m) | b].astype(np.int64)
+    exp_np, log_np = _gf_arrays(gf)
+    prod = exp_np[log_np[a] + log_np[b]]
+    return np.where((a == 0) | (b == 0), 0, prod)
+
+
+def berlekamp_massey_batch(S, gf, t):
+    """
+    Berlekamp-Massey algorithm over a batch of syndrome vectors
+
+    Runs the same recursion as berlekamp_massey (same choice of rho, with
+    rho = -1 standing for sigma^(-1) = 1, d_(-1) = 1, l_(-1) = 0), one
+    iteration for all words. sigma is truncated to t+1 coefficients.
+
+    Args:
+        S: Syndromes, array of shape [batch, 2t]
+        gf: Galois Field object
+        t: Error correction capability
+
+    Returns:
+        sigma: int64 array [batch, t+1] of error locator coefficients
+        l: int64 array [batch] of error locator degrees
+        valid: bool array [batch]; False where the degree exceeds t (the
+               truncated sigma is meaningless there); such words are
+               undecodable
+    """
+    exp_np, log_np = _gf_arrays(gf)
+    S = np.asarray(S, dtype=np.int64)
+    batch = S.shape[0]
+    rows = np.arange(batch)
+
+    sigma = np.zeros((batch, 2 * t + 1, t + 1), dtype=np.int64)
+    l = np.zeros((batch, 2 * t + 1), dtype=np.int64)
+    d = np.zeros((batch, 2 * t + 1), dtype=np.int64)
+
+    sigma[:, 0, 0] = 1
+    d[:, 0] = S[:, 0]
+    unit = np.zeros(t + 1, dtype=np.int64)
+    unit[0] = 1
+
+    for mu in range(2 * t):
+        update = d[:, mu] != 0
+        sigma[:, mu + 1] = sigma[:, mu]
+        l[:, mu + 1] = l[:, mu]
+
+        # rho: first index with d_rho != 0 and maximum (rho - l_rho) > -1,
+        # otherwise rho = -1
+        score = np.where(d[:, :mu] != 0, np.arange(mu) - l[:, :mu], -1)
+        found = score.max(axis=1, initial=-1) > -1
+        best = np.argmax(score, axis=1) if mu else np.zeros(batch, dtype=np.int64)
+        rho = np.where(found, best, -1)
+        d_rho = np.where(found, d[rows, best], 1)
+        l_rho = np.where(found, l[rows, best], 0)
+        sigma_rho = np.where(found[:, None], sigma[rows, best], unit)
+
+        factor = exp_np[(log_np[d[:, mu]] - log_np[d_rho]) % gf.n]
+        shift = mu - rho
+        for i in range(t + 1):
+            dest = i + shift
+            sel = update & (dest <= t) & (sigma_rho[:, i] != 0)
+            if sel.any():
+                correction = _gf_multiply_batch(factor[sel], sigma_rho[sel, i], gf)
+                sigma[rows[sel], mu + 1, dest[sel]] ^= correction
+
+        l[update, mu + 1] = np.maximum(l[update, mu], l_rho[update] + shift[update])
+
+        # Next discrepancy d_{mu+1}
+        if mu + 1 < 2 * t:
+            d_next = S[:, mu + 1].copy()
+            for i in range(1, min(t, mu + 1) + 1):
+                term = _gf_multiply_batch(sigma[:, mu + 1, i], S[:, mu + 1 - i], gf)
+                d_next ^= np.where(i <= l[:, mu + 1], term, 0)
+            d[:, mu + 1] = d_next
+
+    valid = l[:, 2 * t] <= t
+    return sigma[:, 2 * t], l[:, 2 * t], valid
+
+
+def berlekamp_massey_inversionless_batch(S, gf, t):
+    """
+    Inversionless Berlekamp-Massey (SiBM) over a batch of syndrome vectors
+
+    Same recursion as berlekamp_massey_inversionless, one iteration for all
+    words; this is the fixed t-iteration schedule a hardware stage runs.
+
+    Args:
+        S: Syndromes, array of shape [batch, 2t]
+        gf: Galois Field object
+        t: Error correction capability
+
+    Returns:
+        sigma: int64 array [batch, t+1] of (scaled) error locator coefficients
+        l: int64 array [batch] of error locator degrees
+        valid: bool array [batch]; False where l > t (uncorrectable)
+        multiplies: int64 array [batch], GF multiplies per word counted as
+                    in berlekamp_massey_inversionless
+    """
+    S = np.asarray(S, dtype=np.int64)
+    batch = S.shape[0]
+
+    sigma = np.zeros((batch, t + 1), dtype=np.int64)
+    sigma[:, 0] = 1
+    B = sigma.copy()
+    gamma = np.ones(batch, dtype=np.int64)
+    l = np.zeros(batch, dtype=np.int64)
+    multiplies = np.zeros(batch, dtype=np.int64)
+
+    for k in range(t):
+        delta = np.zeros(batch, dtype=np.int64)
+        for i in range(min(t, 2 * k) + 1):
+            used = (i <= l) & (sigma[:, i] != 0) & (S[:, 2 * k - i] != 0)
+            delta ^= np.where(used, _gf_multiply_batch(sigma[:, i], S[:, 2 * k - i], gf), 0)
+            multiplies += used
+
+        XB = np.zeros_like(B)
+        XB[:, 1:] = B[:, :-1]
+        scaled = (sigma != 0) & (gamma != 1)[:, None]
+        corrected = (XB != 0) & (delta != 0)[:, None]
+        new_sigma = (_gf_multiply_batch(gamma[:, None], sigma, gf)
+                     ^ _gf_multiply_batch(delta[:, None], XB, gf))
+        multiplies += scaled.sum(axis=1) + corrected.sum(axis=1)
+
+        change = (delta != 0) & (l <= k)
+        XXB = np.zeros_like(B)
+        XXB[:, 2:] = B[:, :-2]
+        Xsigma = np.zeros_like(sigma)
+        Xsigma[:, 1:] = sigma[:, :-1]
+        B = np.where(change[:, None], Xsigma, XXB)
+        l = np.where(change, 2 * k + 1 - l, l)
+        gamma = np.where(change, delta, gamma)
+        sigma = new_sigma
+
+    return sigma, l, l <= t, multiplies
+
+
+DIRECT_SOLVER_T = (2, 4)
+
+
+def _newton_consistent(sigma, syndromes, t, multiply):
+    """
+    Odd Newton identities of a binary code: sum_i sigma_i S_(2k-1-i) = 0 for
+    k = 1 .. t, with sigma_0 = S_0 = 1
+
+    sigma and syndromes are lists of scalars (multiply = gf.multiply) or of
+    [batch] arrays (multiply = element-wise product); returns True / a bool
+    array where every identity holds
+    """
+    ok = True
+    for k in range(1, t + 1):
+        residual = syndromes[2 * k - 2]
+        for i in range(1, min(2 * k - 1, t) + 1):
+            s = syndromes[2 * k - 2 - i] if i < 2 * k - 1 else 1
+            residual = residual ^ multiply(sigma[i], s)
+        ok = ok & (residual == 0)
+    return ok
+
+
+def direct_locator(syndromes, gf, t):
+    """
+    Error locator by direct solution instead of the Berlekamp-Massey loop
+
+    - t = 2: closed form sigma_1 = S_1, sigma_2 = (S_3 + S_1 S_2) / S_1
+             (the unscaled form of S_BER_HARD in bch.v)
+    - t = 4: Peterson; with sigma_1 = S_1 and sigma_3 = a + S_1 sigma_2
+             (a = S_3 + S_1 S_2) the 4x4 system reduces to
+                 [a   S_1] [sigma_2]   [b + S_2 a]
+                 [b   S_3] [sigma_4] = [c + S_4 a]
+             with b = S_5 + S_1 S_4, c = S_7 + S_1 S_6; a singular system
+             means at most two errors and the t = 2 solution is used
+
+    The result is checked against all odd Newton identities, so a solution
+    is only returned when a locator of degree <= t explains the syndromes.
+    For every word it decodes the locator equals the one of berlekamp_massey.
+
+    Returns:
+        sigma: Error locator coefficients [σ_0 = 1, σ_1, ..., σ_t]
+        l: Degree of error locator polynomial; t + 1 when no locator of
+           degree <= t fits (uncorrectable)
+    """
+    if t not in DIRECT_SOLVER_T:
+        raise ValueError(f"Direct solver supports t in {DIRECT_SOLVER_T}, got t={t}")
+    mul, inv = gf.multiply, gf.inverse
+    S1, S2, S3 = syndromes[0], syndromes[1], syndromes[2]
+    sigma = [1] + [0] * t
+    a = S3 ^ mul(S1, S2)
+
+    D = 0
+    if t == 4:
+        S4, S5, S6, S7 = syndromes[3], syndromes[4], syndromes[5], syndromes[6]
+        b = S5 ^ mul(S1, S4)
+        c = S7 ^ mul(S1, S6)
+        e = b ^ mul(S2, a)
+        f = c ^ mul(S4, a)
+        D = mul(a, S3) ^ mul(b, S1)
+    if D:
+        D_inv = inv(D)
+        sigma[1] = S1
+        sigma[2] = mul(mul(e, S3) ^ mul(f, S1), D_inv)
+        sigma[3] = a ^ mul(S1, sigma[2])
+        sigma[4] = mul(mul(a, f) ^ mul(b, e), D_inv)
+    elif S1:
+        sigma[1] = S1
+        sigma[2] = mul(a, inv(S1))
+
+    if not _newton_consistent(sigma, syndromes, t, mul):
+        return [1] + [0] * t, t + 1
+    l = max(i for i in range(t + 1) if sigma[i])
+    return sigma, l
+
+
+def direct_locator_batch(S, gf, t):
+    """
+    direct_locator over a batch of syndrome vectors
+
+    Args:
+        S: Syndromes, array of shape [batch, 2t]
+        gf: Galois Field object
+        t: 2 or 4
+
+    Returns:
+        sigma: int64 array [batch, t+1] of error locator coefficients
+        l: int64 array [batch] of error locator degrees
+        valid: bool array [batch]; False where no locator of degree <= t fits
+    """
+    if t not in DIRECT_SOLVER_T:
+        raise ValueError(f"Direct solver supports t in {DIRECT_SOLVER_T}, got t={t}")
+    exp_np, log_np = _gf_arrays(gf)
+    S = np.asarray(S, dtype=np.int64)
+    batch = S.shape[0]
+
+    def mul(x, y):
+        return _gf_multiply_batch(x, y, gf)
+
+    def div(x, y):
+        # y != 0 wherever the result is used
+        return np.where(x == 0, 0, exp_np[(log_np[x] - log_np[y]) % gf.n])
+
+    syn = [S[:, j] for j in range(2 * t)]
+    S1, S2, S3 = syn[0], syn[1], syn[2]
+    sigma = [np.ones(batch, dtype=np.int64)] + [np.zeros(batch, dtype=np.int64)
+                                                 for _ in range(t)]
+    a = S3 ^ mul(S1, S2)
+    pair = S1 != 0
+    sigma[1] = np.where(pair, S1, 0)
+    sigma[2] = np.where(pair, div(a, np.where(pair, S1, 1)), 0)
+
+    if t == 4:
+        S4, S5, S6, S7 = syn[3], syn[4], syn[5], syn[6]
+        b = S5 ^ mul(S1, S4)
+        c = S7 ^ mul(S1, S6)
+        e = b ^ mul(S2, a)
+        f = c ^ mul(S4, a)
+        D = mul(a, S3) ^ mul(b, S1)
+        full = D != 0
+        D_safe = np.where(full, D, 1)
+        sigma2 = div(mul(e, S3) ^ mul(f, S1), D_safe)
+        sigma[1] = np.where(full, S1, sigma[1])
+        sigma[2] = np.where(full, sigma2, sigma[2])
+        sigma[3] = np.where(full, a ^ mul(S1, sigma2), 0)
+        sigma[4] = np.where(full, div(mul(a, f) ^ mul(b, e), D_safe), 0)
+
+    valid = _newton_consistent(sigma, syn, t, mul)
+    sigma = np.stack(sigma, axis=1)
+    sigma[~valid] = 0
+    sigma[~valid, 0] = 1
+    nonzero = sigma != 0
+    l = np.where(valid, t - np.argmax(nonzero[:, ::-1], axis=1), t + 1)
+    return sigma, l, valid
+
+
+KEY_EQUATION_SOLVERS = ('bm', 'sibm', 'direct')
+
+
+def solve_key_equation(syndromes, gf, t, solver='bm'):
+    """
+    Error locator of one syndrome vector with the selected solver
+
+    Args:
+        solver: 'bm' (berlekamp_massey), 'sibm'
+                (berlekamp_massey_inversionless, scaled locator) or
+                'direct' (direct_locator: closed form for t = 2, Peterson
+                for t = 4)
+
+    Returns:
+        sigma, l as returned by berlekamp_massey
+    """
+    if solver == 'bm':
+        return berlekamp_massey(syndromes, gf, t)
+    if solver == 'sibm':
+        sigma, l, _ = berlekamp_massey_inversionless(syndromes, gf, t)
+        return sigma, l
+    if solver == 'direct':
+        return direct_locator(syndromes, gf, t)
+    raise ValueError(f"Unknown solver: {solver}. Use one of {KEY_EQUATION_SOLVERS}")
+
+
+def solve_key_equation_batch(S, gf, t, solver='bm'):
+    """
+    Batched counterpart of solve_key_equation
+
+    Returns:
+        sigma, l, valid as returned by berlekamp_massey_batch
+    """
+    if solver == 'bm':
+        return berlekamp_massey_batch(S, gf, t)
+    if solver == 'sibm':
+        return berlekamp_massey_inversionless_batch(S, gf, t)[:3]
+    if solver == 'direct':
+        return direct_locator_batch(S, gf, t)
+    raise ValueError(f"Unknown solver: {solver}. Use one of {KEY_EQUATION_SOLVERS}")
+
+
+def _chien_exponents(gf, width, n):
+    """Exponents of alpha^(-i*j) for degrees i < width and positions j < n"""
+    def build():
+        neg_ij = (-np.arange(width)[:, None] * np.arange(n)[None, :]) % gf.n
+        return neg_ij.astype(np.int32)
+    return cached(('chien', gf.m, gf.primitive_poly, width, n), build)
+
+
+def chien_search_batch(sigma, gf, n, chunk=4096):
+    """
+    Chien search over a batch of error locator polynomials
+
+    Args:
+        sigma: Error locator coefficients, array of shape [batch, t+1]
+        gf: Galois Field object
+        n: Codeword length
+        chunk: Number of polynomials evaluated per step (bounds memory)
+
+    Returns:
+        bool array [batch, n]; entry [b, j] is True when sigma_b(alpha^(-j)) = 0
+    """
+    exp_np, log_np = _gf_arrays(gf)
+    exp16 = exp_np.astype(np.uint16)
+    sigma = np.asarray(sigma, dtype=np.int64)
+    batch, width = sigma.shape
+
+    # Exponent of alpha^(-i*j) for every degree i and position j; log + this
+    # stays below 2n, inside the doubled exp table, so no modulo is needed
+    neg_ij = _chien_exponents(gf, width, n)
+
+    roots = np.zeros((batch, n), dtype=bool)
+    for start in range(0, batch, chunk):
+        coef = sigma[start:start + chunk]
+        log_coef = log_np[coef].astype(np.int32)
+        acc = np.zeros((coef.shape[0], n), dtype=np.uint16)
+        for i in range(width):
+            present = coef[:, i] != 0
+            if not present.any():
+                continue
+            term = exp16[log_coef[present, i, None] + neg_ij[i]]
+            acc[present] ^= term
+        roots[start:start + chunk] = acc == 0
+    return roots
+
+
+def decode_bch_batch(R, code_type, solver='bm'):
+    """
+    Hard-decision BCH decoding of many received words at once
+
+    Syndromes, Berlekamp-Massey and Chien search all run vectorized over the
+    batch; per word the outcome is the same as decode_bch(..., verbose=False).
+
+    Args:
+        R: Received words, array-like of shape [batch, n] with 0/1 entries
+        code_type: 1 for (63,51), 2 for (255,239), 3 for (1023,983)
+        solver: Key-equation solver (see solve_key_equation_batch)
+
+    Returns:
+        success: bool array [batch]
+        num_errors: int64 array [batch], number of error locations found
+        error_locations: int64 array [batch, t], ascending positions padded with -1
+        corrected: uint8 array [batch, n]; failed words are returned unchanged
+    """
+    code = get_code(code_type)
+    n, t, gf = code['n'], code['t'], code['gf']
+
+    R = np.asarray(R, dtype=np.uint8)
+    if R.ndim == 1:
+        R = R[None, :]
+    batch = R.shape[0]
+
+    S = compute_syndromes_batch(R, gf, t)
+    clean = ~S.any(axis=1)
+
+    success = clean.copy()
+    num_errors = np.zeros(batch, dtype=np.int64)
+    error_locations = np.full((batch, t), -1, dtype=np.int64)
+    corrected = R.copy()
+
+    dirty = np.flatnonzero(~clean)
+    if dirty.size == 0:
+        return success, num_errors, error_locations, corrected
+
+    sigma, l, valid = solve_key_equation_batch(S[dirty], gf, t, solver)
+    roots = chien_search_batch(sigma, gf, n)
+    found = roots.sum(axis=1)
+
+    num_errors[dirty] = found
+    success[dirty] = valid & (found == l) & (found <= t)
+
+    # Scatter root positions into the padded location array (ascending per row)
+    root_rows, root_cols = np.nonzero(roots)
+    rank = np.arange(root_rows.size) - np.searchsorted(root_rows, root_rows)
+    error_locations[dirty[root_rows], rank] = root_cols
+
+    fixed = dirty[success[dirty]]
+    corrected[fixed] ^= roots[success[dirty]].astype(np.uint8)
+
+    return success, num_errors, error_locations, corrected
+
+
 # ============================================================================
 # SOFT-DECISION DECODING (Chase Algorithm)
 # ============================================================================
@@ -512,8 +1447,8 @@ def decode_bch_soft_decision(r, llr_values, gf, t, n, p=2, verbose=True):
                 llr_vals.append(f"r{pos}={llr_values[llr_idx]}")
         print(", ".join(llr_vals))
     
-    # Step 2: Generate 2^p test patterns
-    test_patterns = generate_test_patterns(r, least_reliable, p)
+    # Step 2: Enumerate 2^p test patterns
+    num_patterns = 2 ** p
     
     # 記錄每個 pattern 翻轉了哪些位置
     pattern_flipped_bits = []
@@ -527,7 +1462,7 @@ def decode_bch_soft_decision(r, llr_values, gf, t, n, p=2, verbose=True):
     if verbose:
         print(f"\nStep 2: Generate Test Patterns")
         print("-" * 70)
-        print(f"  Generated {len(test_patterns)} test patterns")
+        print(f"  Generated {num_patterns} test patterns")
         for idx, flipped in enumerate(pattern_flipped_bits):
             flip_str = ", ".join([f"r{pos}" for pos in flipped]) if flipped else "none"
             print(f"    Pattern {idx}: flip [{flip_str}]")
@@ -537,16 +1472,28 @@ def decode_bch_soft_decision(r, llr_values, gf, t, n, p=2, verbose=True):
         print(f"\nStep 3: Decode Test Patterns")
         print("-" * 70)
     
+    # Syndromes of r are computed once. Patterns are visited in Gray-code
+    # order, so each step flips one bit and XORs alpha^(i*pos) into S_i.
+    syndrome_deltas = [[gf.alpha_power(i * pos) for i in range(1, 2 * t + 1)]
+                       for pos in least_reliable]
+    pattern = list(r)
+    syndromes = compute_syndromes(pattern, gf, t)
+    prev_idx = 0
+    
     results = []
-    for idx, pattern in enumerate(test_patterns):
+    for step in range(num_patterns):
+        idx = step ^ (step >> 1)
+        if step > 0:
+            j = (idx ^ prev_idx).bit_length() - 1
+            pattern[least_reliable[j]] ^= 1
+            syndromes = [s ^ delta for s, delta in zip(syndromes, syndrome_deltas[j])]
+            prev_idx = idx
+        
         if verbose:
             print(f"\n  --- Pattern {idx} ---")
             flip_str = ", ".join([f"r{pos}" for pos in pattern_flipped_bits[idx]]) if pattern_flipped_bits[idx] else "none"
             print(f"  Flipped bits: [{flip_str}]")
         
-        # Compute syndromes
-        syndromes = compute_syndromes(pattern, gf, t)
-        
         if verbose:
             print(f"  Syndromes:")
             for i, S in enumerate(syndromes, 1):
@@ -575,6 +1522,12 @@ def decode_bch_soft_decision(r, llr_values, gf, t, n, p=2, verbose=True):
         # Berlekamp-Massey
         sigma, l = berlekamp_massey(syndromes, gf, t)
         
+        if l > t:
+            if verbose:
+                print(f"  Error locator degree {l} exceeds t={t}")
+                print(f"  => DECODING FAILED for this pattern")
+            continue
+        
         if verbose:
             print(f"  Error locator polynomial:")
             print(f"    Degree: l = {l}")
@@ -616,7 +1569,7 @@ def decode_bch_soft_decision(r, llr_values, gf, t, n, p=2, verbose=True):
             print(" + ".join(terms) if terms else "0")
         
         # Chien search
-        error_locs_in_pattern = chien_search(sigma, l, gf, n)
+        error_locs_in_pattern = chien_search_fast(sigma, l, gf, n)
         
         if verbose:
             print(f"  Chien search roots: {error_locs_in_pattern}")
@@ -659,9 +1612,12 @@ def decode_bch_soft_decision(r, llr_values, gf, t, n, p=2, verbose=True):
             'errors_from_r': error_from_original_r
         })
     
+    # Restore pattern-index order so ties in correlation resolve as before
+    results.sort(key=lambda result: result['pattern_idx'])
+    
     if verbose:
         print(f"\n" + "-" * 70)
-        print(f"Summary: Successfully decoded {len(results)}/{len(test_patterns)} patterns")
+        print(f"Summary: Successfully decoded {len(results)}/{num_patterns} patterns")
     
     if not results:
         if verbose:
@@ -690,6 +1646,154 @@ def decode_bch_soft_decision(r, llr_values, gf, t, n, p=2, verbose=True):
     return True, final_error_locations, best['corrected']
 
 
+# ============================================================================
+# CONFIGURABLE CHASE ENGINE (Chase-I / II / III, large p, pruning)
+# ============================================================================
+
+CHASE_VARIANTS = (1, 2, 3)
+
+
+def iter_chase_patterns(p, t, variant=2):
+    """
+    Lazily yield Chase test patterns as bit masks over the p least reliable bits
+
+    Bit j of a mask flips the j-th least reliable position, so a mask equals
+    the pattern index used by decode_bch_soft_decision.
+
+    Variants:
+        1: Chase-I restricted to the p least reliable bits: every pattern
+           of weight <= t
+        2: Chase-II: all 2^p patterns, in Gray-code order
+        3: Chase-III: flip the w least reliable bits for w = 0, 2, 4, ...
+           up to min(2t, p)
+    """
+    if variant == 1:
+        from itertools import combinations
+        for weight in range(min(t, p) + 1):
+            for bits in combinations(range(p), weight):
+                yield sum(1 << j for j in bits)
+    elif variant == 2:
+        for step in range(2 ** p):
+            yield step ^ (step >> 1)
+    elif variant == 3:
+        for weight in range(0, min(2 * t, p) + 1, 2):
+            yield (1 << weight) - 1
+    else:
+        raise ValueError(f"Unknown Chase variant: {variant}. Use one of {CHASE_VARIANTS}")
+
+
+def decode_bch_chase(r, llr_values, gf, t, n, p=2, variant=2, prune=True, solver='bm'):
+    """
+    Chase soft-decision decoding with streamed test patterns and pruning
+
+    Test patterns come from iter_chase_patterns and are never materialised;
+    the syndromes of each pattern are derived from the previous pattern by
+    XOR-ing alpha^(i*pos) for every bit that changes. For variant 2 the
+    result is the same as decode_bch_soft_decision with the same p.
+
+    With prune=True (and r equal to the hard decision of the LLRs):
+    - a pattern is skipped when even the best candidate it could produce
+      (flipping back its t most reliable flipped bits) cannot beat the
+      current best correlation
+    - the search stops once the best codeword meets the minimum-distance
+      optimality bound, i.e. no codeword at all can have a higher
+      correlation
+
+    Args:
+        r: Received polynomial (hard decision from LLR)
+        llr_values: Original LLR values
+        gf: Galois Field object
+        t: Error correction capability
+        n: Codeword length
+        p: Number of least reliable bits (default: 2, practical up to ~12)
+        variant: Chase variant 1, 2 or 3 (default: 2)
+        prune: Skip patterns that cannot improve the result (default: True)
+        solver: Key-equation solver (see solve_key_equation)
+
+    Returns:
+        success: Boolean indicating if decoding succeeded
+        error_locations: List of error positions (relative to original r)
+        corrected: Corrected codeword (or None if failed)
+        stats: Dict with 'patterns' (test patterns enumerated), 'decoded'
+               (patterns run through the hard decoder) and 'pruned'
+    """
+    if solver not in KEY_EQUATION_SOLVERS:
+        raise ValueError(f"Unknown solver: {solver}. Use one of {KEY_EQUATION_SOLVERS}")
+    least_reliable = find_least_reliable_bits(llr_values, n, p)
+    p = len(least_reliable)
+
+    # w[i] = l_i * (1 - 2 r_i): correlation lost (twice) by flipping r_i
+    w = [0] * n
+    for i in range(n):
+        llr_idx = n - i
+        if llr_idx < len(llr_values):
+            w[i] = llr_values[llr_idx] * (1 - 2 * r[i])
+    base_correlation = sum(w)
+    prune = prune and min(w) >= 0
+    order = sorted(range(n), key=lambda i: w[i])
+
+    syndrome_deltas = [[gf.alpha_power(i * pos) for i in range(1, 2 * t + 1)]
+                       for pos in least_reliable]
+    syndromes = compute_syndromes(r, gf, t)
+    prev_mask = 0
+
+    stats = {'patterns': 0, 'decoded': 0, 'pruned': 0}
+    best = None  # (correlation, -pattern_idx, errors_from_r)
+
+    for mask in iter_chase_patterns(p, t, variant):
+        stats['patterns'] += 1
+
+        # Move the syndromes from the previous mask to this one
+        changed = mask ^ prev_mask
+        while changed:
+            j = (changed & -changed).bit_length() - 1
+            changed &= changed - 1
+            syndromes = [s ^ delta for s, delta in zip(syndromes, syndrome_deltas[j])]
+        prev_mask = mask
+
+        flipped = [least_reliable[j] for j in range(p) if (mask >> j) & 1]
+
+        if prune and best is not None:
+            flipped_w = sorted((w[pos] for pos in flipped), reverse=True)
+            bound = base_correlation - 2 * sum(flipped_w[t:])
+            if (bound, -mask) < best[:2]:
+                stats['pruned'] += 1
+                continue
+
+        stats['decoded'] += 1
+        if any(syndromes):
+            sigma, l = solve_key_equation(syndromes, gf, t, solver)
+            if l > t:
+                continue
+            error_locs_in_pattern = chien_search_fast(sigma, l, gf, n)
+            if len(error_locs_in_pattern) != l or len(error_locs_in_pattern) > t:
+                continue
+        else:
+            error_locs_in_pattern = []
+
+        errors_from_r = sorted(set(flipped).symmetric_difference(error_locs_in_pattern))
+        discrepancy = sum(w[pos] for pos in errors_from_r)
+        candidate = (base_correlation - 2 * discrepancy, -mask, errors_from_r)
+        if best is None or candidate[:2] > best[:2]:
+            best = candidate
+
+            if prune:
+                # Any other codeword differs from this one in >= 2t+1 places,
+                # at least (2t+1 - |errors|) of them where this one agrees with r
+                need = 2 * t + 1 - len(errors_from_r)
+                in_errors = set(errors_from_r)
+                others = (w[i] for i in order if i not in in_errors)
+                optimality_bound = sum(next(others, 0) for _ in range(max(need, 0)))
+                if discrepancy < optimality_bound:
+                    break
+
+    if best is None:
+        return False, [], None, stats
+
+    errors_from_r = best[2]
+    return True, errors_from_r, correct_errors(list(r), errors_from_r), stats
+
+
 # ============================================================================
 # UNIFIED DECODER INTERFACE
 # ============================================================================
@@ -774,7 +1878,7 @@ def print_polynomial(sigma, l, gf, poly_name="σ(X)"):
 # MAIN FUNCTIONS
 # ============================================================================
 
-def main(mode='hard', code_type=None):
+def main(mode='hard', code_type=None, p=2, variant=2):
     """
     Main function to demonstrate BCH decoding
     
@@ -782,6 +1886,9 @@ def main(mode='hard', code_type=None):
         mode: 'hard' for hard-decision, 'soft' for soft-decision
         code_type: 1 for (63,51) m=6, 2 for (255,239) m=8, 3 for (1023,983) m=10
                    None for all codes
+        p: Number of least reliable bits for soft-decision (default: 2)
+        variant: Chase variant for soft-decision (default: 2, the step-by-step
+                 decode_bch_soft_decision; 1 and 3 run decode_bch_chase)
     """
     print("=" * 70)
     print(f"BCH Decoder Verification Tool - {mode.upper()}-DECISION MODE")
@@ -819,7 +1926,7 @@ def main(mode='hard', code_type=None):
         print(f"{'='*70}")
         
         # Create Galois Field
-        gf = GaloisField(m, PRIMITIVE_POLYS[m])
+        gf = get_field(m)
         
         # Parse input
         r, llr_values = parse_llr_input(lines, ct)
@@ -834,10 +1941,22 @@ def main(mode='hard', code_type=None):
         # Perform decoding based on mode
         if mode == 'hard':
             success, error_locs, corrected = decode_bch(r, gf, t, n, verbose=True)
-        else:  # soft
+        elif variant == 2:
             success, error_locs, corrected = decode_bch_soft_decision(
-                r, llr_values, gf, t, n, p=2, verbose=True
+                r, llr_values, gf, t, n, p=p, verbose=True
+            )
+        else:
+            success, error_locs, corrected, stats = decode_bch_chase(
+                r, llr_values, gf, t, n, p=p, variant=variant
             )
+            print(f"\nChase-{'I' * variant} decoding (p={p}):")
+            print("-" * 70)
+            print(f"  Test patterns: {stats['patterns']} "
+                  f"({stats['decoded']} decoded, {stats['pruned']} pruned)")
+            if success:
+                print(f"  Error locations: {error_locs}")
+            else:
+                print("  => DECODING FAILED")
         
         if success and corrected is not None:
             # Verify correction by computing syndromes of corrected word
@@ -864,7 +1983,7 @@ def test_with_known_errors(mode='hard'):
         
         print(f"\n--- ({n}, {k}) BCH Code ---")
         
-        gf = GaloisField(m, PRIMITIVE_POLYS[m])
+        gf = get_field(m)
         
         # Test 1: No errors
         print("\nTest 1: No errors")
@@ -904,10 +2023,10 @@ def test_with_known_errors(mode='hard'):
         print("  PASS")
 
 
-def test_soft_decision():
+def test_soft_decision(p=2, variant=2):
     """Test soft-decision decoding with cases where hard-decision fails"""
     print("\n" + "=" * 70)
-    print("Testing Soft-Decision Decoding (Chase Algorithm)")
+    print(f"Testing Soft-Decision Decoding (Chase-{'I' * variant}, p={p})")
     print("=" * 70)
     
     for code_type in [1, 2, 3]:
@@ -916,7 +2035,7 @@ def test_soft_decision():
         
         print(f"\n--- ({n}, {k}) BCH Code, t={t} ---")
         
-        gf = GaloisField(m, PRIMITIVE_POLYS[m])
+        gf = get_field(m)
         
         # Create a scenario with t+1 errors where soft-decision can help
         # The idea: t+1 errors, but one of them is at a "least reliable" position
@@ -948,12 +2067,54 @@ def test_soft_decision():
         
         # Soft decision might succeed
         print("  Soft-decision decoding:")
-        success_soft, locs, corrected = decode_bch_soft_decision(
-            r, llr_values, gf, t, n, p=2, verbose=False
+        success_soft, locs, corrected, stats = decode_bch_chase(
+            r, llr_values, gf, t, n, p=p, variant=variant
         )
         print(f"    Result: {'SUCCESS' if success_soft else 'FAILED'}")
         if success_soft:
             print(f"    Error locations found: {locs}")
+        print(f"    Patterns decoded: {stats['decoded']}/{stats['patterns']} "
+              f"({stats['pruned']} pruned)")
+
+
+def benchmark_root_finding(code_type=3, count=500, seed=0):
+    """
+    Time chien_search, chien_scan and chien_search_fast per locator degree
+
+    Locators come from random words with 1..t errors; every result of the
+    faster searches is checked against chien_search.
+    """
+    import random
+    import time
+
+    params = BCH_PARAMS[code_type]
+    n, k, m, t = params['n'], params['k'], params['m'], params['t']
+    gf = get_field(m)
+    rng = random.Random(seed)
+
+    print("\n" + "=" * 70)
+    print(f"Root Finding Benchmark: ({n}, {k}) BCH Code, t={t}, {count} locators per degree")
+    print("=" * 70)
+    print(f"  {'l':>2}  {'chien_search':>14}  {'chien_scan':>14}  {'chien_search_fast':>18}  speedup")
+
+    for l in range(1, t + 1):
+        locators = []
+        for _ in range(count):
+            r = [0] * n
+            for pos in rng.sample(range(n), l):
+                r[pos] = 1
+            sigma, degree = berlekamp_massey_inversionless(compute_syndromes(r, gf, t), gf, t)[:2]
+            locators.append((sigma, degree))
+
+        timings = []
+        results = []
+        for search in (chien_search, chien_scan, chien_search_fast):
+            start = time.perf_counter()
+            results.append([search(sigma, degree, gf, n) for sigma, degree in locators])
+            timings.append((time.perf_counter() - start) / count * 1e6)
+        status = "" if results[0] == results[1] == results[2] else "  MISMATCH"
+        print(f"  {l:>2}  {timings[0]:>11.1f} us  {timings[1]:>11.1f} us  "
+              f"{timings[2]:>15.1f} us  {timings[0] / timings[2]:>6.0f}x{status}")
 
 
 if __name__ == "__main__":
@@ -962,23 +2123,31 @@ if __name__ == "__main__":
     # Default settings
     mode = 'hard'
     code_type = None  # None = 全部執行
+    p = 2
+    variant = 2
     
     # Parse command line arguments
-    # Usage: python bch_decoder.py [hard|soft] [1|2|3]
-    #        python bch_decoder.py test
+    # Usage: python bch_decoder.py [hard|soft] [1|2|3] [p=N] [chase=1|2|3]
+    #        python bch_decoder.py test [p=N] [chase=1|2|3]
+    #        python bch_decoder.py bench [1|2|3]
     
     args = sys.argv[1:]
+    run_tests = False
+    run_bench = False
     
     for arg in args:
-        if arg in ['hard', 'soft']:
+        if arg.startswith('p=') and arg[2:].isdigit():
+            p = int(arg[2:])
+        elif arg in ['chase=1', 'chase=2', 'chase=3']:
+            variant = int(arg[6:])
+        elif arg in ['hard', 'soft']:
             mode = arg
         elif arg in ['1', '2', '3']:
             code_type = int(arg)
         elif arg == 'test':
-            # Run tests
-            test_with_known_errors('hard')
-            test_soft_decision()
-            sys.exit(0)
+            run_tests = True
+        elif arg == 'bench':
+            run_bench = True
         elif arg in ['-h', '--help', 'help']:
             print(f"Usage: {sys.argv[0]} [mode] [code_type]")
             print()
@@ -986,6 +2155,7 @@ if __name__ == "__main__":
             print("  hard    Hard-decision decoding (default)")
             print("  soft    Soft-decision decoding (Chase algorithm)")
             print("  test    Run test cases")
+            print("  bench   Benchmark root finding (Chien search vs closed forms)")
             print()
             print("Code Type:")
             print("  1       (63, 51) BCH code, m=6, t=2")
@@ -993,16 +2163,32 @@ if __name__ == "__main__":
             print("  3       (1023, 983) BCH code, m=10, t=4")
             print("  (none)  Run all three codes")
             print()
+            print("Soft-decision options:")
+            print("  p=N       Number of least reliable bits (default: 2)")
+            print("  chase=V   Chase variant 1, 2 or 3 (default: 2)")
+            print()
             print("Examples:")
             print(f"  {sys.argv[0]} hard 1      # Hard-decision, (63,51) only")
             print(f"  {sys.argv[0]} soft 2      # Soft-decision, (255,239) only")
             print(f"  {sys.argv[0]} soft        # Soft-decision, all codes")
             print(f"  {sys.argv[0]} 3           # Hard-decision (default), (1023,983) only")
+            print(f"  {sys.argv[0]} soft 3 p=6  # Soft-decision with 2^6 test patterns")
             sys.exit(0)
         else:
             print(f"Unknown argument: {arg}")
             print(f"Use '{sys.argv[0]} --help' for usage information.")
             sys.exit(1)
     
+    if run_bench:
+        for ct in ([code_type] if code_type else [1, 2, 3]):
+            benchmark_root_finding(ct)
+        sys.exit(0)
+
+    if run_tests:
+        # Run tests
+        test_with_known_errors('hard')
+        test_soft_decision(p=p, variant=variant)
+        sys.exit(0)
+    
     # Run main with selected mode and code type
-    main(mode=mode, code_type=code_type)
\ No newline at end of file
+    main(mode=mode, code_type=code_type, p=p, variant=variant)
\ No newline at end of file
@@ -0,0 +1,621 @@
+#!/usr/bin/env python3
+"""
+Cycle-Accurate Model of bch.v
+
+Steps the control FSM of the `bch` module one clock at a time (S_IDLE,
+S_LOAD, S_BER_*, S_CHI_*, S_CORR_*, S_OUT_*) with the same counters,
+early exits and output sequencing as the RTL, and reports per codeword:
+- latency: cycles from the cycle `set` is high to the first cycle with
+           finish = 1
+- cycles:  cycles until the FSM is back in S_IDLE
+- odata:   the odata values presented while finish = 1
+
+The datapath values the FSM branches on are computed up front, in batch:
+- syndromes (compute_syndromes_batch); all-zero -> 1023 right after S_LOAD
+- hard t=2: the closed-form locator of S_BER_HARD,
+  sigma = S1 + S1^2 X + (S3 + S1 S2) X^2
+- otherwise: the inversionless Berlekamp-Massey recursion of the RTL
+  (berlekamp_massey_inversionless_batch, same roots); words with a locator
+  degree above t are treated as locators of degree t+1
+- the two least reliable positions exactly as the `swiss` min tree and
+  the min1/min2 merge in S_LOAD pick them (ties, 7-bit |LLR|, dummy X^n
+  forced to 127)
+- Chien roots of each candidate (chien_search_batch), recorded in the
+  order S_CHI_* finds them (highest position first)
+
+The correlation and output logic of S_CORR_1 .. S_OUT_SOFT is modelled as
+written, including that S_CORR_1 leaves after the first root for code 3.
+For uncorrectable words the RTL locator may differ from the one used here,
+so the root set (not the control flow) of such words is approximate.
+"""
+
+from collections import namedtuple
+
+import numpy as np
+
+from bch_decoders import (BCH_PARAMS, berlekamp_massey_inversionless_batch,
+                          chien_search_batch, compute_syndromes_batch, get_field,
+                          _gf_multiply_batch)
+
+# FSM states (localparams of bch.v)
+S_IDLE = 0
+S_LOAD = 1
+S_CORR_2 = 2
+S_BER_HARD = 3
+S_BER_SOFT1 = 4
+S_BER_SOFT2 = 5
+S_CHI_HARD = 6
+S_CHI_SOFT1 = 7
+S_CHI_SOFT2 = 8
+S_CORR_1 = 9
+S_OUT_HARD_BUFF = 10
+S_OUT_HARD = 11
+S_OUT_SOFT_BUFF = 13
+S_OUT_SOFT_BUFF2 = 14
+S_OUT_SOFT = 15
+
+STATE_NAMES = {value: name for name, value in globals().items()
+               if name.startswith('S_') and isinstance(value, int)}
+
+# Per-code constants of bch.v
+BER_CNT_MAX = {1: 8, 2: 8, 3: 16}          # ber_cnt_max_w (soft)
+CHIEN_CNT_MAX = {1: 8, 2: 32, 3: 128}      # chien_cnt_max_w
+NO_ERROR = 1023
+CNT_MASK = 1023                            # cnt_r is 10 bits
+
+# test.v: next `set` comes 10 cycles after the cycle finish rises;
+# "Time =" adds 6.5 cycles of reset/start-up on top
+TB_GAP_CYCLES = 10
+TB_START_CYCLES = 6.5
+
+Datapath = namedtuple('Datapath', [
+    'code_type', 'mode', 'syndrome_zero',
+    'power',       # locator degree per candidate (t+1 = undecodable)
+    'roots',       # Chien roots per candidate, in detection order
+    'index1', 'index2', 'min1', 'min2',
+    'abs_llr',     # 7-bit |LLR| per position (soft), else None
+])
+Datapath.__doc__ = """Datapath values the bch.v FSM branches on, for one codeword
+
+    Candidates (soft): 0 = r, 1 = r with index1 flipped, 2 = index2
+    flipped, 3 = both flipped. Hard words only use candidate 0.
+"""
+
+CycleResult = namedtuple('CycleResult', ['code_type', 'mode', 'latency', 'cycles',
+                                         'odata', 'state_cycles', 'trace'])
+CycleResult.__doc__ = """Outcome of one codeword
+
+    latency: Cycle (0 = cycle with set high) in which finish first is 1
+    cycles: Cycle in which the FSM is back in S_IDLE
+    odata: odata values while finish = 1
+    state_cycles: Dict state name -> cycles spent
+    trace: [(cycle, state name, cnt, finish, odata), ...] or None
+"""
+
+
+# ============================================================================
+# DATAPATH
+# ============================================================================
+
+def abs7(llr):
+    """|LLR| as abs_idata computes it: 7 bits, so -128 maps to 0"""
+    llr = np.asarray(llr, dtype=np.int64)
+    return np.where(llr < 0, -llr, llr) & 0x7F
+
+
+def swiss_min2(values, cnt):
+    """
+    Two smallest of 8 values through the 3-stage tree of module `swiss`
+
+    Args:
+        values: int array [batch, 8], abs_data0 .. abs_data7
+        cnt: cnt_r of the row (abs_data_i belongs to position cnt - i)
+
+    Returns:
+        (min_1, min_2, index_1, index_2), int arrays [batch]
+    """
+    v = [values[:, i] for i in range(8)]
+    idx = [np.full(values.shape[0], cnt - i) for i in range(8)]
+
+    # Stage 1: sort pairs (2i, 2i+1); ties go to the odd input
+    s1_1, s1_0, i1_1, i1_0 = [], [], [], []
+    for i in range(4):
+        lt = v[2 * i] < v[2 * i + 1]
+        s1_1.append(np.where(lt, v[2 * i], v[2 * i + 1]))
+        s1_0.append(np.where(lt, v[2 * i + 1], v[2 * i]))
+        i1_1.append(np.where(lt, idx[2 * i], idx[2 * i + 1]))
+        i1_0.append(np.where(lt, idx[2 * i + 1], idx[2 * i]))
+
+    # Stage 2
+    t11, t10, t01, j11, j10, j01 = [], [], [], [], [], []
+    for i in range(2):
+        lt = s1_1[2 * i] < s1_1[2 * i + 1]
+        t11.append(np.where(lt, s1_1[2 * i], s1_1[2 * i + 1]))
+        t10.append(np.where(lt, s1_1[2 * i + 1], s1_1[2 * i]))
+        j11.append(np.where(lt, i1_1[2 * i], i1_1[2 * i + 1]))
+        j10.append(np.where(lt, i1_1[2 * i + 1], i1_1[2 * i]))
+        lt = s1_0[2 * i] < s1_0[2 * i + 1]
+        t01.append(np.where(lt, s1_0[2 * i], s1_0[2 * i + 1]))
+        j01.append(np.where(lt, i1_0[2 * i], i1_0[2 * i + 1]))
+
+    lt = t11[0] < t11[1]
+    s2_min = np.where(lt, t11[0], t11[1])
+    s2_110 = np.where(lt, t11[1], t11[0])
+    k2_min = np.where(lt, j11[0], j11[1])
+    k2_110 = np.where(lt, j11[1], j11[0])
+    s2_101, k2_101 = [], []
+    for i in range(2):
+        lt = t10[i] < t01[i]
+        s2_101.append(np.where(lt, t10[i], t01[i]))
+        k2_101.append(np.where(lt, j10[i], j01[i]))
+
+    # Stage 3
+    lt = s2_101[0] < s2_101[1]
+    cand = np.where(lt, s2_101[0], s2_101[1])
+    k_cand = np.where(lt, k2_101[0], k2_101[1])
+    lt = cand < s2_110
+    return s2_min, np.where(lt, cand, s2_110), k2_min, np.where(lt, k_cand, k2_110)
+
+
+def least_reliable_rtl(llr, code_type, index1=0, index2=0):
+    """
+    index1/index2 and min1/min2 as S_LOAD leaves them
+
+    Args:
+        llr: int8 array [batch, 2^m] in file order (LLRRecord.llr)
+        code_type: 1, 2 or 3
+        index1, index2: Register values before the codeword (kept when no
+                        |LLR| is below 127)
+
+    Returns:
+        (min1, min2, index1, index2), int arrays [batch]
+    """
+    n = BCH_PARAMS[code_type]['n']
+    values = abs7(llr)
+    values[:, 0] = 0x7F  # abs_data0 of the first row (dummy X^n)
+    batch = values.shape[0]
+
+    min1 = np.full(batch, 0x7F)
+    min2 = np.full(batch, 0x7F)
+    idx1 = np.full(batch, index1)
+    idx2 = np.full(batch, index2)
+    for row in range(values.shape[1] // 8):
+        c1, c2, k1, k2 = swiss_min2(values[:, 8 * row:8 * row + 8], n - 8 * row)
+        first = c1 < min1
+        second = ~first & (c1 < min2)
+        new_min2 = np.where(first, np.where(c2 < min1, c2, min1), np.where(second, c1, min2))
+        new_idx2 = np.where(first, np.where(c2 < min1, k2, idx1), np.where(second, k1, idx2))
+        min1 = np.where(first, c1, min1)
+        idx1 = np.where(first, k1, idx1)
+        min2, idx2 = new_min2, new_idx2
+    return min1, min2, idx1, idx2
+
+
+def _locators(S, gf, t, closed_form):
+    """Locator coefficients [batch, t+1] and degrees (t+1 = undecodable)"""
+    if closed_form:
+        s1, s2, s3 = S[:, 0], S[:, 1], S[:, 2]
+        sigma = np.stack([s1, _gf_multiply_batch(s1, s1, gf),
+                          s3 ^ _gf_multiply_batch(s1, s2, gf)], axis=1)
+        valid = np.ones(S.shape[0], dtype=bool)
+    else:
+        # Inversionless recursion as in S_BER_HARD / S_BER_SOFT* (rho
+        # starts at -1 with d_rho = 1), same roots as the RTL locator
+        sigma, _, valid, _ = berlekamp_massey_inversionless_batch(S, gf, t)
+    nonzero = sigma != 0
+    power = np.where(nonzero.any(axis=1), t - np.argmax(nonzero[:, ::-1], axis=1), 0)
+    power = np.where(valid, power, t + 1)
+    return sigma, power
+
+
+def _detection_order(roots_row):
+    """Root positions in the order S_CHI_* records them (descending)"""
+    return np.flatnonzero(roots_row)[::-1].tolist()
+
+
+def rtl_datapath(records):
+    """
+    Datapath values for a list of LLRRecords (see Datapath)
+
+    Records are processed in batches per code type and mode.
+    """
+    out = [None] * len(records)
+    groups = {}
+    for i, rec in enumerate(records):
+        groups.setdefault((rec.code_type, rec.mode), []).append(i)
+
+    for (code_type, mode), idx in groups.items():
+        params = BCH_PARAMS[code_type]
+        n, m, t = params['n'], params['m'], params['t']
+        gf = get_field(m, use_tables=True)
+
+        R = np.stack([records[i].r for i in idx])
+        S = compute_syndromes_batch(R, gf, t)
+        zero = ~S.any(axis=1)
+
+        if mode == 'hard':
+            sigma, power = _locators(S, gf, t, closed_form=(t == 2))
+            roots = chien_search_batch(sigma, gf, n)
+            for row, i in enumerate(idx):
+                out[i] = Datapath(code_type, mode, bool(zero[row]), [int(power[row])],
+                                  [_detection_order(roots[row])], 0, 0, 0, 0, None)
+            continue
+
+        llr = np.stack([records[i].llr for i in idx])
+        min1, min2, index1, index2 = least_reliable_rtl(llr, code_type)
+
+        # Syndromes of single-bit errors at index1 / index2 (alpha_r of bch.v)
+        exp_np = np.asarray(gf.exp_table, dtype=np.int64)
+        powers = np.arange(1, 2 * t + 1)
+        a1 = exp_np[(index1[:, None] * powers) % gf.n]
+        a2 = exp_np[(index2[:, None] * powers) % gf.n]
+        S_cand = np.concatenate([S, S ^ a1, S ^ a2, S ^ a1 ^ a2])
+        sigma, power = _locators(S_cand, gf, t, closed_form=False)
+        roots = chien_search_batch(sigma, gf, n)
+
+        batch = len(idx)
+        abs_llr = abs7(llr)[:, ::-1][:, :n]  # file order -> position 0 .. n-1
+        for row, i in enumerate(idx):
+            cand = [row + c * batch for c in range(4)]
+            out[i] = Datapath(code_type, mode, bool(zero[row]),
+                              [int(power[c]) for c in cand],
+                              [_detection_order(roots[c]) for c in cand],
+                              int(index1[row]), int(index2[row]),
+                              int(min1[row]), int(min2[row]), abs_llr[row])
+    return out
+
+
+# ============================================================================
+# FSM
+# ============================================================================
+
+def compare_corr(corr):
+    """compare_corr of bch.v: index of the smallest of 4 (ties -> lower)"""
+    first = 0 if corr[0] <= corr[1] else 1
+    second = 2 if corr[2] <= corr[3] else 3
+    return first if corr[first] <= corr[second] else second
+
+
+def simulate_codeword(dp, trace=False):
+    """
+    Run the bch.v FSM for one codeword
+
+    Cycle 0 is the S_IDLE cycle in which `set` is high; the testbench
+    feeds one 64-bit row per cycle while ready is high.
+
+    Args:
+        dp: Datapath of the codeword
+        trace: Record (cycle, state, cnt, finish, odata) per cycle
+
+    Returns:
+        CycleResult
+    """
+    code_type, soft = dp.code_type, dp.mode == 'soft'
+    n, t = BCH_PARAMS[code_type]['n'], BCH_PARAMS[code_type]['t']
+    chien_max = CHIEN_CNT_MAX[code_type]
+    ber_max = BER_CNT_MAX[code_type] if soft else 16
+    num_cand = 4 if soft else 1
+
+    # Roots per 8-position Chien step: step c covers positions 8c .. 8c+7
+    root_steps = [{} for _ in range(num_cand)]
+    for c in range(num_cand):
+        for pos in dp.roots[c]:
+            root_steps[c].setdefault(pos >> 3, []).append(pos)
+
+    state, cnt = S_IDLE, 0
+    finish, odata = 0, 0
+    root = [[0] * 4 for _ in range(4)]
+    root_cnt = [0] * 4
+    corr = [0] * 4
+    corr_sel = 0
+    stack, stack_ptr = [0, 0], 0
+    invalid1 = [False] * 4
+    invalid2 = [False] * 4
+
+    outputs = []
+    latency = None
+    state_cycles = {}
+    rows = [] if trace else None
+    cycle = 0
+    started = False
+
+    while True:
+        if trace:
+            rows.append((cycle, STATE_NAMES[state], cnt, finish, odata))
+        if finish:
+            outputs.append(odata)
+            if latency is None:
+                latency = cycle
+        name = STATE_NAMES[state]
+        state_cycles[name] = state_cycles.get(name, 0) + 1
+
+        nstate, ncnt, nfinish, nodata = state, cnt, finish, odata
+
+        if state == S_IDLE:
+            if started:
+                break
+            started = True
+            nfinish, nodata = 0, 0
+            nstate, ncnt = S_LOAD, n
+
+        elif state == S_LOAD:
+            if cnt > 7:
+                ncnt = cnt - 8
+            elif cnt > 4:
+                ncnt = cnt - 1
+            elif dp.syndrome_zero:
+                nstate, ncnt, nfinish, nodata = S_OUT_HARD, CNT_MASK, 1, NO_ERROR
+            else:
+                nstate, ncnt = (S_BER_SOFT1 if soft else S_BER_HARD), 0
+
+        elif state == S_BER_HARD:
+            if code_type != 3:
+                nstate, ncnt = S_CHI_HARD, chien_max
+            elif cnt < 16:
+                ncnt = cnt + 1
+            else:
+                nstate, ncnt = S_CHI_HARD, chien_max
+
+        elif state in (S_BER_SOFT1, S_BER_SOFT2):
+            if cnt < ber_max:
+                ncnt = cnt + 1
+            else:
+                nstate = S_CHI_SOFT1 if state == S_BER_SOFT1 else S_CHI_SOFT2
+                ncnt = chien_max
+
+        elif state in (S_CHI_HARD, S_CHI_SOFT1, S_CHI_SOFT2):
+            cands = (0,) if state != S_CHI_SOFT2 else (1, 2, 3)
+            if cnt != chien_max:
+                for c in cands:
+                    for pos in root_steps[c].get(cnt, ()):
+                        if root_cnt[c] < 4:
+                            root[c][root_cnt[c]] = pos
+                        root_cnt[c] = (root_cnt[c] + 1) & 7
+            ncnt = cnt - 1
+            if state == S_CHI_HARD:
+                if root_cnt[0] == (2 if code_type != 3 else 4):
+                    nstate, ncnt = S_OUT_HARD_BUFF, root_cnt[0] - 1
+                if cnt == 0:
+                    nstate, ncnt = S_OUT_HARD_BUFF, (root_cnt[0] - 1) & CNT_MASK
+            elif cnt == 0:
+                if state == S_CHI_SOFT1:
+                    nstate, ncnt = S_BER_SOFT2, 0
+                else:
+                    nstate, ncnt = S_CORR_1, 0
+                    corr = [0, dp.min1, dp.min2, dp.min1 + dp.min2]
+
+        elif state == S_CORR_1:
+            k = cnt & 7
+            if k < root_cnt[0]:
+                corr[0] += int(dp.abs_llr[root[0][k]])
+            for c, flips in ((1, ((dp.index1, dp.min1),)), (2, ((dp.index2, dp.min2),)),
+                             (3, ((dp.index1, dp.min1), (dp.index2, dp.min2)))):
+                if k < root_cnt[c]:
+                    pos = root[c][k] if k < 4 else 0
+                    for index, minimum in flips:
+                        if pos == index:
+                            corr[c] -= minimum
+                            break
+                    else:
+                        corr[c] += int(dp.abs_llr[pos])
+            corr = [value & CNT_MASK for value in corr]
+            # bch.v: (cnt_r == 1 && code_r != 3) || (cnt_r == 3 || code_r == 3)
+            if (cnt == 1 and code_type != 3) or (cnt == 3 or code_type == 3):
+                nstate = S_CORR_2
+            else:
+                ncnt = cnt + 1
+
+        elif state == S_CORR_2:
+            base = [0, dp.min1, dp.min2, dp.min1 + dp.min2]
+            for c in range(4):
+                if root_cnt[c] < dp.power[c] or dp.power[c] > t:
+                    corr[c] = CNT_MASK
+                elif dp.power[c] == 0:
+                    corr[c] = base[c]
+            corr_sel = compare_corr(corr)
+            nstate = S_OUT_SOFT_BUFF
+
+        elif state == S_OUT_SOFT_BUFF:
+            if corr_sel:
+                flips = {1: (dp.index1,), 2: (dp.index2,), 3: (dp.index1, dp.index2)}[corr_sel]
+                kept = []
+                for k in range(min(root_cnt[corr_sel], 4)):
+                    pos = root[corr_sel][k]
+                    if pos in flips:
+                        if pos == dp.index1 and corr_sel != 2:
+                            invalid1[corr_sel] = True
+                        else:
+                            invalid2[corr_sel] = True
+                    else:
+                        kept.append(pos)
+                root[corr_sel][:len(kept)] = kept
+                root_cnt[corr_sel] -= min(root_cnt[corr_sel], 4) - len(kept)
+            nstate = S_OUT_SOFT_BUFF2
+
+        elif state == S_OUT_SOFT_BUFF2:
+            c = corr_sel
+            ncnt = CNT_MASK if dp.power[c] == 0 else (root_cnt[c] - 1) & CNT_MASK
+            if c == 0:
+                stack_ptr = 2
+            elif c == 1 or c == 2:
+                invalid = invalid1[1] if c == 1 else invalid2[2]
+                if invalid:
+                    stack_ptr = 2
+                else:
+                    stack[1] = dp.index1 if c == 1 else dp.index2
+                    stack_ptr = 1
+            elif invalid1[3] and invalid2[3]:
+                stack_ptr = 2
+            elif invalid1[3] or invalid2[3]:
+                stack[1] = dp.index2 if invalid1[3] else dp.index1
+                stack_ptr = 1
+            else:
+                stack = sorted([dp.index1, dp.index2])
+                stack_ptr = 0
+            nstate = S_OUT_SOFT
+
+        elif state == S_OUT_SOFT:
+            # Merge the roots (ascending) with the flipped positions
+            nfinish = 1
+            ptr = stack_ptr
+            value = root[corr_sel][cnt & 3]
+            if cnt != CNT_MASK:
+                if corr_sel != 0 and ptr < 2 and not value < stack[ptr]:
+                    nodata = stack[ptr]
+                    stack_ptr = ptr + 1
+                else:
+                    nodata = value
+                    ncnt = cnt - 1
+            elif corr_sel != 0 and ptr < 2:
+                nodata = stack[ptr]
+                stack_ptr = ptr + 1
+            if cnt == CNT_MASK and ptr == 2:
+                nfinish, nodata, nstate, ncnt = 0, 0, S_IDLE, 0
+
+        elif state == S_OUT_HARD_BUFF:
+            nodata, nfinish = root[0][cnt & 3], 1
+            nstate, ncnt = S_OUT_HARD, (cnt - 1) & CNT_MASK
+
+        elif state == S_OUT_HARD:
+            nodata = root[0][cnt & 3]
+            if cnt == CNT_MASK:
+                nfinish, nodata, nstate, ncnt = 0, 0, S_IDLE, 0
+            else:
+                ncnt = cnt - 1
+
+        state, cnt, finish, odata = nstate, ncnt & CNT_MASK, nfinish, nodata
+        cycle += 1
+
+    return CycleResult(dp.code_type, dp.mode, latency, cycle, outputs, state_cycles, rows)
+
+
+def simulate(records, trace=False):
+    """
+    Run the FSM over a list of LLRRecords
+
+    Returns:
+        List of CycleResult in record order
+    """
+    return [simulate_codeword(dp, trace=trace) for dp in rtl_datapath(records)]
+
+
+def testbench_cycles(results):
+    """
+    Cycles test.v needs for a sequence of codewords
+
+    test.v raises `set` 10 cycles after the cycle finish first goes high,
+    so each codeword takes latency + 10 cycles. A codeword whose FSM is
+    still busy at that point makes the testbench `set` be ignored.
+
+    Returns:
+        (total cycles as reported by "Time =", indices of overrunning codewords)
+    """
+    total = TB_START_CYCLES
+    overruns = []
+    for i, res in enumerate(results):
+        if res.latency is None:
+            overruns.append(i)
+            continue
+        total += res.latency + TB_GAP_CYCLES
+        if res.cycles > res.latency + TB_GAP_CYCLES:
+            overruns.append(i)
+    return total, overruns
+
+
+def summarize(results):
+    """Latency statistics per (code_type, mode)"""
+    groups = {}
+    for res in results:
+        groups.setdefault((res.code_type, res.mode), []).append(res)
+    summary = {}
+    for key, group in sorted(groups.items()):
+        latency = np.array([res.latency if res.latency is not None else -1 for res in group])
+        busy = np.array([res.cycles for res in group])
+        summary[key] = {
+            'codewords': len(group),
+            'latency_min': int(latency.min()),
+            'latency_mean': float(latency.mean()),
+            'latency_max': int(latency.max()),
+            'busy_mean': float(busy.mean()),
+        }
+    return summary
+
+
+if __name__ == "__main__":
+    import sys
+    import time
+
+    from check_pattern import expected_lines, pattern_files
+    from pattern_io import iter_data_lines, iter_llr_records
+
+    period = 5.0
+    trace = 0
+    args = []
+    for arg in sys.argv[1:]:
+        if arg.startswith('cycle='):
+            period = float(arg[6:])
+        elif arg.startswith('trace='):
+            trace = int(arg[6:])
+        else:
+            args.append(arg)
+
+    if len(args) == 1 and args[0].isdigit():
+        files = pattern_files(int(args[0]))
+    elif len(args) in (1, 2, 3, 4):
+        files = (tuple(args) + (None,) * 4)[:4]
+        if len(args) == 3:
+            files = (args[0], None, args[1], args[2])
+    else:
+        print(f"Usage: {sys.argv[0]} <PATTERN>                       e.g. 100 .. 600, 700 (mixed)")
+        print(f"       {sys.argv[0]} <p.txt> [pa.txt] [pcode.txt pmode.txt]")
+        print()
+        print("Options:")
+        print("  cycle=5.0   Clock period in ns (03_GATE/cycle.txt)")
+        print("  trace=N     Print the cycle trace of the first N codewords")
+        print()
+        print("Predict per-codeword latency, odata and total testbench time of")
+        print("bch.v for a pattern file; odata is checked against pa.txt if given.")
+        sys.exit(0)
+
+    p_path, pa_path, pcode_path, pmode_path = files
+    records = list(iter_llr_records(p_path, pcode_path=pcode_path, pmode_path=pmode_path))
+
+    start = time.time()
+    results = simulate(records, trace=trace > 0)
+    seconds = time.time() - start
+
+    for i, res in enumerate(results[:trace]):
+        params = BCH_PARAMS[res.code_type]
+        print(f"Codeword {i}: ({params['n']}, {params['k']}) {res.mode}")
+        for cycle, state, cnt, finish, odata in res.trace:
+            print(f"  {cycle:5d}  {state:<16} cnt={cnt:<5d} finish={finish} odata={odata}")
+
+    mismatches = []
+    if pa_path:
+        answers = (int(line, 2) for line in iter_data_lines(pa_path))
+        for i, res in enumerate(results):
+            expected = [next(answers, None) for _ in expected_lines(res.odata)]
+            if res.odata != expected:
+                mismatches.append((i, res.odata, expected))
+
+    total, overruns = testbench_cycles(results)
+    print("=" * 70)
+    print(f"bch.v cycle model: {p_path} ({len(records)} codewords, {seconds:.3f} s)")
+    print("=" * 70)
+    for (code_type, mode), stats in summarize(results).items():
+        params = BCH_PARAMS[code_type]
+        print(f"  ({params['n']:4d}, {params['k']:4d}) {mode:<4}: {stats['codewords']:6d} codewords, "
+              f"latency {stats['latency_min']}/{stats['latency_mean']:.1f}/{stats['latency_max']} "
+              f"(min/mean/max), busy {stats['busy_mean']:.1f} cycles")
+    print("-" * 70)
+    print(f"Testbench cycles: {total:.1f}")
+    print(f"Predicted Time:   {total * period:.1f} ns at {period} ns/cycle")
+    if records:
+        print(f"Throughput:       {len(records) / (total * period) * 1e3:.2f} codewords/us")
+    if overruns:
+        print(f"Overruns:         {len(overruns)} codeword(s) still busy at the next set "
+              f"(first: {overruns[:10]})")
+    if pa_path:
+        for i, odata, expected in mismatches[:20]:
+            print(f"  Codeword {i}: odata = {odata}, answer = {expected}")
+        print(f"odata mismatches: {len(mismatches)}")
@@ -0,0 +1,296 @@
+#!/usr/bin/env python3
+"""
+BCH BER/FER Monte-Carlo Simulator
+
+Random messages are encoded with gen_pattern.encode_bch_batch, sent over a
+BPSK/AWGN channel, quantized to signed LLRs of the RTL input width and
+decoded with the decoders in bch_decoders.py:
+- hard: decode_bch_batch on the sign of the quantized LLRs
+- soft: decode_bch_chase (Chase-II, p least reliable bits)
+Both use the key-equation solver `solver` (see KEY_EQUATION_SOLVERS).
+
+Each Eb/N0 point runs batches until `target_errors` frame errors or
+`max_frames` frames have been simulated. Batches run on a process pool;
+every batch has its own seed derived from (seed, point, batch), and
+batches are accumulated in order, so results do not depend on the
+number of workers.
+"""
+
+import csv
+import math
+import multiprocessing
+import os
+import time
+
+import numpy as np
+
+from bch_decoders import (BCH_PARAMS, KEY_EQUATION_SOLVERS, decode_bch_batch, decode_bch_chase,
+                          get_field)
+from gen_pattern import BCH_SPECS, encode_bch_batch
+
+
+def parse_range(spec):
+    """'start:stop:step' (stop inclusive) or 'a,b,c' -> list of floats"""
+    if ':' in spec:
+        start, stop, step = (float(x) for x in spec.split(':'))
+        count = int(math.floor((stop - start) / step + 1e-9)) + 1
+        return [round(start + i * step, 6) for i in range(count)]
+    return [float(x) for x in spec.split(',')]
+
+
+def awgn_llr(codewords, ebn0_db, rate, rng, llr_bits=8, llr_clip=8.0):
+    """
+    BPSK over AWGN with quantized channel LLRs
+
+    Args:
+        codewords: uint8 array [batch, n]
+        ebn0_db: Eb/N0 in dB
+        rate: Code rate k/n
+        rng: numpy Generator
+        llr_bits: LLR width in bits (8 for the RTL)
+        llr_clip: Channel LLR mapped to full scale (2^(bits-1) - 1)
+
+    Returns:
+        int8/int16 array [batch, n] of quantized LLRs, positive = bit 0
+    """
+    sigma = math.sqrt(1.0 / (2.0 * rate * 10 ** (ebn0_db / 10)))
+    y = (1.0 - 2.0 * codewords) + sigma * rng.standard_normal(codewords.shape)
+    llr = 2.0 * y / sigma ** 2
+
+    full_scale = (1 << (llr_bits - 1)) - 1
+    q = np.rint(llr * (full_scale / llr_clip))
+    q = np.clip(q, -full_scale - 1, full_scale)
+    return q.astype(np.int8 if llr_bits <= 8 else np.int16)
+
+
+def to_llr_values(q, m):
+    """Quantized LLRs [n] (index j = X^j) -> decoder llr_values layout [2^m]"""
+    n = q.size
+    llr_values = np.zeros(1 << m, dtype=np.int64)
+    llr_values[1:n + 1] = q[::-1]
+    return llr_values
+
+
+def simulate_batch(job):
+    """
+    Simulate one batch of frames
+
+    Args:
+        job: (code_type, mode, p, ebn0_db, batch, seed_key, llr_bits, llr_clip, solver)
+
+    Returns:
+        Dict with 'frames', 'frame_errors', 'bit_errors' (information bits),
+        'raw_bit_errors' (channel, before decoding) and 'failures'
+    """
+    code_type, mode, p, ebn0_db, batch, seed_key, llr_bits, llr_clip, solver = job
+    params = BCH_PARAMS[code_type]
+    n, k, t, m = params['n'], params['k'], params['t'], params['m']
+    rng = np.random.default_rng(np.random.SeedSequence(seed_key))
+
+    msgs = rng.integers(0, 2, size=(batch, k), dtype=np.uint8)
+    codewords = encode_bch_batch(msgs, BCH_SPECS[m])
+    q = awgn_llr(codewords, ebn0_db, k / n, rng, llr_bits, llr_clip)
+    R = (q < 0).astype(np.uint8)
+
+    if mode == 'hard':
+        success, _, _, decoded = decode_bch_batch(R, code_type, solver)
+        failures = int(np.count_nonzero(~success))
+    else:
+        gf = get_field(m)
+        decoded = R.copy()
+        failures = 0
+        for b in range(batch):
+            ok, _, corrected, _ = decode_bch_chase(
+                R[b].tolist(), to_llr_values(q[b], m).tolist(), gf, t, n, p=p, solver=solver
+            )
+            if ok:
+                decoded[b] = corrected
+            else:
+                failures += 1
+
+    # Systematic code: message bits are the top k positions
+    info_errors = np.count_nonzero(decoded[:, n - k:] != msgs, axis=1)
+    frame_errors = np.count_nonzero(np.any(decoded != codewords, axis=1))
+    return {
+        'frames': batch,
+        'frame_errors': int(frame_errors),
+        'bit_errors': int(info_errors.sum()),
+        'raw_bit_errors': int(np.count_nonzero(R != codewords)),
+        'failures': failures,
+    }
+
+
+def simulate_point(pool, code_type, mode, ebn0_db, point_idx, p=2, seed=0,
+                   target_errors=100, max_frames=100000, batch=None,
+                   workers=1, llr_bits=8, llr_clip=8.0, solver='bm'):
+    """
+    Run batches for one Eb/N0 point until the stopping rule is met
+
+    Batches are dispatched `workers` at a time and accumulated in batch
+    order; batches past the one that meets the rule are discarded.
+
+    Returns:
+        Dict with the accumulated counters plus 'ebn0_db', 'ber', 'fer'
+        and 'raw_ber'
+    """
+    params = BCH_PARAMS[code_type]
+    if batch is None:
+        batch = 1000 if mode == 'hard' else 50
+
+    total = {'frames': 0, 'frame_errors': 0, 'bit_errors': 0, 'raw_bit_errors': 0, 'failures': 0}
+    batch_idx = 0
+    done = False
+    while not done:
+        jobs = []
+        for _ in range(max(workers, 1)):
+            size = min(batch, max_frames - total['frames'] - sum(j[4] for j in jobs))
+            if size <= 0:
+                break
+            jobs.append((code_type, mode, p, ebn0_db, size, (seed, point_idx, batch_idx),
+                         llr_bits, llr_clip, solver))
+            batch_idx += 1
+        if not jobs:
+            break
+
+        results = pool.imap(simulate_batch, jobs) if pool is not None else map(simulate_batch, jobs)
+        for result in results:
+            for key in total:
+                total[key] += result[key]
+            if total['frame_errors'] >= target_errors or total['frames'] >= max_frames:
+                done = True
+                break
+
+    frames = total['frames']
+    total['ebn0_db'] = ebn0_db
+    total['fer'] = total['frame_errors'] / frames if frames else 0.0
+    total['ber'] = total['bit_errors'] / (frames * params['k']) if frames else 0.0
+    total['raw_ber'] = total['raw_bit_errors'] / (frames * params['n']) if frames else 0.0
+    return total
+
+
+def simulate_curve(code_type, mode, ebn0_points, p=2, seed=0, target_errors=100,
+                   max_frames=100000, batch=None, workers=None, llr_bits=8,
+                   llr_clip=8.0, solver='bm', verbose=True):
+    """
+    Sweep Eb/N0 for one code and decoding mode
+
+    Args:
+        code_type: 1, 2 or 3 (see BCH_PARAMS)
+        mode: 'hard' or 'soft'
+        ebn0_points: Eb/N0 values in dB
+        p: Number of least reliable bits for soft decoding
+        seed: Base seed
+        target_errors: Frame errors to collect per point
+        max_frames: Frame limit per point
+        batch: Frames per batch (default: 1000 hard, 50 soft)
+        workers: Processes (default: all cores, 1 = no pool)
+        llr_bits, llr_clip: LLR quantization (see awgn_llr)
+        solver: Key-equation solver, one of KEY_EQUATION_SOLVERS
+        verbose: Print one line per point
+
+    Returns:
+        List of per-point dicts (see simulate_point)
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    pool = multiprocessing.Pool(workers) if workers > 1 else None
+    curve = []
+    try:
+        for point_idx, ebn0_db in enumerate(ebn0_points):
+            start = time.time()
+            point = simulate_point(pool, code_type, mode, ebn0_db, point_idx, p=p,
+                                   seed=seed, target_errors=target_errors,
+                                   max_frames=max_frames, batch=batch, workers=workers,
+                                   llr_bits=llr_bits, llr_clip=llr_clip, solver=solver)
+            curve.append(point)
+            if verbose:
+                print(f"  Eb/N0 = {ebn0_db:5.2f} dB: BER = {point['ber']:.3e}, "
+                      f"FER = {point['fer']:.3e}, raw BER = {point['raw_ber']:.3e} "
+                      f"({point['frame_errors']}/{point['frames']} frames, "
+                      f"{time.time() - start:.1f} s)")
+            if point['frame_errors'] == 0:
+                # No errors at this SNR: higher points would not see any either
+                break
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+    return curve
+
+
+def write_curve(path, curve):
+    """Write a curve as CSV (one row per Eb/N0 point)"""
+    fields = ['ebn0_db', 'frames', 'frame_errors', 'fer', 'bit_errors', 'ber',
+              'raw_bit_errors', 'raw_ber', 'failures']
+    with open(path, 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=fields, extrasaction='ignore')
+        writer.writeheader()
+        writer.writerows(curve)
+
+
+if __name__ == "__main__":
+    import sys
+
+    if len(sys.argv) < 2 or sys.argv[1] in ['-h', '--help', 'help']:
+        print(f"Usage: {sys.argv[0]} <code_type|all> [hard|soft|both] [options]")
+        print()
+        print("Options (key=value):")
+        print("  ebn0=3:8:0.5   Eb/N0 sweep in dB (start:stop:step or a,b,c)")
+        print("  p=2            Least reliable bits for Chase decoding")
+        print("  errors=100     Frame errors to collect per point")
+        print("  frames=100000  Frame limit per point")
+        print("  batch=N        Frames per batch")
+        print("  workers=N      Processes (default: all cores)")
+        print("  bits=8         LLR quantization width")
+        print("  clip=8.0       Channel LLR mapped to full scale")
+        print("  seed=0         Base seed")
+        print(f"  solver=bm      Key-equation solver ({'|'.join(KEY_EQUATION_SOLVERS)})")
+        print("  out=DIR        Directory for the CSV curves (default: .)")
+        sys.exit(0)
+
+    code_types = list(BCH_PARAMS) if sys.argv[1] == 'all' else [int(sys.argv[1])]
+    modes = ['hard', 'soft']
+    options = {'ebn0': '3:8:0.5', 'p': '2', 'errors': '100', 'frames': '100000',
+               'batch': None, 'workers': None, 'bits': '8', 'clip': '8.0',
+               'seed': '0', 'solver': 'bm', 'out': '.'}
+    for arg in sys.argv[2:]:
+        if arg in ['hard', 'soft']:
+            modes = [arg]
+        elif arg == 'both':
+            modes = ['hard', 'soft']
+        elif '=' in arg and arg.split('=', 1)[0] in options:
+            key, value = arg.split('=', 1)
+            options[key] = value
+        else:
+            print(f"Unknown argument: {arg}")
+            sys.exit(1)
+
+    if options['solver'] not in KEY_EQUATION_SOLVERS:
+        print(f"Unknown solver: {options['solver']}")
+        sys.exit(1)
+
+    ebn0_points = parse_range(options['ebn0'])
+    p = int(options['p'])
+    os.makedirs(options['out'], exist_ok=True)
+
+    for code_type in code_types:
+        params = BCH_PARAMS[code_type]
+        for mode in modes:
+            label = f"{mode}" if mode == 'hard' else f"{mode}, p={p}"
+            print("=" * 70)
+            print(f"({params['n']}, {params['k']}) BCH, {label}, "
+                  f"{options['bits']}-bit LLR")
+            print("=" * 70)
+            curve = simulate_curve(
+                code_type, mode, ebn0_points, p=p, seed=int(options['seed']),
+                target_errors=int(options['errors']), max_frames=int(options['frames']),
+                batch=int(options['batch']) if options['batch'] else None,
+                workers=int(options['workers']) if options['workers'] else None,
+                llr_bits=int(options['bits']), llr_clip=float(options['clip']),
+                solver=options['solver'],
+            )
+            suffix = 'hard' if mode == 'hard' else f"soft_p{p}"
+            path = os.path.join(options['out'], f"ber_{params['n']}_{params['k']}_{suffix}.csv")
+            write_curve(path, curve)
+            print(f"Wrote {path}")
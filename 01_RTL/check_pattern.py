@@ -0,0 +1,280 @@
+#!/usr/bin/env python3
+"""
+BCH Golden-Model Pattern Checker
+
+Decodes every codeword of a testbench pattern file (p*.txt) with the
+decoders in bch_decoders.py and compares the result against the answer
+file (p*a.txt) the same way test.v does: one 10-bit error position per
+line, ascending per codeword, 1023 for a codeword without errors.
+
+Hard-decision codewords are decoded in batches with decode_bch_batch,
+soft-decision codewords with the Chase decoder (p least reliable bits).
+
+The answer file has no per-codeword count, so it is split on its own
+boundaries: a codeword's positions ascend and 1023 is the largest value,
+so every non-ascending step starts a new codeword. Back-to-back ascending
+codewords share such a run; within a run a codeword ends where the golden
+positions of the next codeword begin, and a run that only holds extra
+lines is charged to the codeword before it. A missing or extra answer
+line therefore marks its own codeword and never shifts the ones after it.
+"""
+
+import os
+import time
+from itertools import islice
+
+import numpy as np
+
+from bch_decoders import BCH_PARAMS, decode_bch_batch, decode_bch_chase, get_field
+from pattern_io import (NO_ERROR, iter_data_lines, iter_llr_records, pattern_config,
+                        pattern_number)
+
+
+def golden_outputs(records, p=2):
+    """
+    Decode a list of LLRRecords
+
+    Returns:
+        List of (success, error_locations) in record order
+    """
+    outputs = [None] * len(records)
+
+    # Hard-decision words: one batched decode per code type
+    for code_type in BCH_PARAMS:
+        idx = [i for i, rec in enumerate(records)
+               if rec.mode == 'hard' and rec.code_type == code_type]
+        if not idx:
+            continue
+        R = np.stack([records[i].r for i in idx])
+        success, num_errors, locs, _ = decode_bch_batch(R, code_type)
+        for row, i in enumerate(idx):
+            outputs[i] = (bool(success[row]), locs[row, :num_errors[row]].tolist())
+
+    # Soft-decision words: Chase decoding one word at a time
+    for i, rec in enumerate(records):
+        if rec.mode != 'soft':
+            continue
+        params = BCH_PARAMS[rec.code_type]
+        gf = get_field(params['m'])
+        success, locs, _, _ = decode_bch_chase(
+            rec.r.tolist(), rec.llr.tolist(), gf, params['t'], params['n'], p=p
+        )
+        outputs[i] = (success, locs)
+
+    return outputs
+
+
+def expected_lines(error_locations):
+    """Answer-file values for one codeword"""
+    return list(error_locations) if error_locations else [NO_ERROR]
+
+
+def answer_runs(pa_path):
+    """Ascending runs of answer values; every codeword starts a new run or continues one"""
+    run = []
+    for line in iter_data_lines(pa_path):
+        value = int(line, 2)
+        if run and value <= run[-1]:
+            yield run
+            run = []
+        run.append(value)
+    if run:
+        yield run
+
+
+class _AnswerRuns:
+    """Splits the runs of answer_runs() into the answer lines of each codeword"""
+
+    def __init__(self, pa_path):
+        self._runs = answer_runs(pa_path)
+        self._run = []
+        self._ahead = None
+
+    def _peek(self):
+        if self._ahead is None:
+            self._ahead = next(self._runs, [])
+        return self._ahead
+
+    def _advance(self):
+        self._run, self._ahead = self._peek(), None
+
+    def take(self, expected, following):
+        """
+        Answer lines of the next codeword
+
+        The codeword takes `expected` when the current run starts with it.
+        A run that does not, followed by one that does, holds extra lines
+        and is charged to this codeword as well. Otherwise the codeword
+        ends where the next codeword's golden positions `following` start
+        in the run, or with the run.
+        """
+        if not self._run:
+            self._advance()
+        run, size = self._run, len(expected)
+        if run[:size] == expected:
+            self._run = run[size:]
+            return expected
+        ahead = self._peek()
+        if ahead[:size] == expected:
+            self._advance()
+            self._run = ahead[size:]
+            return run + expected
+        if following:
+            width = len(following)
+            for cut in range(len(run) - width + 1):
+                if run[cut:cut + width] == following:
+                    self._run = run[cut:]
+                    return run[:cut]
+        self._run = []
+        return run
+
+    def leftover(self):
+        """Number of answer lines not taken by any codeword"""
+        return len(self._run) + len(self._ahead or []) + sum(len(run) for run in self._runs)
+
+
+def _golden_stream(records, p, chunk):
+    """(record, success, error_locations) of every record, decoded `chunk` at a time"""
+    while True:
+        block = list(islice(records, chunk))
+        if not block:
+            return
+        for rec, (success, locs) in zip(block, golden_outputs(block, p=p)):
+            yield rec, success, locs
+
+
+def check_pattern(p_path, pa_path, pcode_path=None, pmode_path=None,
+                  p=2, chunk=1024, verbose=True, max_report=50, code_type=None, mode=None):
+    """
+    Decode a pattern file and diff it against its answer file
+
+    Args:
+        p_path: Pattern file (p*.txt)
+        pa_path: Answer file (p*a.txt)
+        pcode_path, pmode_path: Side files for mixed pattern sets
+        p: Number of least reliable bits for soft-decision codewords
+        chunk: Codewords decoded per batch
+        verbose: Print the per-codeword mismatch report
+        max_report: Maximum number of mismatching codewords printed
+        code_type, mode: Fixed code type / mode of every codeword, for files
+                         whose name does not give them (see iter_llr_records)
+
+    Returns:
+        Dict with 'codewords', 'mismatches', 'failures' (decoder failures),
+        'seconds' and 'mismatch_list' [(index, expected, answer), ...]
+    """
+    answers = _AnswerRuns(pa_path)
+    records = iter_llr_records(p_path, code_type=code_type, mode=mode,
+                               pcode_path=pcode_path, pmode_path=pmode_path)
+    decoded = _golden_stream(records, p, chunk)
+
+    summary = {'codewords': 0, 'mismatches': 0, 'failures': 0, 'mismatch_list': []}
+    start = time.time()
+
+    current = next(decoded, None)
+    while current is not None:
+        following = next(decoded, None)
+        rec, success, locs = current
+        idx = summary['codewords']
+        summary['codewords'] += 1
+        if not success:
+            summary['failures'] += 1
+
+        expected = expected_lines(locs)
+        answer = answers.take(expected, expected_lines(following[2]) if following else None)
+        if answer != expected or not success:
+            summary['mismatches'] += 1
+            summary['mismatch_list'].append((idx, expected, answer))
+            if verbose and summary['mismatches'] <= max_report:
+                params = BCH_PARAMS[rec.code_type]
+                note = "" if success else " (golden decoder failed)"
+                print(f"  Codeword {idx}: ({params['n']}, {params['k']}) {rec.mode}"
+                      f"{note}: golden = {expected}, answer = {answer}")
+        current = following
+
+    leftover = answers.leftover()
+    summary['seconds'] = time.time() - start
+    summary['extra_answers'] = leftover
+    return summary
+
+
+def pattern_files(pattern, testdata="testdata"):
+    """File names test.v reads for PATTERN number `pattern`"""
+    if pattern == 700:
+        return tuple(os.path.join(testdata, name) for name in
+                     ("p_mix.txt", "pa_mix.txt", "pcode_mix.txt", "pmode_mix.txt"))
+    return (os.path.join(testdata, f"p{pattern}.txt"),
+            os.path.join(testdata, f"p{pattern}a.txt"), None, None)
+
+
+if __name__ == "__main__":
+    import sys
+
+    def usage_error(message):
+        print(message)
+        print(f"Use '{sys.argv[0]} --help' for usage information.")
+        sys.exit(1)
+
+    p = 2
+    code_type = None
+    mode = None
+    args = []
+    for arg in sys.argv[1:]:
+        if arg.startswith('p=') and arg[2:].isdigit():
+            p = int(arg[2:])
+        elif arg.startswith('code='):
+            if arg[5:] not in [str(ct) for ct in BCH_PARAMS]:
+                usage_error(f"Unknown code: {arg[5:]} (use 1, 2 or 3)")
+            code_type = int(arg[5:])
+        elif arg.startswith('mode='):
+            if arg[5:] not in ('hard', 'soft'):
+                usage_error(f"Unknown mode: {arg[5:]} (use hard or soft)")
+            mode = arg[5:]
+        else:
+            args.append(arg)
+
+    if len(args) == 1 and args[0].isdigit():
+        files = pattern_files(int(args[0]))
+    elif len(args) in (2, 4):
+        files = tuple(args) + (None, None) if len(args) == 2 else tuple(args)
+    else:
+        print(f"Usage: {sys.argv[0]} <PATTERN>                       e.g. 100 .. 600, 700 (mixed)")
+        print(f"       {sys.argv[0]} <p.txt> <pa.txt> [pcode.txt pmode.txt] [options]")
+        print()
+        print("Options:")
+        print("  p=N          Least reliable bits for soft-decision codewords (default: 2)")
+        print("  code=1|2|3   Code of every codeword (needed unless the file is p100 .. p600")
+        print("               or a pcode file is given)")
+        print("  mode=hard|soft")
+        print("               Mode of every codeword (default: from the file name or pmode")
+        print("               file, else hard)")
+        print()
+        print("Decode every codeword with the Python golden model and compare")
+        print("the error positions against the answer file.")
+        sys.exit(0)
+
+    p_path, pa_path, pcode_path, pmode_path = files
+    number = pattern_number(p_path)
+    if code_type is None and pcode_path is None and (not number or pattern_config(number) is None):
+        usage_error(f"Cannot infer the code of {p_path}; pass code=1|2|3")
+    print("=" * 70)
+    print(f"Checking {p_path} against {pa_path}")
+    print("=" * 70)
+    try:
+        summary = check_pattern(p_path, pa_path, pcode_path, pmode_path, p=p,
+                                code_type=code_type, mode=mode)
+    except ValueError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+    rate = summary['codewords'] / summary['seconds'] if summary['seconds'] > 0 else float('inf')
+    print("-" * 70)
+    print(f"Codewords:        {summary['codewords']}")
+    print(f"Mismatches:       {summary['mismatches']}")
+    print(f"Decoder failures: {summary['failures']}")
+    if summary['extra_answers']:
+        print(f"Unused answers:   {summary['extra_answers']} line(s)")
+    print(f"Throughput:       {rate:.1f} codewords/s ({summary['seconds']:.3f} s)")
+    ok = summary['mismatches'] == 0 and summary['extra_answers'] == 0
+    print("PASS" if ok else "FAIL")
+    sys.exit(0 if ok else 1)
@@ -0,0 +1,329 @@
+#!/usr/bin/env python3
+"""
+Reference Model of extend_euc.v
+
+Bit-accurate model of the `extend_euclidean` field inverter: i_poly is an
+11-bit field element of GF(2^m), i_code selects the field the way the RTL
+does (0 -> m=6, 1 -> m=8, 2 -> m=10), o_poly = i_poly^(-1).
+
+S_IDLE loads r0 = P(X), r1 = i_poly, t0 = 0, t1 = 1. S_DIV is modelled as
+one shift-and-subtract per cycle on the registers of the RTL:
+
+    d  = deg(r0) - deg(r1)
+    r0 = r0 ^ (r1 << d),  t0 = t0 ^ (t1 << d)
+    if deg(r0) < deg(r1): swap (r0, t0) <-> (r1, t1)     (end of a round)
+
+until r1 = 1, when t1 holds the inverse (invariant t_i * i_poly = r_i mod
+P). A round is one quotient of the textbook Euclidean algorithm; cycles is
+the number of S_DIV steps, i.e. the latency the hardware needs.
+
+euclid_key_equation() is the matching Sugiyama key-equation solver
+(sigma(X) S(X) = Omega(X) mod X^2t), using euclid_inverse for the leading
+coefficient inverses.
+"""
+
+import numpy as np
+
+from bch_decoders import BCH_PARAMS, PRIMITIVE_POLYS, get_field
+
+POLY_WIDTH = 11     # input [10:0] i_poly / output [10:0] o_poly
+
+# i_code of extend_euc.v -> field size (P_6, P_8, P_10)
+ICODE_TO_M = {0: 6, 1: 8, 2: 10}
+CODE_TO_ICODE = {code: icode for icode, m in ICODE_TO_M.items()
+                 for code, params in BCH_PARAMS.items() if params['m'] == m}
+
+# deg(p) for every 11-bit register value, -1 for 0
+_DEGREE = np.array([v.bit_length() - 1 for v in range(1 << POLY_WIDTH)], dtype=np.int64)
+
+
+def primitive_poly(i_code):
+    """P_6 / P_8 / P_10 of the RTL (i_code 3 falls back to P_6 like the case default)"""
+    return PRIMITIVE_POLYS[ICODE_TO_M.get(i_code, 6)]
+
+
+def euclid_inverse(i_poly, i_code):
+    """
+    Inverse of one field element as extend_euclidean computes it
+
+    Args:
+        i_poly: Element of GF(2^m), bit i = coefficient of alpha^i
+        i_code: 0 (m=6), 1 (m=8) or 2 (m=10)
+
+    Returns:
+        o_poly: i_poly^(-1) (0 for i_poly = 0, which has no inverse)
+        stats: Dict with 'rounds' (Euclidean quotients) and 'cycles'
+               (S_DIV shift-and-subtract steps)
+    """
+    m = ICODE_TO_M.get(i_code, 6)
+    if i_poly >> m:
+        raise ValueError(f"i_poly={i_poly:#x} is not an element of GF(2^{m})")
+    stats = {'rounds': 0, 'cycles': 0}
+    if i_poly == 0:
+        return 0, stats
+
+    r0, r1 = primitive_poly(i_code), i_poly
+    t0, t1 = 0, 1
+    while r1 != 1:
+        d = r0.bit_length() - r1.bit_length()
+        r0 ^= r1 << d
+        t0 ^= t1 << d
+        stats['cycles'] += 1
+        if r0.bit_length() < r1.bit_length():
+            r0, r1 = r1, r0
+            t0, t1 = t1, t0
+            stats['rounds'] += 1
+    return t1, stats
+
+
+def euclid_inverse_batch(i_poly, i_code):
+    """
+    euclid_inverse over an array of elements, one S_DIV step for all at once
+
+    Args:
+        i_poly: Integer array of elements of GF(2^m)
+        i_code: 0 (m=6), 1 (m=8) or 2 (m=10)
+
+    Returns:
+        o_poly, rounds, cycles: int64 arrays shaped like i_poly
+    """
+    m = ICODE_TO_M.get(i_code, 6)
+    a = np.asarray(i_poly, dtype=np.int64)
+    if (a >> m).any():
+        raise ValueError(f"i_poly contains values outside GF(2^{m})")
+    shape = a.shape
+    a = a.ravel()
+
+    r0 = np.full(a.size, primitive_poly(i_code), dtype=np.int64)
+    r1 = a.copy()
+    t0 = np.zeros(a.size, dtype=np.int64)
+    t1 = np.ones(a.size, dtype=np.int64)
+    rounds = np.zeros(a.size, dtype=np.int64)
+    cycles = np.zeros(a.size, dtype=np.int64)
+
+    active = r1 > 1
+    while active.any():
+        idx = np.flatnonzero(active)
+        d = _DEGREE[r0[idx]] - _DEGREE[r1[idx]]
+        new_r0 = r0[idx] ^ (r1[idx] << d)
+        new_t0 = t0[idx] ^ (t1[idx] << d)
+        cycles[idx] += 1
+
+        swap = _DEGREE[new_r0] < _DEGREE[r1[idx]]
+        r0[idx] = np.where(swap, r1[idx], new_r0)
+        t0[idx] = np.where(swap, t1[idx], new_t0)
+        r1[idx] = np.where(swap, new_r0, r1[idx])
+        t1[idx] = np.where(swap, new_t0, t1[idx])
+        rounds[idx] += swap
+        active[idx] = r1[idx] > 1
+
+    o_poly = np.where(a == 0, 0, t1)
+    return o_poly.reshape(shape), rounds.reshape(shape), cycles.reshape(shape)
+
+
+def verify_inverter(i_code):
+    """
+    Check euclid_inverse_batch against GaloisField.inverse for every nonzero element
+
+    Returns:
+        Dict with 'm', 'errors' (mismatching elements) and the latency
+        figures 'max_cycles', 'mean_cycles', 'max_rounds', 'histogram'
+        (cycles -> number of elements)
+    """
+    m = ICODE_TO_M[i_code]
+    gf = get_field(m)
+    values = np.arange(1, gf.n + 1)
+    o_poly, rounds, cycles = euclid_inverse_batch(values, i_code)
+    expected = np.array([gf.inverse(int(v)) for v in values])
+    counts = np.bincount(cycles)
+    return {
+        'm': m,
+        'errors': int((o_poly != expected).sum()),
+        'max_cycles': int(cycles.max()),
+        'mean_cycles': float(cycles.mean()),
+        'max_rounds': int(rounds.max()),
+        'histogram': {c: int(k) for c, k in enumerate(counts) if k},
+    }
+
+
+# ============================================================================
+# KEY EQUATION (Sugiyama)
+# ============================================================================
+
+def _degree(poly):
+    """Degree of a coefficient list (low order first), -1 for the zero polynomial"""
+    for i in range(len(poly) - 1, -1, -1):
+        if poly[i]:
+            return i
+    return -1
+
+
+def euclid_key_equation(syndromes, gf, t):
+    """
+    Error locator by the Euclidean algorithm (Sugiyama)
+
+    Runs Euclid on X^2t and S(X) = S_1 + S_2 X + ... + S_2t X^(2t-1) until
+    deg(r) < t; the last t(X) is the locator and the last r(X) the error
+    evaluator, both scaled by the same nonzero constant.
+
+    Args:
+        syndromes: [S_1, ..., S_2t]
+        gf: Galois Field object
+        t: Error correction capability
+
+    Returns:
+        sigma: Error locator coefficients [σ_0, ..., σ_l] normalized to σ_0 = 1
+               when σ_0 != 0
+        l: Degree of the locator (> t: uncorrectable)
+        omega: Error evaluator coefficients (same scaling)
+        stats: Dict with 'rounds' (polynomial divisions), 'inversions'
+               (euclid_inverse calls) and 'inverse_cycles' (their S_DIV cycles)
+    """
+    i_code = {m: icode for icode, m in ICODE_TO_M.items()}[gf.m]
+    stats = {'rounds': 0, 'inversions': 0, 'inverse_cycles': 0}
+
+    def inverse(x):
+        value, inv_stats = euclid_inverse(x, i_code)
+        stats['inversions'] += 1
+        stats['inverse_cycles'] += inv_stats['cycles']
+        return value
+
+    r0 = [0] * (2 * t) + [1]
+    r1 = list(syndromes[:2 * t])
+    t0, t1 = [0], [1]
+    while _degree(r1) >= t:
+        # r0 = q * r1 + rem, one quotient coefficient per leading term
+        deg1 = _degree(r1)
+        lead_inv = inverse(r1[deg1])
+        rem = list(r0)
+        q = [0] * (max(_degree(rem) - deg1, 0) + 1)
+        for shift in range(_degree(rem) - deg1, -1, -1):
+            coef = rem[shift + deg1]
+            if coef == 0:
+                continue
+            factor = gf.multiply(coef, lead_inv)
+            q[shift] = factor
+            for i in range(deg1 + 1):
+                rem[shift + i] ^= gf.multiply(factor, r1[i])
+
+        # t_new = t0 - q * t1
+        t_new = [0] * max(len(t0), len(q) + len(t1) - 1)
+        for i, c in enumerate(t0):
+            t_new[i] = c
+        for i, a in enumerate(q):
+            if a:
+                for j, b in enumerate(t1):
+                    t_new[i + j] ^= gf.multiply(a, b)
+
+        r0, r1 = r1, rem
+        t0, t1 = t1, t_new
+        stats['rounds'] += 1
+
+    l = _degree(t1)
+    sigma, omega = t1[:l + 1], r1[:max(_degree(r1), 0) + 1]
+    if sigma[0]:
+        scale = inverse(sigma[0])
+        sigma = [gf.multiply(c, scale) for c in sigma]
+        omega = [gf.multiply(c, scale) for c in omega]
+    return sigma, l, omega, stats
+
+
+if __name__ == "__main__":
+    import random
+    import sys
+
+    from bch_decoders import berlekamp_massey, chien_search, compute_syndromes
+
+    if len(sys.argv) >= 2 and sys.argv[1] in ['-h', '--help', 'help']:
+        print(f"Usage: {sys.argv[0]} [code|all] [options]")
+        print(f"       {sys.argv[0]} <code> <i_poly> [i_poly ...]")
+        print()
+        print("  code        1 (m=6), 2 (m=8), 3 (m=10) as in bch.v; default: all")
+        print("  i_poly      Element to invert (decimal, 0x.. or 0b..)")
+        print()
+        print("Options:")
+        print("  keq=N       Also check the Euclidean key-equation solver on N random")
+        print("              correctable words per code against berlekamp_massey")
+        print()
+        print("Exhaustively checks the inverter of extend_euc.v for every nonzero")
+        print("element and prints its S_DIV latency.")
+        sys.exit(0)
+
+    def usage_error(message):
+        print(message)
+        print(f"Use '{sys.argv[0]} --help' for usage information.")
+        sys.exit(1)
+
+    def parse_code(text):
+        code = int(text) if text.isdigit() else None
+        if code not in CODE_TO_ICODE:
+            usage_error(f"Unknown code: {text} (use {', '.join(map(str, sorted(CODE_TO_ICODE)))})")
+        return code
+
+    keq = 0
+    args = []
+    for arg in sys.argv[1:]:
+        if arg.startswith('keq='):
+            if not arg[4:].isdigit():
+                usage_error(f"Invalid word count: {arg}")
+            keq = int(arg[4:])
+        else:
+            args.append(arg)
+
+    if len(args) >= 2:
+        i_code = CODE_TO_ICODE[parse_code(args[0])]
+        m = ICODE_TO_M[i_code]
+        values = []
+        for text in args[1:]:
+            try:
+                value = int(text, 0)
+            except ValueError:
+                usage_error(f"Invalid i_poly: {text}")
+            if not 0 <= value < (1 << m):
+                usage_error(f"i_poly={text} is not an element of GF(2^{m})")
+            values.append(value)
+        for value in values:
+            o_poly, stats = euclid_inverse(value, i_code)
+            print(f"GF(2^{m}) i_code={i_code}: i_poly={value:0{POLY_WIDTH}b} -> "
+                  f"o_poly={o_poly:0{POLY_WIDTH}b}  "
+                  f"({stats['rounds']} rounds, {stats['cycles']} S_DIV cycles)")
+        sys.exit(0)
+
+    codes = sorted(BCH_PARAMS) if not args or args[0] == 'all' else [parse_code(args[0])]
+    failed = False
+    for code in codes:
+        i_code = CODE_TO_ICODE[code]
+        result = verify_inverter(i_code)
+        failed |= result['errors'] > 0
+        hist = ", ".join(f"{c}:{k}" for c, k in result['histogram'].items())
+        print(f"code {code} (i_code={i_code}, GF(2^{result['m']})): "
+              f"{result['errors']} mismatches, S_DIV cycles max {result['max_cycles']} "
+              f"mean {result['mean_cycles']:.2f}, rounds max {result['max_rounds']}")
+        print(f"  cycles histogram: {hist}")
+
+        if keq:
+            params = BCH_PARAMS[code]
+            n, t = params['n'], params['t']
+            gf = get_field(params['m'])
+            rng = random.Random(code)
+            mismatches = 0
+            rounds = []
+            for _ in range(keq):
+                r = [0] * n
+                for pos in rng.sample(range(n), rng.randint(1, t)):
+                    r[pos] = 1
+                S = compute_syndromes(r, gf, t)
+                sigma, l, _, stats = euclid_key_equation(S, gf, t)
+                rounds.append(stats['rounds'])
+                errors = [i for i in range(n) if r[i]]
+                if chien_search(sigma, l, gf, n) != errors:
+                    mismatches += 1
+                    continue
+                ref, ref_l = berlekamp_massey(S, gf, t)
+                if ref_l != l or list(ref[:l + 1]) != sigma:
+                    mismatches += 1
+            failed |= mismatches > 0
+            print(f"  key equation: {keq} words, {mismatches} mismatches, "
+                  f"rounds max {max(rounds)} mean {sum(rounds) / len(rounds):.2f}")
+
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+GF(2^m) Constant-Multiplier Generator
+
+Emits the per-constant multiplier functions bch.v uses
+(shift_poly_<k>_<m>: i_poly * alpha^k, 10-bit input, 11-bit output) as
+shared XOR networks, plus a Python reference with the same gates.
+
+- Per-constant functions: common subexpressions are shared inside each
+  function; drop-in replacements for the hand-written ones.
+- Bank function: one function computing i_poly * alpha^k for a whole list
+  of k from the same input, sharing subexpressions across the bank (e.g.
+  one Chien register times alpha^k, alpha^2k, ...).
+
+Every network is checked against GF multiplication for all 2^m inputs
+before it is emitted.
+"""
+
+import time
+
+import numpy as np
+
+from bch_decoders import get_field
+from xor_network import (const_mult_matrix, cse_network, evaluate_network,
+                         min_depth, xor_count_naive)
+
+INPUT_WIDTH = 10    # input [9:0] i_poly
+OUTPUT_WIDTH = 11   # function automatic [10:0]
+
+
+def parse_exponents(spec):
+    """'a:b' (inclusive) or 'a,b,c' -> list of ints"""
+    if ':' in spec:
+        start, stop = (int(x) for x in spec.split(':'))
+        return list(range(start, stop + 1))
+    return [int(x) for x in spec.split(',')]
+
+
+def bank_matrix(gf, exponents):
+    """Stacked multiplier matrices [len(exponents)*m, m]"""
+    return np.concatenate([const_mult_matrix(gf, k) for k in exponents])
+
+
+def build_network(gf, exponents, depth='min'):
+    """
+    Shared XOR network of a bank of constants, checked exhaustively
+
+    Args:
+        gf: GaloisField
+        exponents: Constants alpha^k to multiply by
+        depth: 'min' (no deeper than the shallowest unshared trees),
+               an int bound, or None (fewest XORs, any depth)
+
+    Returns:
+        (XorNetwork, matrix)
+    """
+    M = bank_matrix(gf, exponents)
+    if depth == 'min':
+        depth = max(min_depth(const_mult_matrix(gf, k)) for k in exponents)
+    net = cse_network(M, max_depth=depth)
+
+    m = gf.m
+    values = np.arange(1 << m)
+    bits = ((values[:, None] >> np.arange(m)) & 1).astype(np.uint8)
+    out = evaluate_network(net, bits).reshape(-1, len(exponents), m)
+    got = (out.astype(np.int64) << np.arange(m)).sum(axis=2)
+    exp_np = np.asarray(gf.exp_table, dtype=np.int64)
+    log_np = np.asarray(gf.log_table, dtype=np.int64)
+    for col, k in enumerate(exponents):
+        expected = np.where(values == 0, 0, exp_np[(log_np[values] + k) % gf.n])
+        if not np.array_equal(got[:, col], expected):
+            raise AssertionError(f"XOR network for alpha^{k} in GF(2^{m}) is wrong")
+    return net, M
+
+
+def _signal(net, s, temp):
+    """Verilog operand of signal s"""
+    if s < net.num_inputs:
+        return f"i_poly[{s}]"
+    return f"{temp}[{s - net.num_inputs}]"
+
+
+def verilog_function(net, name, m, exponents, temp='x'):
+    """
+    Verilog function for a network built by build_network
+
+    One exponent gives the bch.v shift_poly layout ([10:0], zero-padded);
+    several give a [len*m-1:0] bank with alpha^k at slice col*m +: m.
+    """
+    bank = len(exponents) > 1
+    width = len(exponents) * m if bank else OUTPUT_WIDTH
+    lines = []
+    if bank:
+        terms = ", ".join(f"[{col * m + m - 1}:{col * m}] = alpha^{k}"
+                          for col, k in enumerate(exponents))
+        lines.append(f"\t// i_poly * {terms}")
+    lines.append(f"\tfunction automatic [{width - 1}:0] {name};")
+    lines.append(f"\t\tinput [{INPUT_WIDTH - 1}:0] i_poly;")
+    if net.gates:
+        lines.append(f"\t\treg [{len(net.gates) - 1}:0] {temp};")
+    lines.append("\t\tbegin")
+    for g, (a, b) in enumerate(net.gates):
+        lines.append(f"\t\t\t{temp}[{g}] = {_signal(net, a, temp)} ^ {_signal(net, b, temp)};")
+    for bit, s in enumerate(net.outputs):
+        value = "1'b0" if s is None else _signal(net, s, temp)
+        lines.append(f"\t\t\t{name}[{bit}] = {value};")
+    if not bank:
+        if m == OUTPUT_WIDTH - 1:
+            lines.append(f"\t\t\t{name}[{m}] = 1'b0;")
+        else:
+            lines.append(f"\t\t\t{name}[{OUTPUT_WIDTH - 1}:{m}] = {OUTPUT_WIDTH - m}'d0;")
+    lines.append("\t\tend")
+    lines.append("\tendfunction")
+    return "\n".join(lines) + "\n"
+
+
+def python_function(net, name, m, exponents):
+    """Python reference of the same gates (bank results packed like Verilog)"""
+    lines = [f"def {name}(i_poly):"]
+    terms = ", ".join(f"alpha^{k}" for k in exponents)
+    lines.append(f'    """i_poly * {terms} in GF(2^{m})"""')
+    lines.append(f"    b = [(i_poly >> i) & 1 for i in range({m})]")
+    names = [f"b[{i}]" for i in range(net.num_inputs)]
+    for g, (a, b) in enumerate(net.gates):
+        lines.append(f"    x{g} = {names[a]} ^ {names[b]}")
+        names.append(f"x{g}")
+    bits = [f"({names[s]} << {bit})" for bit, s in enumerate(net.outputs) if s is not None]
+    lines.append(f"    return {' | '.join(bits) if bits else '0'}")
+    return "\n".join(lines) + "\n"
+
+
+def generate(m, exponents, bank=None, depth='min'):
+    """
+    Generate Verilog and Python for a list of constants
+
+    Args:
+        m: Field size (6, 8 or 10)
+        exponents: k of the constants alpha^k
+        bank: Name of one shared bank function, or None for one
+              shift_poly_<k>_<m> function per constant
+        depth: See build_network
+
+    Returns:
+        (verilog, python, stats) with stats = {'xor_naive', 'xor',
+        'depth_naive', 'depth', 'seconds'}
+    """
+    start = time.time()
+    gf = get_field(m)
+    groups = [(bank, exponents)] if bank else [(f"shift_poly_{k}_{m}", [k]) for k in exponents]
+
+    verilog, python = [], []
+    stats = {'xor_naive': 0, 'xor': 0, 'depth_naive': 0, 'depth': 0}
+    for name, group in groups:
+        net, M = build_network(gf, group, depth)
+        verilog.append(verilog_function(net, name, m, group))
+        python.append(python_function(net, name, m, group))
+        stats['xor_naive'] += xor_count_naive(M)
+        stats['xor'] += len(net.gates)
+        stats['depth_naive'] = max(stats['depth_naive'], min_depth(M))
+        stats['depth'] = max(stats['depth'], net.depth)
+    stats['seconds'] = time.time() - start
+
+    header = (f"# Generated by gen_const_mult.py: GF(2^{m}), "
+              f"alpha^k for k in {exponents}\n\n")
+    return "\n".join(verilog), header + "\n\n".join(python), stats
+
+
+if __name__ == "__main__":
+    import os
+    import sys
+
+    if len(sys.argv) < 3 or sys.argv[1] in ['-h', '--help', 'help']:
+        print(f"Usage: {sys.argv[0]} <m> <exponents> [options]")
+        print()
+        print("  exponents      a:b (inclusive) or a,b,c")
+        print()
+        print("Options (key=value):")
+        print("  bank=NAME      One shared function for all constants")
+        print("  depth=min      XOR depth bound: min (default), N, or none")
+        print("  v=FILE         Write the Verilog functions (default: stdout)")
+        print("  py=FILE        Write the Python reference")
+        sys.exit(0)
+
+    m = int(sys.argv[1])
+    exponents = parse_exponents(sys.argv[2])
+    options = {'bank': None, 'depth': 'min', 'v': None, 'py': None}
+    for arg in sys.argv[3:]:
+        key, _, value = arg.partition('=')
+        if key not in options or not value:
+            print(f"Unknown argument: {arg}")
+            sys.exit(1)
+        options[key] = value
+
+    depth = options['depth']
+    if depth == 'none':
+        depth = None
+    elif depth != 'min':
+        depth = int(depth)
+
+    verilog, python, stats = generate(m, exponents, bank=options['bank'], depth=depth)
+
+    if options['v']:
+        with open(options['v'], 'w') as f:
+            f.write(verilog)
+    else:
+        try:
+            print(verilog)
+            sys.stdout.flush()
+        except BrokenPipeError:
+            # Reader closed the pipe (e.g. | head): drop the rest of stdout
+            # so the flush at exit does not fail again
+            os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+    if options['py']:
+        with open(options['py'], 'w') as f:
+            f.write(python)
+
+    print(f"GF(2^{m}), {len(exponents)} constant(s): "
+          f"XOR {stats['xor_naive']} -> {stats['xor']}, "
+          f"depth {stats['depth_naive']} -> {stats['depth']} "
+          f"({stats['seconds'] * 1e3:.1f} ms)", file=sys.stderr)
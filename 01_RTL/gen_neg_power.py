@@ -1,57 +1,58 @@
+import csv
+import sys
+
+import numpy as np
+
+from bch_decoders import PRIMITIVE_POLYS, get_field
+
+# 匯出時預設涵蓋的 Field (對應 BCH Project 的三種規格)
+EXPORT_FIELDS = (6, 8, 10)
+
+
+def _field(m):
+    """
+    取得 GF(2^m) 的共用 exp/log 表 (bch_decoders.get_field 有快取，
+    同一個 m 只會建表一次)。
+    """
+    if m not in PRIMITIVE_POLYS:
+        return None
+    return get_field(m)
+
+
+def get_alpha_power_value(m, i):
+    """
+    計算 alpha^i (i 可為負數) 在 GF(2^m) 中的多項式數值 (bit k = alpha^k 的係數)。
+    查表 O(1)：alpha^(-i) = alpha^((-i) mod (2^m - 1))。
+    """
+    gf = _field(m)
+    if gf is None:
+        raise ValueError(f"目前不支援 m={m}，請在 PRIMITIVE_POLYS 新增該 Field 的本原多項式。")
+    return gf.exp_table[i % gf.n]
+
+
+def get_alpha_inverse_value(m, i):
+    """計算 alpha^(-i) 在 GF(2^m) 中的多項式數值。"""
+    return get_alpha_power_value(m, -i)
+
+
 def get_alpha_inverse_poly(m, i):
     """
     計算 alpha^(-i) 在 GF(2^m) 中的多項式表示法。
     支援 m = 6, 8, 10 (對應您的 BCH Project 規格)。
     """
-    
-    # 定義本原多項式 (Primitive Polynomials)
-    # 這裡只儲存最高次項以外的部分 (Mask)
-    # 例如 m=6, p(x) = 1 + x + x^6 => x^6 = 1 + x (binary: 000011 -> 0x03)
-    polys = {
-        6: 0x03,   # 1 + x + x^6
-        8: 0x1D,   # 1 + x^2 + x^3 + x^4 + x^8
-        10: 0x09   # 1 + x^3 + x^10
-    }
-    
-    if m not in polys:
+    if _field(m) is None:
         return f"錯誤: 目前不支援 m={m}，請手動新增該 Field 的本原多項式。"
-    
-    prim_poly = polys[m]
-    # 有限域的週期 (Order) 是 2^m - 1
-    period = (1 << m) - 1
-    
-    # 計算 -i 在模 (2^m - 1) 下的等效正指數
-    # alpha^(-i) = alpha^(period - i)
-    target_exp = (-i) % period
-    
-    # 開始計算 alpha^target_exp
-    # reg 代表目前的數值，初始化為 1 (即 alpha^0)
-    # 我們使用 LFSR 的方式模擬乘法
-    reg = 1
-    
-    for _ in range(target_exp):
-        # 檢查最高位 (MSB) 是否為 1
-        is_msb_set = (reg >> (m - 1)) & 1
-        
-        # 左移一位 (相當於乘 alpha)
-        reg = (reg << 1) & period # 確保不超過 m bits
-        
-        # 如果原本最高位是 1，則需要 XOR 本原多項式 (模運算)
-        if is_msb_set:
-            reg ^= prim_poly
-            
-    # 將結果轉換為多項式字串格式回傳
-    return format_poly(reg)
+    return format_poly(get_alpha_inverse_value(m, i))
+
 
 def format_poly(val):
     """將整數轉換為多項式字串表示法 (例如: alpha^5 + alpha^2 + 1)"""
     if val == 0:
         return "0"
-    
+
     terms = []
-    # 檢查每一個 bit
-    # 假設我們不超過 20 bits，這裡寫個迴圈檢查
-    for k in range(20, -1, -1):
+    # 只檢查實際用到的 bit (最高位由 bit_length 決定)
+    for k in range(val.bit_length() - 1, -1, -1):
         if (val >> k) & 1:
             if k == 0:
                 terms.append("1")
@@ -59,19 +60,124 @@ def format_poly(val):
                 terms.append("alpha")
             else:
                 terms.append(f"alpha^{k}")
-                
+
     return " + ".join(terms)
 
+
+# --- 批次匯出 ---
+
+def alpha_inverse_table(m):
+    """
+    一次產生整張表：table[i] = alpha^(-i)，i = 0 .. 2^m - 2。
+    直接由 exp 表反向取值 (NumPy 向量化)。
+    """
+    gf = _field(m)
+    if gf is None:
+        raise ValueError(f"目前不支援 m={m}")
+    exp_np = np.asarray(gf.exp_table[:gf.n], dtype=np.int64)
+    return exp_np[(-np.arange(gf.n)) % gf.n]
+
+
+def export_verilog(fields=EXPORT_FIELDS):
+    """
+    匯出 Verilog case ROM：每個 m 一個 function alpha_inv_<m>，
+    輸入 i (m bits，0 .. 2^m-1 全部列出)，輸出 alpha^(-i) (m bits)，
+    寫法與 bch.v 的 function 相同。
+    """
+    blocks = []
+    for m in fields:
+        table = alpha_inverse_table(m)
+        name = f"alpha_inv_{m}"
+        lines = [f"\t// alpha^(-i) in GF(2^{m}), i = 0 .. {len(table)}"
+                 f" (alpha^-{len(table)} = alpha^0)",
+                 f"\tfunction automatic [{m - 1}:0] {name};",
+                 f"\t\tinput [{m - 1}:0] i;",
+                 "\t\tbegin",
+                 "\t\t\tcase (i)"]
+        for i, value in enumerate(table):
+            lines.append(f"\t\t\t\t{m}'d{i}: {name} = {m}'b{int(value):0{m}b};")
+        # i = 2^m - 1 也是合法輸入：alpha^-(2^m-1) = alpha^0 = 1
+        lines.append(f"\t\t\t\t{m}'d{len(table)}: {name} = {m}'b{1:0{m}b};")
+        lines.append(f"\t\t\t\tdefault: {name} = {m}'d0;")
+        lines += ["\t\t\tendcase", "\t\tend", "\tendfunction", ""]
+        blocks.append("\n".join(lines))
+    return "\n".join(blocks)
+
+
+def export_python(fields=EXPORT_FIELDS):
+    """匯出 Python 陣列：ALPHA_INV_<m>[i] = alpha^(-i)"""
+    lines = ["# alpha^(-i) in GF(2^m): ALPHA_INV_<m>[i], generated by gen_neg_power.py", ""]
+    for m in fields:
+        values = alpha_inverse_table(m).tolist()
+        lines.append(f"ALPHA_INV_{m} = [")
+        for start in range(0, len(values), 16):
+            lines.append("    " + ", ".join(str(v) for v in values[start:start + 16]) + ",")
+        lines += ["]", ""]
+    return "\n".join(lines)
+
+
+def write_csv(f, fields=EXPORT_FIELDS):
+    """匯出 CSV：m, i, 二進位, 十六進位, 多項式"""
+    writer = csv.writer(f)
+    writer.writerow(["m", "i", "bin", "hex", "poly"])
+    for m in fields:
+        for i, value in enumerate(alpha_inverse_table(m).tolist()):
+            writer.writerow([m, i, f"{value:0{m}b}", f"{value:x}", format_poly(value)])
+
+
+def export_tables(fmt, path=None, fields=EXPORT_FIELDS):
+    """
+    fmt = 'verilog' / 'python' / 'csv'，path = None 時輸出到 stdout。
+    """
+    out = open(path, "w", newline="") if path else sys.stdout
+    try:
+        if fmt == "verilog":
+            out.write(export_verilog(fields))
+        elif fmt == "python":
+            out.write(export_python(fields))
+        elif fmt == "csv":
+            write_csv(out, fields)
+        else:
+            raise ValueError(f"未知的格式: {fmt} (verilog / python / csv)")
+    finally:
+        if path:
+            out.close()
+
+
 # --- 使用範例 ---
 
-m = 6
-i = 16
-print(f"GF(2^{m}), alpha^(-{i}) = {get_alpha_inverse_poly(m, i)}")
+if __name__ == "__main__":
+    if len(sys.argv) >= 2 and sys.argv[1] in ["-h", "--help", "help"]:
+        print(f"Usage: {sys.argv[0]}                              範例 (m=6, i=16/24/32)")
+        print(f"       {sys.argv[0]} <m> <i> [i ...]              查詢 alpha^(-i)")
+        print(f"       {sys.argv[0]} export <verilog|python|csv> [m=6,8,10] [out=FILE]")
+        sys.exit(0)
+
+    if len(sys.argv) >= 2 and sys.argv[1] == "export":
+        fmt = sys.argv[2] if len(sys.argv) >= 3 else "verilog"
+        fields, path = EXPORT_FIELDS, None
+        for arg in sys.argv[3:]:
+            if arg.startswith("m="):
+                fields = tuple(int(x) for x in arg[2:].split(","))
+            elif arg.startswith("out="):
+                path = arg[4:]
+        export_tables(fmt, path, fields)
+        sys.exit(0)
+
+    if len(sys.argv) >= 3:
+        m = int(sys.argv[1])
+        for i in (int(x) for x in sys.argv[2:]):
+            print(f"GF(2^{m}), alpha^(-{i}) = {get_alpha_inverse_poly(m, i)}")
+        sys.exit(0)
+
+    m = 6
+    i = 16
+    print(f"GF(2^{m}), alpha^(-{i}) = {get_alpha_inverse_poly(m, i)}")
 
-m = 6
-i = 24
-print(f"GF(2^{m}), alpha^(-{i}) = {get_alpha_inverse_poly(m, i)}")
+    m = 6
+    i = 24
+    print(f"GF(2^{m}), alpha^(-{i}) = {get_alpha_inverse_poly(m, i)}")
 
-m = 6
-i = 32
-print(f"GF(2^{m}), alpha^(-{i}) = {get_alpha_inverse_poly(m, i)}")
+    m = 6
+    i = 32
+    print(f"GF(2^{m}), alpha^(-{i}) = {get_alpha_inverse_poly(m, i)}")
@@ -1,6 +1,13 @@
+import hashlib
+import multiprocessing
 import os
 import random
-from typing import List, Optional, Tuple
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from bch_decoders import BCH_PARAMS, cached, get_code
+from pattern_io import BinaryPatternWriter, llr_rows_text
 
 # ------------------------------------------------------------
 # BCH 規格表：m -> (m, n, k, t, g(x) 的非零次方)
@@ -47,6 +54,10 @@ PCODE_MAP = {
 }
 
 
+# m -> bch_decoders 的 code_type
+CODE_TYPE_BY_M = {params["m"]: ct for ct, params in BCH_PARAMS.items()}
+
+
 # ------------------------------------------------------------
 # 多項式工具：用 int 表示 GF(2) 多項式
 # ------------------------------------------------------------
@@ -59,6 +70,21 @@ def build_gen_bits(g_exponents: List[int]) -> List[int]:
     return bits
 
 
+def generator_int(spec: dict) -> int:
+    """
+    g(x) 的 int 表示（bit i = x^i 係數），每個 process 只建一次。
+    取自 bch_decoders.get_code，編碼端與解碼端共用同一份 g(x)；
+    spec["g_exponents"] 只拿來交叉檢查，不一致就報錯。
+    """
+    def build() -> int:
+        g_int = get_code(CODE_TYPE_BY_M[spec["m"]])["generator"]
+        g_spec = sum((bit & 1) << i for i, bit in enumerate(build_gen_bits(spec["g_exponents"])))
+        if g_int != g_spec:
+            raise ValueError(f"g_exponents of m={spec['m']} do not match the BCH generator polynomial")
+        return g_int
+    return cached(("generator_int", spec["m"], tuple(spec["g_exponents"])), build)
+
+
 def poly_mod_int(dividend: int, divisor: int) -> int:
     """GF(2) 多項式整除：回傳 dividend / divisor 的餘數（int 型態）。"""
     if divisor == 0:
@@ -71,6 +97,38 @@ def poly_mod_int(dividend: int, divisor: int) -> int:
     return r
 
 
+# ------------------------------------------------------------
+# 查表式餘數計算（類似 CRC engine）
+# ------------------------------------------------------------
+def remainder_table(spec: dict) -> List[int]:
+    """
+    byte-wise 餘數表：table[b] = b(x) * x^(n-k) mod g(x)，b = 0..255。
+    每個 generator 只建一次（共用 cache）。
+    """
+    def build() -> List[int]:
+        g_int = generator_int(spec)
+        deg = g_int.bit_length() - 1
+        return [poly_mod_int(b << deg, g_int) for b in range(256)]
+
+    return cached(("remainder_table", spec["m"], tuple(spec["g_exponents"])), build)
+
+
+def poly_mod_bytewise(m_int: int, k: int, spec: dict) -> int:
+    """
+    m(x) * x^(n-k) mod g(x)，一次處理 8 個 message bits（最高次先進）。
+    需要 deg g(x) >= 8，三種規格都成立。
+    """
+    table = remainder_table(spec)
+    deg = spec["n"] - spec["k"]
+    mask = (1 << deg) - 1
+    top = deg - 8
+
+    rem = 0
+    for byte in m_int.to_bytes((k + 7) // 8, "big"):
+        rem = ((rem << 8) & mask) ^ table[(rem >> top) ^ byte]
+    return rem
+
+
 # ------------------------------------------------------------
 # BCH 編碼 (systematic)：m(x) * x^(n-k) mod g(x)
 # ------------------------------------------------------------
@@ -81,65 +139,92 @@ def encode_bch(msg_bits: List[int], spec: dict) -> List[int]:
     """
     n = spec["n"]
     k = spec["k"]
-    g_bits = build_gen_bits(spec["g_exponents"])
 
-    # message m(x)
-    m_int = sum((bit & 1) << i for i, bit in enumerate(msg_bits))
-    # generator g(x)
-    g_int = sum((bit & 1) << i for i, bit in enumerate(g_bits))
+    # message m(x)：bits 反轉後當成二進位字串，一次轉成 int
+    m_int = int("".join("1" if bit & 1 else "0" for bit in reversed(msg_bits)), 2)
+
+    # systematic encoding: c(x) = m(x) * x^(n-k) + r(x)，r(x) 用查表算
+    rem = poly_mod_bytewise(m_int, k, spec)
+    cw_int = (m_int << (n - k)) ^ rem
 
-    # systematic encoding: c(x) = m(x) * x^(n-k) + r(x)
-    shifted = m_int << (n - k)
-    rem = poly_mod_int(shifted, g_int)
-    cw_int = shifted ^ rem
+    cw_str = format(cw_int, f"0{n}b")
+    return [1 if c == "1" else 0 for c in reversed(cw_str)]
 
-    cw_bits = [(cw_int >> i) & 1 for i in range(n)]
-    return cw_bits
+
+def parity_matrix(spec: dict) -> np.ndarray:
+    """
+    systematic parity 矩陣 P (k x (n-k), float32)：
+    第 i 列 = x^(i + n-k) mod g(x) 的係數，parity = msg @ P (mod 2)。
+    """
+    def build() -> np.ndarray:
+        n, k = spec["n"], spec["k"]
+        deg = n - k
+        g_int = generator_int(spec)
+        P = np.zeros((k, deg), dtype=np.float32)
+        rem = poly_mod_int(1 << deg, g_int)
+        for i in range(k):
+            P[i] = [(rem >> j) & 1 for j in range(deg)]
+            # x^(i+1+deg) mod g = x * (x^(i+deg) mod g) mod g
+            rem <<= 1
+            if rem >> deg:
+                rem ^= g_int
+        return P
+
+    return cached(("parity_matrix", spec["m"], tuple(spec["g_exponents"])), build)
+
+
+def encode_bch_batch(msgs: np.ndarray, spec: dict) -> np.ndarray:
+    """
+    一次編碼多個 message。
+
+    msgs: uint8 [batch, k]，msgs[b, i] 對應 x^i 的係數
+    回傳 codewords: uint8 [batch, n]，前 n-k 個是 parity，後 k 個是 message
+    """
+    msgs = np.asarray(msgs, dtype=np.uint8)
+    if msgs.ndim != 2 or msgs.shape[1] != spec["k"]:
+        raise ValueError(f"msgs must have shape (batch, {spec['k']})")
+
+    # 0/1 的內積最多 k <= 983，float32 可精確表示
+    parity = (msgs.astype(np.float32) @ parity_matrix(spec)).astype(np.int32) & 1
+    return np.concatenate([parity.astype(np.uint8), msgs], axis=1)
 
 
 # ------------------------------------------------------------
-# LLR byte 產生
+# LLR 值產生（signed 8-bit 整數）
 # ------------------------------------------------------------
-def llr_byte_from_bit_hard(bit: int) -> str:
+def llr_value_hard(bit: int, rng=random) -> int:
     """
     硬判決版本（帶隨機 magnitude）：
-      bit = 0 -> 正值或 0（MSB=0）
-      bit = 1 -> 負值      （MSB=1）
+      bit = 0 -> 0 ~ +127
+      bit = 1 -> -1 ~ -128 (完整 signed 8-bit)
+    rng: random.Random 物件，預設用全域 random 模組
     """
     if bit == 0:
-        # MSB=0 → signed: 0 ~ +127
-        mag = random.randint(0, 127)
-        val = mag
-    else:
-        # MSB=1 → signed: -1 ~ -128  (完整 signed 8-bit)
-        mag = random.randint(1, 128)     # absolute value
-        val = (-mag) & 0xFF              # 二補數
-    return f"{val:08b}"
+        return rng.randint(0, 127)
+    return -rng.randint(1, 128)
 
 
-
-def llr_byte_from_bit_soft(bit: int, mag: int) -> str:
+def llr_value_soft(bit: int, mag: int) -> int:
     """
     soft 版本：
-      bit = 0 -> +mag   (0xxxxxxx)，mag 會被限制在 0~127
-      bit = 1 -> -mag   (1xxxxxxx，二補數)，mag 可到 128 → -128
+      bit = 0 -> +mag，mag 限制在 0~127
+      bit = 1 -> -mag，mag 限制在 1~127（mag=0 也要是負數）
     """
     assert 0 <= mag <= 127
 
     if bit == 0:
-        # 正值：避免 mag=128 變成 1000_0000 (看起來像負數)
-        if mag > 127:
-            mag = 127
-        val = mag                  # 0..127, MSB=0
-    else:
-        # 負值：允許 mag=1..128 → -1..-127
-        if mag == 0:
-            mag = 1
-        elif mag > 127:
-            mag = 127
-        val = (-mag) & 0xFF        # 8-bit 二補數，MSB=1
-    return f"{val:08b}"
+        return min(mag, 127)
+    return -min(max(mag, 1), 127)
+
 
+def llr_byte_from_bit_hard(bit: int, rng=random) -> str:
+    """硬判決 LLR 的 8-bit 二補數字串（MSB=0 正、MSB=1 負）。"""
+    return f"{llr_value_hard(bit, rng) & 0xFF:08b}"
+
+
+def llr_byte_from_bit_soft(bit: int, mag: int) -> str:
+    """soft LLR 的 8-bit 二補數字串。"""
+    return f"{llr_value_soft(bit, mag) & 0xFF:08b}"
 
 
 def llr_rows_from_llr_array(llr_array: List[str], m: int) -> List[str]:
@@ -165,68 +250,96 @@ def llr_rows_from_llr_array(llr_array: List[str], m: int) -> List[str]:
 
 
 # ------------------------------------------------------------
-# hard / soft 版本的 codeword -> LLR rows
+# 向量化格式化：int8 LLR 矩陣 -> 64-bit ASCII rows
 # ------------------------------------------------------------
-def cw_bits_to_llr_rows_hard(cw_bits: List[int], m: int) -> List[str]:
+def llr_text_from_int8(llr: np.ndarray, m: int) -> str:
     """
-    硬判決：完全照你原本的 p100.txt 格式，只是自動產生。
+    llr: int8 [batch, 2^m]（或單一 codeword 的 [2^m]），llr[b, e] 是 X^e 的 LLR
+    回傳整批 codeword 的 p.txt 文字：每列 64 bits + "\n"，
+    每個 codeword 從 X^(2^m-1) 到 X^0，dummy X^n 強制為 00000000。
+    全程用 byte 陣列運算（pattern_io.llr_rows_text），不產生逐 bit 的小字串。
+    """
+    return llr_rows_text(llr_file_order(llr, m))
+
+
+def llr_file_order(llr: np.ndarray, m: int) -> np.ndarray:
+    """
+    X^e 索引的 int8 LLR [batch, 2^m] -> 檔案順序（X^(2^m-1) 在前），
+    dummy X^n 強制為 0。
     """
-    n = (1 << m) - 1
-    assert len(cw_bits) == n
     M = 1 << m
+    llr = np.array(llr, dtype=np.int8).reshape(-1, M)
+    llr[:, M - 1] = 0
+    return np.ascontiguousarray(llr[:, ::-1])
 
-    llr_array = ["00000000"] * M
 
-    # X^0..X^(n-1) 的係數
-    for e in range(n):
-        llr_array[e] = llr_byte_from_bit_hard(cw_bits[e])
+def llr_rows_from_int8(llr: np.ndarray, m: int) -> List[str]:
+    """同 llr_text_from_int8，但回傳不含換行的 row 列表。"""
+    return llr_text_from_int8(llr, m).splitlines()
 
-    # dummy X^n：係數固定 0，LLR 也要固定 00000000
-    llr_array[n] = "00000000"
 
-    return llr_rows_from_llr_array(llr_array, m)
+# ------------------------------------------------------------
+# hard / soft 版本的 codeword -> LLR
+# ------------------------------------------------------------
+def cw_bits_to_llr_hard(cw_bits: List[int], m: int, rng=random) -> np.ndarray:
+    """硬判決：X^0..X^(n-1) 的隨機 magnitude LLR，回傳 int8 [2^m]（dummy = 0）。"""
+    n = (1 << m) - 1
+    assert len(cw_bits) == n
 
+    llr = np.zeros(1 << m, dtype=np.int8)
+    llr[:n] = [llr_value_hard(bit, rng) for bit in cw_bits]
+    return llr
 
-def cw_bits_to_llr_rows_soft(
-    cw_bits: List[int],
-    mags: List[int],
-    m: int,
-) -> List[str]:
+
+def cw_bits_to_llr_soft(cw_bits: List[int], mags: List[int], m: int) -> np.ndarray:
     """
     soft 判決：LLR 由 cw_bits 的 sign + mags 的絕對值組合而成。
     mags[e] 是 X^e 的 |LLR| (0..127)，包含 dummy 那一個。
+    回傳 int8 [2^m]（dummy = 0）。
     """
     n = (1 << m) - 1
     assert len(cw_bits) == n
-    M = 1 << m
-    assert len(mags) == M  # 包含 dummy
+    assert len(mags) == 1 << m  # 包含 dummy
 
-    llr_array = ["00000000"] * M
+    llr = np.zeros(1 << m, dtype=np.int8)
+    llr[:n] = [llr_value_soft(bit, mag) for bit, mag in zip(cw_bits, mags)]
+    return llr
 
-    for e in range(n):
-        bit = cw_bits[e]
-        mag = mags[e]
-        llr_array[e] = llr_byte_from_bit_soft(bit, mag)
 
-    # dummy bit X^n：係數無意義且 LLR 必須是 00000000
-    llr_array[n] = "00000000"
+def cw_bits_to_llr_rows_hard(cw_bits: List[int], m: int, rng=random) -> List[str]:
+    """
+    硬判決：完全照你原本的 p100.txt 格式，只是自動產生。
+    """
+    return llr_rows_from_int8(cw_bits_to_llr_hard(cw_bits, m, rng), m)
 
-    return llr_rows_from_llr_array(llr_array, m)
+
+def cw_bits_to_llr_rows_soft(
+    cw_bits: List[int],
+    mags: List[int],
+    m: int,
+) -> List[str]:
+    """
+    soft 判決：LLR 由 cw_bits 的 sign + mags 的絕對值組合而成。
+    mags[e] 是 X^e 的 |LLR| (0..127)，包含 dummy 那一個。
+    """
+    return llr_rows_from_int8(cw_bits_to_llr_soft(cw_bits, mags, m), m)
 
 
 # ------------------------------------------------------------
 # 產生「單一 codeword」的 p_rows / pa_lines
 # ------------------------------------------------------------
-def generate_single_bch_codeword(
+def generate_single_bch_llr(
     m: int,
     soft: bool,
-) -> Tuple[List[str], List[str]]:
+    rng=random,
+) -> Tuple[np.ndarray, List[str]]:
     """
-    產生一個 codeword 的測資。
+    產生一個 codeword 的測資（LLR 尚未格式化）。
+    rng: 亂數來源（random.Random），預設為全域 random 模組
 
     回傳:
-      p_rows_one : 該 codeword 對應的 p.txt 多行（每行 64 bits）
-      pa_one     : 該 codeword 對應的 pa.txt 多行（每行 10 bits）
+      llr_one : int8 [2^m]，llr_one[e] 是 X^e 的 LLR（dummy X^n = 0）
+      pa_one  : 該 codeword 對應的 pa.txt 多行（每行 10 bits）
     """
     if m not in BCH_SPECS:
         raise ValueError(f"Unsupported m={m}")
@@ -235,7 +348,7 @@ def generate_single_bch_codeword(
     n, k, t = spec["n"], spec["k"], spec["t"]
 
     # 1. 隨機產生 message bits
-    msg_bits = [random.randint(0, 1) for _ in range(k)]
+    msg_bits = [rng.randint(0, 1) for _ in range(k)]
 
     # 2. BCH systematic encoding -> 真實 codeword
     cw_clean = encode_bch(msg_bits, spec)
@@ -244,12 +357,12 @@ def generate_single_bch_codeword(
 
     if not soft:
         # -------- Hard decision 測資：最多 t 個錯誤 --------
-        num_err = random.randint(0, t)
+        num_err = rng.randint(0, t)
         cw_bits = cw_clean[:]
         error_positions: List[int] = []
 
         if num_err > 0:
-            error_positions = random.sample(range(n), num_err)
+            error_positions = rng.sample(range(n), num_err)
             for pos in error_positions:
                 cw_bits[pos] ^= 1
 
@@ -258,42 +371,41 @@ def generate_single_bch_codeword(
         else:
             pa_lines_one.append(f"{1023:010b}")
 
-        p_rows_one = cw_bits_to_llr_rows_hard(cw_bits, m)
-        return p_rows_one, pa_lines_one
+        return cw_bits_to_llr_hard(cw_bits, m, rng), pa_lines_one
 
     # -------- Soft decision 測資：最多 t+2 錯誤 --------
     cw_bits = cw_clean[:]
     M = 1 << m
 
     # 先挑兩個「最不可靠」的位置：硬體會先挑這兩個去 flip
-    s1, s2 = random.sample(range(n), 2)
+    s1, s2 = rng.sample(range(n), 2)
     soft_candidates = [s1, s2]
 
     # 初始化每個位置的 |LLR|：
     # 先全部給「大範圍」[64, 127]，再覆蓋特殊的
     mags = [0] * M
     for e in range(n):
-        mags[e] = random.randint(64, 127)
+        mags[e] = rng.randint(64, 127)
     # dummy bit X^n：係數無意義，mags[n] 也不用理，最後 LLR 會是 00000000
     mags[n] = 0
 
     # 這兩個 soft 候選：給最小 |LLR| 範圍 [1, 16]
     for s in soft_candidates:
-        mags[s] = random.randint(1, 16)
+        mags[s] = rng.randint(1, 16)
 
     # 先對 soft_candidates 決定要不要翻（最多 2 個錯）
     soft_err = set()
     for s in soft_candidates:
-        if random.choice([True, False]):
+        if rng.choice([True, False]):
             cw_bits[s] ^= 1
             soft_err.add(s)
 
     # 剩下 bits 再選 0..t 個錯誤
     remaining_indices = [i for i in range(n) if i not in soft_candidates]
-    num_err_hard = random.randint(0, t)
+    num_err_hard = rng.randint(0, t)
     hard_err = set()
     if num_err_hard > 0 and remaining_indices:
-        chosen = random.sample(
+        chosen = rng.sample(
             remaining_indices,
             min(num_err_hard, len(remaining_indices)),
         )
@@ -303,7 +415,7 @@ def generate_single_bch_codeword(
 
         # 這些「剩下翻錯的 bit」：給第二小 |LLR| 範圍 [17, 32]
         for pos in chosen:
-            mags[pos] = random.randint(17, 32)
+            mags[pos] = rng.randint(17, 32)
 
     # 實際錯誤位置 = soft_err ∪ hard_err  (最多 t+2 個)
     error_positions = sorted(soft_err.union(hard_err))
@@ -314,9 +426,170 @@ def generate_single_bch_codeword(
     else:
         pa_lines_one.append(f"{1023:010b}")
 
-    # 用 cw_bits + mags 產生 LLR rows
-    p_rows_one = cw_bits_to_llr_rows_soft(cw_bits, mags, m)
-    return p_rows_one, pa_lines_one
+    # 用 cw_bits + mags 產生 LLR
+    return cw_bits_to_llr_soft(cw_bits, mags, m), pa_lines_one
+
+
+def generate_single_bch_codeword(
+    m: int,
+    soft: bool,
+    rng=random,
+) -> Tuple[List[str], List[str]]:
+    """
+    產生一個 codeword 的測資。
+
+    回傳:
+      p_rows_one : 該 codeword 對應的 p.txt 多行（每行 64 bits）
+      pa_one     : 該 codeword 對應的 pa.txt 多行（每行 10 bits）
+    """
+    llr_one, pa_one = generate_single_bch_llr(m, soft, rng)
+    return llr_rows_from_int8(llr_one, m), pa_one
+
+
+# ------------------------------------------------------------
+# 分塊 / 多進程產生：每個 chunk 有自己的 seed，輸出與 worker 數無關
+# ------------------------------------------------------------
+# 每個 chunk 的 codeword 數；固定值，才能保證不同 worker 數結果一致
+DEFAULT_CHUNK_SIZE = 1024
+
+
+def chunk_seed(seed: int, chunk_idx: int) -> int:
+    """由使用者 seed 和 chunk 編號導出該 chunk 的 64-bit seed。"""
+    digest = hashlib.sha256(f"bch-pattern:{seed}:{chunk_idx}".encode()).digest()
+    return int.from_bytes(digest[:8], "little")
+
+
+def binary_record(m: int, soft: bool, llr_one: np.ndarray, pa_one: List[str]) -> tuple:
+    """二進位容器的一筆 (code_type, mode, 檔案順序 LLR, 錯誤位置)。"""
+    errors = [pos for pos in (int(line, 2) for line in pa_one) if pos != 1023]
+    return (int(PCODE_MAP[m], 2), "soft" if soft else "hard",
+            llr_file_order(llr_one, m)[0], errors)
+
+
+def generate_chunk(job: tuple) -> Tuple[Tuple[str, ...], Optional[list]]:
+    """
+    worker：產生一個 chunk 的所有 codeword。
+    job = (m, soft, seed, chunk_idx, count, binary)；m 為 None 時是混和規格。
+
+    回傳 (texts, records)：
+      texts   : 各檔案要寫的文字 (p, pa) 或 (p, pa, pmode, pcode)，每行以 \n 結尾
+      records : binary=True 時為 binary_record 列表，否則 None
+    """
+    m, soft, seed, chunk_idx, count, binary = job
+    rng = random.Random(chunk_seed(seed, chunk_idx))
+    mixed = m is None
+
+    p_texts: List[str] = []
+    llrs: List[np.ndarray] = []
+    pa_lines: List[str] = []
+    pmode_lines: List[str] = []
+    pcode_lines: List[str] = []
+    records = [] if binary else None
+
+    for _ in range(count):
+        if mixed:
+            cw_soft = bool(rng.getrandbits(1))
+            cw_m = rng.choice([6, 8, 10])
+            pmode_lines.append("1" if cw_soft else "0")
+            pcode_lines.append(PCODE_MAP[cw_m])
+            llr_one, pa_one = generate_single_bch_llr(cw_m, cw_soft, rng)
+            p_texts.append(llr_text_from_int8(llr_one, cw_m))
+        else:
+            cw_m, cw_soft = m, soft
+            llr_one, pa_one = generate_single_bch_llr(m, soft, rng)
+            llrs.append(llr_one)
+        pa_lines.extend(pa_one)
+        if binary:
+            records.append(binary_record(cw_m, cw_soft, llr_one, pa_one))
+
+    # 單一規格：整個 chunk 一次格式化
+    if llrs:
+        p_texts.append(llr_text_from_int8(np.stack(llrs), m))
+
+    texts = ["".join(p_texts)] + [
+        "".join(line + "\n" for line in lines)
+        for lines in [pa_lines] + ([pmode_lines, pcode_lines] if mixed else [])
+    ]
+    return tuple(texts), records
+
+
+def iter_chunks(
+    m: Optional[int],
+    soft: bool,
+    num_codewords: int,
+    seed: int,
+    workers: int,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    binary: bool = False,
+) -> Iterator[Tuple[Tuple[str, ...], Optional[list]]]:
+    """依 chunk 順序產出 generate_chunk 的結果；workers > 1 時用 process pool。"""
+    jobs = [
+        (m, soft, seed, idx, min(chunk_size, num_codewords - start), binary)
+        for idx, start in enumerate(range(0, num_codewords, chunk_size))
+    ]
+    if workers <= 1 or len(jobs) <= 1:
+        for job in jobs:
+            yield generate_chunk(job)
+        return
+    with multiprocessing.Pool(workers) as pool:
+        # imap 保持 chunk 順序，完成一塊就交給呼叫端寫檔
+        yield from pool.imap(generate_chunk, jobs)
+
+
+def iter_serial_chunks(
+    m: Optional[int],
+    soft: bool,
+    num_codewords: int,
+    binary: bool = False,
+) -> Iterator[Tuple[Tuple[str, ...], Optional[list]]]:
+    """舊版序列產生（全域 random），一個 codeword 一塊；與舊檔案輸出相同。"""
+    for _ in range(num_codewords):
+        if m is None:
+            # 隨機選 mode: 0=hard, 1=soft；m ∈ {6,8,10}
+            cw_soft = bool(random.getrandbits(1))
+            cw_m = random.choice([6, 8, 10])
+            llr_one, pa_one = generate_single_bch_llr(cw_m, cw_soft)
+            texts = (llr_text_from_int8(llr_one, cw_m),
+                     "".join(a + "\n" for a in pa_one),
+                     "1\n" if cw_soft else "0\n",
+                     PCODE_MAP[cw_m] + "\n")
+        else:
+            cw_m, cw_soft = m, soft
+            llr_one, pa_one = generate_single_bch_llr(m, soft)
+            texts = (llr_text_from_int8(llr_one, m),
+                     "".join(a + "\n" for a in pa_one))
+        yield texts, [binary_record(cw_m, cw_soft, llr_one, pa_one)] if binary else None
+
+
+def write_chunks(
+    filenames: List[str],
+    chunks: Iterable[Tuple[Tuple[str, ...], Optional[list]]],
+    bin_filename: Optional[str] = None,
+) -> None:
+    """
+    把 chunk 依序串流寫進 pattern/ 下的各檔案，記憶體只留一個 chunk。
+    bin_filename 有給時，同時寫一份二進位容器（pattern_io.BinaryPatternWriter）。
+    """
+    os.makedirs("pattern", exist_ok=True)
+    files = [open(os.path.join("pattern", name), "w") for name in filenames]
+    writer = BinaryPatternWriter(os.path.join("pattern", bin_filename)) if bin_filename else None
+    try:
+        for texts, records in chunks:
+            for f, text in zip(files, texts):
+                f.write(text)
+            if writer is not None:
+                for record in records:
+                    writer.append(*record)
+    finally:
+        for f in files:
+            f.close()
+        if writer is not None:
+            writer.close()
+
+
+def resolve_seed(seed: Optional[int]) -> Optional[int]:
+    """workers 模式需要一個確定的 seed；沒給就隨機抽一個。"""
+    return seed if seed is not None else random.SystemRandom().getrandbits(64)
 
 
 # ------------------------------------------------------------
@@ -329,6 +602,9 @@ def write_bch_test_files(
     pa_filename: str = "pa.txt",
     seed: Optional[int] = None,
     soft: bool = False,
+    workers: Optional[int] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    bin_filename: Optional[str] = None,
 ) -> None:
     """
     產生只含單一 (m, mode) 的測資，寫到 pattern/ 裡：
@@ -336,26 +612,29 @@ def write_bch_test_files(
 
     soft = False -> hard decision 測資 (最多 t 個錯)
     soft = True  -> soft decision 測資 (最多 t+2 個錯)
-    """
-    os.makedirs("pattern", exist_ok=True)
-    if seed is not None:
-        random.seed(seed)
 
-    all_p_rows: List[str] = []
-    all_pa_lines: List[str] = []
+    workers = None -> 舊版序列產生（全域 random，與既有測資相同）
+    workers >= 1   -> 分成 chunk_size 個 codeword 一塊，每塊由 seed 導出
+                      自己的 seed，用 workers 個 process 平行產生；
+                      同一個 seed 不論 workers 多少，輸出都相同
+    兩種模式都邊產生邊寫檔，不會把整份測資留在記憶體裡。
 
-    for _ in range(num_codewords):
-        p_rows_one, pa_one = generate_single_bch_codeword(m, soft)
-        all_p_rows.extend(p_rows_one)
-        all_pa_lines.extend(pa_one)
+    bin_filename: 額外寫一份二進位容器（int8 LLR + code/mode + 錯誤位置），
+                  可用 pattern_io.BinaryPatternFile 讀取，或用
+                  pattern_io.binary_to_text 轉回 $readmemb 文字檔
+    """
+    if m not in BCH_SPECS:
+        raise ValueError(f"Unsupported m={m}")
 
-    with open(os.path.join("pattern", p_filename), "w") as f:
-        f.write("\n".join(all_p_rows))
-        f.write("\n")
+    if workers is None:
+        if seed is not None:
+            random.seed(seed)
+        chunks = iter_serial_chunks(m, soft, num_codewords, bin_filename is not None)
+    else:
+        chunks = iter_chunks(m, soft, num_codewords, resolve_seed(seed), workers,
+                             chunk_size, bin_filename is not None)
 
-    with open(os.path.join("pattern", pa_filename), "w") as f:
-        f.write("\n".join(all_pa_lines))
-        f.write("\n")
+    write_chunks([p_filename, pa_filename], chunks, bin_filename)
 
 
 # ------------------------------------------------------------
@@ -368,6 +647,9 @@ def write_bch_mixed_test_files(
     pmode_filename: str = "pmode.txt",
     pcode_filename: str = "pcode.txt",
     seed: Optional[int] = None,
+    workers: Optional[int] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    bin_filename: Optional[str] = None,
 ) -> None:
     """
     產生「混和規格」的測資：
@@ -377,47 +659,18 @@ def write_bch_mixed_test_files(
 
     p.txt  : 所有 codeword 的 LLR rows 串在一起
     pa.txt : 所有 codeword 的錯誤位置 (10 bits) 串在一起
-    """
-    os.makedirs("pattern", exist_ok=True)
-    if seed is not None:
-        random.seed(seed)
 
-    all_p_rows: List[str] = []
-    all_pa_lines: List[str] = []
-    pmode_lines: List[str] = []
-    pcode_lines: List[str] = []
-
-    for _ in range(num_codewords):
-        # 隨機選 mode: 0=hard, 1=soft
-        soft = bool(random.getrandbits(1))
-        pmode_lines.append("1" if soft else "0")
-
-        # 隨機選 m ∈ {6,8,10}
-        m_choice = random.choice([6, 8, 10])
-        pcode_lines.append(PCODE_MAP[m_choice])
-
-        # 產生這個 codeword 的測資
-        p_rows_one, pa_one = generate_single_bch_codeword(m_choice, soft)
-
-        all_p_rows.extend(p_rows_one)
-        all_pa_lines.extend(pa_one)
-
-    # 寫檔
-    with open(os.path.join("pattern", p_filename), "w") as f:
-        f.write("\n".join(all_p_rows))
-        f.write("\n")
-
-    with open(os.path.join("pattern", pa_filename), "w") as f:
-        f.write("\n".join(all_pa_lines))
-        f.write("\n")
-
-    with open(os.path.join("pattern", pmode_filename), "w") as f:
-        f.write("\n".join(pmode_lines))
-        f.write("\n")
+    workers / chunk_size / bin_filename 的意義同 write_bch_test_files。
+    """
+    if workers is None:
+        if seed is not None:
+            random.seed(seed)
+        chunks = iter_serial_chunks(None, False, num_codewords, bin_filename is not None)
+    else:
+        chunks = iter_chunks(None, False, num_codewords, resolve_seed(seed), workers,
+                             chunk_size, bin_filename is not None)
 
-    with open(os.path.join("pattern", pcode_filename), "w") as f:
-        f.write("\n".join(pcode_lines))
-        f.write("\n")
+    write_chunks([p_filename, pa_filename, pmode_filename, pcode_filename], chunks, bin_filename)
 
 
 # ------------------------------------------------------------
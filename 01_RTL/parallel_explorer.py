@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+L-Parallel Syndrome / Chien Architecture Explorer
+
+bch.v takes 8 LLRs per cycle (idata[63:0]), so its syndrome and Chien
+units are 8-parallel. This script models both units for any parallelism
+L and reports, per code:
+- XOR gates of the constant-multiplier logic, without sharing and after
+  common-subexpression elimination (xor_network.cse_network)
+- XOR depth of the shared network
+- cycles per codeword for the bch.v schedule with L-parallel units
+
+Syndrome unit (Horner, L bits per cycle, highest position first):
+    S_j <- S_j * alpha^(jL) + sum_{i=0}^{L-1} r_i * alpha^(j(L-1-i))
+All 2t syndromes are computed, as in bch.v; the r-side terms are shared
+across syndromes.
+
+Chien unit (L positions per cycle):
+    sigma(alpha^l x) = lambda_0 + sum_k lambda_k alpha^(kl),  l = 0 .. L-1
+    lambda_k <- lambda_k * alpha^(kL)
+The bank {alpha^(kl)} of each register is shared; the t-term sums and
+the m-input zero detectors are counted separately.
+"""
+
+import math
+from collections import namedtuple
+
+import numpy as np
+
+from bch_decoders import BCH_PARAMS, get_field
+from xor_network import const_mult_matrix, cse_network, xor_count_naive
+
+UnitCost = namedtuple('UnitCost', ['xor_naive', 'xor_cse', 'depth', 'adder_xor', 'or_gates'])
+UnitCost.__doc__ = """Gate estimate of one L-parallel unit
+
+    xor_naive: Constant-multiplier XORs without sharing
+    xor_cse: Constant-multiplier XORs after CSE
+    depth: XOR levels of the shared network
+    adder_xor: XORs of GF additions outside the constant network
+    or_gates: 2-input OR gates (zero detection)
+"""
+
+# bch.v schedule around the syndrome / Chien passes (see bch_model.py)
+LOAD_TAIL_CYCLES = 3                    # S_LOAD after the last row
+BER_HARD_CYCLES = {1: 1, 2: 1, 3: 17}   # closed form t=2, 16 + 1 steps for t=4
+BER_SOFT_CYCLES = {1: 9, 2: 9, 3: 17}   # ber_cnt_max + 1
+CORR_CYCLES = {1: 2, 2: 2, 3: 1}
+
+
+def syndrome_matrix(gf, t, L):
+    """
+    Binary matrix of one L-parallel syndrome step
+
+    Inputs are [r_0 .. r_{L-1}, S_1 bits, .., S_2t bits] (r_0 is the
+    highest position of the step), outputs [S_1 bits, .., S_2t bits].
+
+    Returns:
+        uint8 array [2t*m, L + 2t*m]
+    """
+    m = gf.m
+    M = np.zeros((2 * t * m, L + 2 * t * m), dtype=np.uint8)
+    for j in range(1, 2 * t + 1):
+        rows = slice((j - 1) * m, j * m)
+        for i in range(L):
+            v = gf.alpha_power(j * (L - 1 - i))
+            M[rows, i] = (v >> np.arange(m)) & 1
+        cols = slice(L + (j - 1) * m, L + j * m)
+        M[rows, cols] = const_mult_matrix(gf, j * L)
+    return M
+
+
+def chien_bank_matrix(gf, k, L):
+    """
+    Constant bank of Chien register k: lambda_k * alpha^(kl), l = 1 .. L
+
+    The l = L product is the register update; l = 0 is the register itself.
+
+    Returns:
+        uint8 array [L*m, m]
+    """
+    return np.concatenate([const_mult_matrix(gf, k * l) for l in range(1, L + 1)])
+
+
+def syndrome_unit_cost(code_type, L):
+    """UnitCost of the L-parallel syndrome unit of a code"""
+    params = BCH_PARAMS[code_type]
+    gf = get_field(params['m'])
+    M = syndrome_matrix(gf, params['t'], L)
+    net = cse_network(M)
+    return UnitCost(xor_count_naive(M), len(net.gates), net.depth, 0, 0)
+
+
+def chien_unit_cost(code_type, L):
+    """UnitCost of the L-parallel Chien unit of a code"""
+    params = BCH_PARAMS[code_type]
+    m, t = params['m'], params['t']
+    gf = get_field(m)
+    naive = cse = depth = 0
+    for k in range(1, t + 1):
+        M = chien_bank_matrix(gf, k, L)
+        net = cse_network(M)
+        naive += xor_count_naive(M)
+        cse += len(net.gates)
+        depth = max(depth, net.depth)
+    # Per position: t GF additions of m bits, m-input zero detector
+    return UnitCost(naive, cse, depth, L * t * m, L * (m - 1))
+
+
+def codeword_cycles(code_type, mode, L_syndrome, L_chien=None):
+    """
+    Worst-case busy cycles per codeword of the bch.v schedule
+
+    Counts S_IDLE, S_LOAD (one bus word of L_syndrome LLRs per cycle), the
+    BM step(s), full Chien passes without early exit and t (hard) or
+    t + 2 (soft) output cycles.
+
+    Args:
+        code_type: 1, 2 or 3
+        mode: 'hard' or 'soft'
+        L_syndrome: LLRs per input cycle
+        L_chien: Positions per Chien cycle (default: L_syndrome)
+
+    Returns:
+        Cycles from `set` until the FSM is idle again
+    """
+    params = BCH_PARAMS[code_type]
+    t = params['t']
+    L_chien = L_chien or L_syndrome
+    words = 1 << params['m']
+    load = math.ceil(words / L_syndrome) + LOAD_TAIL_CYCLES
+    chien = math.ceil(words / L_chien) + 1
+    if mode == 'hard':
+        return 1 + load + BER_HARD_CYCLES[code_type] + chien + 1 + t
+    return (1 + load + 2 * (BER_SOFT_CYCLES[code_type] + chien)
+            + CORR_CYCLES[code_type] + 1 + 2 + t + 2)
+
+
+def explore(code_type, parallelism, period_ns=5.0):
+    """
+    Cost and throughput per parallelism L
+
+    Returns:
+        List of dicts with 'L', 'syndrome' / 'chien' (UnitCost),
+        'cycles_hard', 'cycles_soft' and 'mbps_hard', 'mbps_soft'
+        (information bits at one codeword per busy period)
+    """
+    k = BCH_PARAMS[code_type]['k']
+    rows = []
+    for L in parallelism:
+        row = {'L': L, 'syndrome': syndrome_unit_cost(code_type, L),
+               'chien': chien_unit_cost(code_type, L)}
+        for mode in ('hard', 'soft'):
+            cycles = codeword_cycles(code_type, mode, L)
+            row[f'cycles_{mode}'] = cycles
+            row[f'mbps_{mode}'] = k / (cycles * period_ns) * 1e3
+        rows.append(row)
+    return rows
+
+
+if __name__ == "__main__":
+    import sys
+
+    code_types = list(BCH_PARAMS)
+    parallelism = [1, 2, 4, 8, 16, 32]
+    period = 5.0
+    for arg in sys.argv[1:]:
+        if arg in ['-h', '--help', 'help']:
+            print(f"Usage: {sys.argv[0]} [code_type|all] [L=1,2,4,8,16,32] [cycle=5.0]")
+            print()
+            print("XOR cost (no sharing / after CSE, depth) of L-parallel syndrome and")
+            print("Chien units and worst-case cycles per codeword of the bch.v schedule.")
+            sys.exit(0)
+        elif arg.startswith('L='):
+            parallelism = [int(x) for x in arg[2:].split(',')]
+        elif arg.startswith('cycle='):
+            period = float(arg[6:])
+        elif arg == 'all':
+            code_types = list(BCH_PARAMS)
+        elif arg.isdigit():
+            code_types = [int(arg)]
+        else:
+            print(f"Unknown argument: {arg}")
+            sys.exit(1)
+
+    for code_type in code_types:
+        params = BCH_PARAMS[code_type]
+        print("=" * 78)
+        print(f"({params['n']}, {params['k']}) BCH, GF(2^{params['m']}), t={params['t']}, "
+              f"{period} ns/cycle")
+        print("=" * 78)
+        print(f"{'L':>4} | {'syndrome XOR':>18} {'dep':>3} | {'Chien XOR':>18} {'dep':>3} "
+              f"{'add':>5} | {'cyc hard':>8} {'soft':>5} | {'Mb/s hard':>9} {'soft':>7}")
+        print("-" * 78)
+        for row in explore(code_type, parallelism, period):
+            syn, chien = row['syndrome'], row['chien']
+            print(f"{row['L']:>4} | {syn.xor_naive:>8} -> {syn.xor_cse:>6} {syn.depth:>3} | "
+                  f"{chien.xor_naive:>8} -> {chien.xor_cse:>6} {chien.depth:>3} "
+                  f"{chien.adder_xor:>5} | {row['cycles_hard']:>8} {row['cycles_soft']:>5} | "
+                  f"{row['mbps_hard']:>9.1f} {row['mbps_soft']:>7.1f}")
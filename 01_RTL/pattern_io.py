@@ -0,0 +1,403 @@
+#!/usr/bin/env python3
+"""
+BCH Pattern File I/O
+
+Streaming readers for the testbench pattern files written by gen_pattern.py:
+- p*.txt      : 64-bit rows, 8 signed 8-bit LLRs per row, MSB-first from
+                X^(2^m-1) down to X^0, 2^m/8 rows per codeword
+- p*a.txt     : 10-bit error positions (1023 = no error)
+- pcode*.txt  : per-codeword code, 01 = m=6, 10 = m=8, 11 = m=10
+- pmode*.txt  : per-codeword mode, 0 = hard, 1 = soft
+
+Records are parsed a whole row block at a time with NumPy, so arbitrarily
+large files are processed with constant memory.
+
+The same data can also be stored in a packed binary container (*.bin):
+
+    header   64 bytes, see HEADER_DTYPE
+    data     int8 LLRs of every codeword in p*.txt order (2^m bytes each)
+    index    one INDEX_DTYPE entry per codeword
+    errors   uint16 error positions of every codeword, ascending
+
+BinaryPatternFile memory-maps a container and hands out zero-copy views;
+binary_to_text regenerates the $readmemb files for the testbench.
+"""
+
+import os
+import re
+from array import array
+from collections import namedtuple
+from itertools import islice
+
+import numpy as np
+
+from bch_decoders import BCH_PARAMS
+
+# Rows of 64 bits per codeword: 2^m LLRs / 8 per row
+CODE_ROWS = {ct: (1 << params['m']) // 8 for ct, params in BCH_PARAMS.items()}
+
+# pcode.txt entry -> code_type
+PCODE_TO_TYPE = {'01': 1, '10': 2, '11': 3}
+
+# pmode.txt entry -> decoding mode
+PMODE_TO_MODE = {'0': 'hard', '1': 'soft'}
+
+# Answer value written when a codeword has no errors
+NO_ERROR = 1023
+
+# Binary container layout (little-endian)
+BINARY_MAGIC = b'BCHPAT\x00\x01'
+BINARY_VERSION = 1
+HEADER_SIZE = 64
+HEADER_DTYPE = np.dtype([
+    ('magic', 'S8'),
+    ('version', '<u4'),
+    ('reserved', '<u4'),
+    ('count', '<u8'),            # number of codewords
+    ('index_offset', '<u8'),     # byte offset of the index table
+    ('errors_offset', '<u8'),    # byte offset of the error position table
+    ('errors_count', '<u8'),     # number of uint16 error positions
+])
+INDEX_DTYPE = np.dtype([
+    ('offset', '<u8'),           # byte offset of the codeword's LLRs
+    ('err_start', '<u4'),        # first entry in the error table
+    ('code_type', 'u1'),         # 1, 2 or 3
+    ('mode', 'u1'),              # 0 = hard, 1 = soft
+    ('num_errors', 'u1'),
+    ('reserved', 'u1'),
+])
+MODE_CODES = {'hard': 0, 'soft': 1}
+
+LLRRecord = namedtuple('LLRRecord', ['code_type', 'r', 'llr', 'mode'])
+LLRRecord.__doc__ = """One codeword of a pattern file
+
+    code_type: 1, 2 or 3 (see BCH_PARAMS)
+    r: uint8 array [n], hard decision, r[j] = coefficient of X^j
+    llr: int8 array [2^m], same indexing as parse_llr_input
+         (llr[0] is the dummy X^n, llr[i] belongs to r[n-i])
+    mode: 'hard' or 'soft'
+"""
+
+
+def pattern_config(pattern):
+    """
+    (code_type, mode) the testbench uses for PATTERN number `pattern`
+
+    Mirrors test.v: <=100 code 1 hard, <=200 code 2 hard, <=300 code 3 hard,
+    <=400/500/600 the same codes in soft mode. Larger numbers are mixed
+    sets driven by pcode/pmode files and return None.
+    """
+    if pattern > 600:
+        return None
+    code_type = (max(pattern, 1) - 1) // 100 % 3 + 1
+    mode = 'soft' if pattern > 300 else 'hard'
+    return code_type, mode
+
+
+def pattern_number(path):
+    """PATTERN number from a file name like p300.txt, or None"""
+    match = re.match(r'p(\d+)', os.path.basename(path))
+    return int(match.group(1)) if match else None
+
+
+def iter_data_lines(path):
+    """Yield the non-empty, stripped lines of a text file"""
+    with open(path) as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                yield line
+
+
+def llr_rows_to_array(rows):
+    """
+    Parse 64-character '0'/'1' rows into signed 8-bit LLRs in file order
+
+    Returns:
+        int8 array of length 8 * len(rows)
+    """
+    if any(len(row) != 64 for row in rows):
+        raise ValueError("LLR rows must be exactly 64 bits wide")
+    bits = np.frombuffer(''.join(rows).encode('ascii'), dtype=np.uint8) - ord('0')
+    if bits.size and bits.max() > 1:
+        raise ValueError("LLR rows may only contain '0' and '1'")
+    return np.packbits(bits.reshape(-1, 64), axis=1).view(np.int8).reshape(-1)
+
+
+def llr_rows_text(llr):
+    """
+    Inverse of llr_rows_to_array: int8 LLRs in file order -> p*.txt text
+
+    Args:
+        llr: int8 array whose size is a multiple of 8, in file order
+
+    Returns:
+        64-character '0'/'1' rows, each terminated by a newline
+    """
+    bits = np.unpackbits(np.ascontiguousarray(llr).view(np.uint8).reshape(-1, 8), axis=1)
+    lines = np.empty((bits.shape[0], 65), dtype=np.uint8)
+    lines[:, :64] = bits + np.uint8(ord('0'))
+    lines[:, 64] = ord('\n')
+    return lines.tobytes().decode('ascii')
+
+
+def llr_to_received(llr, n):
+    """Hard decision r (uint8 [n]) from one codeword's LLRs, as parse_llr_input"""
+    return (llr[1:n + 1] < 0)[::-1].astype(np.uint8)
+
+
+def iter_llr_records(p_path, code_type=None, mode=None,
+                     pcode_path=None, pmode_path=None, block_records=256):
+    """
+    Stream the codewords of a (possibly multi-GB) pattern file
+
+    The code of each codeword comes from code_type, else from pcode_path,
+    else from the file name (p100.txt ... p600.txt); a given code_type
+    overrides pcode_path. The mode comes from mode, else pmode_path, else
+    the file name, else 'hard'. A side file with fewer entries than the
+    pattern file has codewords raises ValueError.
+
+    Args:
+        p_path: Pattern file (p*.txt)
+        code_type: Fixed code type for every codeword (1, 2 or 3)
+        mode: Fixed mode for every codeword ('hard' or 'soft')
+        pcode_path: pcode*.txt side file with one code per codeword
+        pmode_path: pmode*.txt side file with one mode per codeword
+        block_records: Codewords parsed per NumPy block for fixed-code files
+
+    Yields:
+        LLRRecord(code_type, r, llr, mode) per codeword
+    """
+    if code_type is not None:
+        pcode_path = None
+    if mode is not None:
+        pmode_path = None
+    number = pattern_number(p_path)
+    config = pattern_config(number) if number else None
+    if code_type is None and pcode_path is None:
+        if config is None:
+            raise ValueError(f"Cannot infer the code of {p_path}; pass code_type or pcode_path")
+        code_type = config[0]
+    if mode is None and pmode_path is None:
+        mode = config[1] if config is not None else 'hard'
+
+    lines = iter_data_lines(p_path)
+
+    if pcode_path is None and pmode_path is None:
+        # Fixed code and mode: parse many codewords per block
+        rows = CODE_ROWS[code_type]
+        n = BCH_PARAMS[code_type]['n']
+        while True:
+            block = list(islice(lines, rows * block_records))
+            if not block:
+                return
+            if len(block) % rows:
+                raise ValueError(f"{p_path}: truncated codeword at end of file")
+            llr_block = llr_rows_to_array(block).reshape(-1, 8 * rows)
+            for llr in llr_block:
+                yield LLRRecord(code_type, llr_to_received(llr, n), llr, mode)
+
+    codes = (PCODE_TO_TYPE[c] for c in iter_data_lines(pcode_path)) if pcode_path else None
+    modes = (PMODE_TO_MODE[c] for c in iter_data_lines(pmode_path)) if pmode_path else None
+
+    while True:
+        first = next(lines, None)
+        if first is None:
+            return
+        ct = next(codes, None) if codes is not None else code_type
+        md = next(modes, None) if modes is not None else mode
+        for value, side_path in ((ct, pcode_path), (md, pmode_path)):
+            if value is None:
+                raise ValueError(f"{side_path}: fewer entries than codewords in {p_path}")
+        rows = CODE_ROWS[ct]
+        block = [first] + list(islice(lines, rows - 1))
+        if len(block) < rows:
+            raise ValueError(f"{p_path}: truncated codeword at end of file")
+        llr = llr_rows_to_array(block)
+        yield LLRRecord(ct, llr_to_received(llr, BCH_PARAMS[ct]['n']), llr, md)
+
+
+class BinaryPatternWriter:
+    """
+    Stream codewords into a binary pattern container
+
+    Usage:
+        with BinaryPatternWriter("pattern/p.bin") as writer:
+            writer.append(code_type, mode, llr, error_positions)
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.file = open(path, 'wb')
+        self.file.write(bytes(HEADER_SIZE))
+        self.offset = HEADER_SIZE
+        self.index = []
+        self.errors = array('H')
+
+    def append(self, code_type, mode, llr, error_positions=()):
+        """
+        Append one codeword
+
+        Args:
+            code_type: 1, 2 or 3
+            mode: 'hard' or 'soft'
+            llr: int8 array [2^m] in file order (llr[0] is the dummy X^n)
+            error_positions: Expected error positions (empty for none)
+        """
+        llr = np.ascontiguousarray(llr, dtype=np.int8)
+        if llr.size != 8 * CODE_ROWS[code_type]:
+            raise ValueError(f"code {code_type} needs {8 * CODE_ROWS[code_type]} LLRs, got {llr.size}")
+        error_positions = sorted(error_positions)
+        self.index.append((self.offset, len(self.errors), code_type,
+                           MODE_CODES[mode], len(error_positions), 0))
+        self.errors.extend(error_positions)
+        self.file.write(llr.tobytes())
+        self.offset += llr.size
+
+    def close(self):
+        """Write the index and error tables and finalize the header"""
+        if self.file.closed:
+            return
+        index = np.array(self.index, dtype=INDEX_DTYPE)
+        index_offset = self.offset
+        errors_offset = index_offset + index.nbytes
+        self.file.write(index.tobytes())
+        self.file.write(self.errors.tobytes())
+
+        header = np.zeros(1, dtype=HEADER_DTYPE)
+        header[0] = (BINARY_MAGIC, BINARY_VERSION, 0, len(index),
+                     index_offset, errors_offset, len(self.errors))
+        self.file.seek(0)
+        self.file.write(header.tobytes())
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class BinaryPatternFile:
+    """
+    Memory-mapped, read-only view of a binary pattern container
+
+    llr(i) and errors(i) are zero-copy views into the mapping; records
+    are LLRRecords like the ones iter_llr_records yields.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.mm = np.memmap(path, dtype=np.uint8, mode='r')
+        header = self.mm[:HEADER_DTYPE.itemsize].view(HEADER_DTYPE)[0]
+        if header['magic'] != BINARY_MAGIC or header['version'] != BINARY_VERSION:
+            raise ValueError(f"{path}: not a binary pattern container")
+        count = int(header['count'])
+        index_offset = int(header['index_offset'])
+        errors_offset = int(header['errors_offset'])
+        self.index = self.mm[index_offset:index_offset + count * INDEX_DTYPE.itemsize].view(INDEX_DTYPE)
+        self.error_table = self.mm[errors_offset:errors_offset + 2 * int(header['errors_count'])].view('<u2')
+        self.data = self.mm[HEADER_SIZE:index_offset].view(np.int8)
+
+    def __len__(self):
+        return len(self.index)
+
+    def llr(self, i):
+        """int8 LLRs of codeword i in file order (view)"""
+        entry = self.index[i]
+        start = int(entry['offset']) - HEADER_SIZE
+        return self.data[start:start + 8 * CODE_ROWS[int(entry['code_type'])]]
+
+    def errors(self, i):
+        """Expected error positions of codeword i (view)"""
+        entry = self.index[i]
+        start = int(entry['err_start'])
+        return self.error_table[start:start + int(entry['num_errors'])]
+
+    def record(self, i):
+        """LLRRecord of codeword i"""
+        code_type = int(self.index[i]['code_type'])
+        llr = self.llr(i)
+        mode = 'soft' if self.index[i]['mode'] else 'hard'
+        return LLRRecord(code_type, llr_to_received(llr, BCH_PARAMS[code_type]['n']), llr, mode)
+
+    def __getitem__(self, i):
+        return self.record(i)
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self.record(i)
+
+
+def binary_to_text(bin_path, p_path, pa_path, pcode_path=None, pmode_path=None,
+                   block_bytes=1 << 20):
+    """
+    Regenerate the $readmemb text files from a binary pattern container
+
+    Args:
+        bin_path: Binary container
+        p_path, pa_path: Output pattern and answer files
+        pcode_path, pmode_path: Optional per-codeword code/mode files
+        block_bytes: LLR bytes formatted per write (multiple of 8)
+
+    Returns:
+        Number of codewords converted
+    """
+    pf = BinaryPatternFile(bin_path)
+    block_bytes -= block_bytes % 8
+
+    # Codewords are stored back to back in file order, so p*.txt is the
+    # data region formatted as 64-bit rows
+    with open(p_path, 'w') as f:
+        for start in range(0, pf.data.size, block_bytes):
+            f.write(llr_rows_text(pf.data[start:start + block_bytes]))
+
+    with open(pa_path, 'w') as f:
+        for i in range(len(pf)):
+            errors = pf.errors(i).tolist() or [NO_ERROR]
+            f.write(''.join(f"{pos:010b}\n" for pos in errors))
+
+    type_to_pcode = {ct: code for code, ct in PCODE_TO_TYPE.items()}
+    if pcode_path:
+        with open(pcode_path, 'w') as f:
+            f.write(''.join(type_to_pcode[ct] + '\n' for ct in pf.index['code_type'].tolist()))
+    if pmode_path:
+        with open(pmode_path, 'w') as f:
+            f.write(''.join(f"{md}\n" for md in pf.index['mode'].tolist()))
+
+    return len(pf)
+
+
+if __name__ == "__main__":
+    import sys
+
+    if len(sys.argv) < 2 or sys.argv[1] in ['-h', '--help', 'help']:
+        print(f"Usage: {sys.argv[0]} <p.txt | p.bin> [code_type] [pcode.txt pmode.txt]")
+        print(f"       {sys.argv[0]} --to-text <p.bin> <p.txt> <pa.txt> [pcode.txt pmode.txt]")
+        print()
+        print("Print one summary line per codeword of a pattern file, or convert")
+        print("a binary pattern container back to the testbench text files.")
+        sys.exit(0)
+
+    if sys.argv[1] == '--to-text':
+        count = binary_to_text(*sys.argv[2:7])
+        print(f"Wrote {count} codewords to {sys.argv[3]}")
+        sys.exit(0)
+
+    p_path = sys.argv[1]
+    kwargs = {}
+    if len(sys.argv) == 3:
+        kwargs['code_type'] = int(sys.argv[2])
+    elif len(sys.argv) == 4:
+        kwargs['pcode_path'], kwargs['pmode_path'] = sys.argv[2], sys.argv[3]
+
+    if p_path.endswith('.bin'):
+        records = BinaryPatternFile(p_path)
+    else:
+        records = iter_llr_records(p_path, **kwargs)
+
+    for idx, record in enumerate(records):
+        params = BCH_PARAMS[record.code_type]
+        ones = np.flatnonzero(record.r).tolist()
+        print(f"#{idx}: ({params['n']}, {params['k']}) {record.mode}, "
+              f"{len(ones)} ones in r: {ones if len(ones) <= 10 else '...'}")
@@ -14,6 +14,10 @@ Power representation: α^k for some k
 Note: In GF(2^m), every non-zero element can be expressed as α^k for some k.
 """
 
+import numpy as np
+
+from bch_decoders import cached
+
 # Primitive polynomials for each field
 PRIMITIVE_POLYS = {
     6: 0b1000011,      # 1 + X + X^6
@@ -104,6 +108,11 @@ class GaloisField:
         return " + ".join(terms)
 
 
+def get_field(m):
+    """Shared GaloisField for m, built once per process"""
+    return cached(('poly_to_power.field', m), lambda: GaloisField(m))
+
+
 def parse_poly_input(poly_str):
     """
     Parse polynomial input string to integer value
@@ -140,7 +149,7 @@ def poly_to_power(poly_input, m):
     if m not in PRIMITIVE_POLYS:
         raise ValueError(f"Unsupported field parameter m={m}. Supported: {list(PRIMITIVE_POLYS.keys())}")
     
-    gf = GaloisField(m)
+    gf = get_field(m)
     
     # Parse input
     if isinstance(poly_input, str):
@@ -157,6 +166,165 @@ def poly_to_power(poly_input, m):
         return f"α^{power}"
 
 
+# ============================================================================
+# STREAMING / BATCH CONVERSION
+# ============================================================================
+
+STREAM_FORMATS = ('auto', 'bin', 'hex', 'dec')
+STREAM_BLOCK = 65536
+
+
+def log_array(m):
+    """Shared NumPy log table of GF(2^m): log[v] = k with α^k = v, log[0] = -1"""
+    def build():
+        log = np.asarray(get_field(m).log_table, dtype=np.int32)
+        log[0] = -1
+        return log
+    return cached(('poly_to_power.log_array', m), build)
+
+
+def powers(values, m):
+    """
+    Vectorized poly -> power conversion
+
+    Args:
+        values: Integer array of polynomial values
+        m: field parameter
+
+    Returns:
+        int32 array of exponents; -1 for 0, -2 for values outside GF(2^m)
+    """
+    if m not in PRIMITIVE_POLYS:
+        raise ValueError(f"Unsupported field parameter m={m}. Supported: {list(PRIMITIVE_POLYS.keys())}")
+    values = np.asarray(values, dtype=np.int64)
+    valid = (values >= 0) & (values < (1 << m))
+    out = np.full(values.shape, -2, dtype=np.int32)
+    out[valid] = log_array(m)[values[valid]]
+    return out
+
+
+def parse_stream_value(token, fmt='auto'):
+    """Parse one value token; fmt 'auto' follows parse_poly_input"""
+    if fmt == 'bin':
+        return int(token[2:] if token[:2] in ('0b', '0B') else token, 2)
+    if fmt == 'hex':
+        return int(token, 16)
+    if fmt == 'dec':
+        return int(token)
+    return parse_poly_input(token)
+
+
+def parse_stream_line(line, m=None, fmt='auto'):
+    """
+    Parse one stream line into (m, value)
+
+    A line is '<value>' or '<m>:<value>'. Without a per-line or default m,
+    a plain binary string of 6, 8 or 10 digits selects m by its width.
+
+    Returns:
+        (m, value), or None for blank and '#' comment lines
+    """
+    text = line.strip()
+    if not text or text.startswith('#'):
+        return None
+    token = text.split()[0]
+    if ':' in token:
+        m_str, token = token.split(':', 1)
+        m = int(m_str)
+    value = parse_stream_value(token, fmt)
+    if m is None:
+        digits = token[2:] if token[:2] in ('0b', '0B') else token
+        if fmt in ('auto', 'bin') and len(digits) in PRIMITIVE_POLYS and set(digits) <= {'0', '1'}:
+            m = len(digits)
+        else:
+            raise ValueError(f"Cannot infer m for '{text}'; use m=N or '<m>:<value>'")
+    return m, value
+
+
+def power_labels(m):
+    """Shared list: power_labels(m)[v] = 'α^k' for v = α^k, '0' for v = 0"""
+    def build():
+        return ['0'] + [f"α^{k}" for k in log_array(m)[1:].tolist()]
+    return cached(('poly_to_power.labels', m), build)
+
+
+def _binary_block(tokens, m):
+    """
+    Fast path for a block of plain binary strings of one width
+
+    Returns:
+        (m, values array) or None if the block does not qualify
+    """
+    width = len(tokens[0])
+    if width < 2 or (m or width) not in PRIMITIVE_POLYS:
+        return None
+    if m and width > m:
+        # Wider than the given field: may hold values >= 2^m, which the
+        # per-line path reports as invalid
+        return None
+    if any(len(tok) != width for tok in tokens):
+        return None
+    digits = np.frombuffer(''.join(tokens).encode('ascii', 'replace'), dtype=np.uint8)
+    digits = digits.reshape(len(tokens), width) - ord('0')
+    if digits.max() > 1:
+        return None
+    weights = 1 << np.arange(width - 1, -1, -1, dtype=np.int64)
+    return (m or width), digits @ weights
+
+
+def convert_stream(lines, m=None, fmt='auto', block=STREAM_BLOCK):
+    """
+    Convert a stream of values to power form, block by block
+
+    Blocks of equal-width binary strings (the usual waveform dump) are
+    parsed with NumPy in one step; other lines are parsed one at a time.
+    Values are grouped by m and looked up in the shared log tables.
+
+    Args:
+        lines: Iterable of input lines
+        m: Default field parameter (None: per line, see parse_stream_line)
+        fmt: 'auto', 'bin', 'hex' or 'dec'
+        block: Lines converted per batch
+
+    Yields:
+        Output lines '<input>\tm=<m>\t<power>' (power 'α^k' or '0');
+        'invalid' replaces m and power for values that cannot be
+        converted. Blank and comment lines are passed through.
+    """
+    if fmt not in STREAM_FORMATS:
+        raise ValueError(f"Unknown format '{fmt}'. Supported: {list(STREAM_FORMATS)}")
+
+    lines = iter(lines)
+    while True:
+        chunk = [line.strip() for _, line in zip(range(block), lines)]
+        if not chunk:
+            return
+
+        fast = _binary_block(chunk, m) if fmt in ('auto', 'bin') else None
+        if fast is not None:
+            field_m, values = fast
+            labels = power_labels(field_m)
+            tag = f"\tm={field_m}\t"
+            for text, v in zip(chunk, values.tolist()):
+                yield text + tag + labels[v]
+            continue
+
+        for text in chunk:
+            try:
+                item = parse_stream_line(text, m, fmt)
+            except ValueError:
+                yield f"{text}\tinvalid"
+                continue
+            if item is None:
+                yield text
+                continue
+            field_m, value = item
+            if field_m not in PRIMITIVE_POLYS or not 0 <= value < (1 << field_m):
+                yield f"{text}\tinvalid"
+            else:
+                yield f"{text}\tm={field_m}\t{power_labels(field_m)[value]}"
+
+
 def main():
     """Interactive mode and examples"""
     print("=" * 60)
@@ -180,7 +348,7 @@ def main():
     print("-" * 60)
     
     for poly_str, m, desc in examples:
-        gf = GaloisField(m)
+        gf = get_field(m)
         poly_value = int(poly_str, 2)
         power = gf.poly_to_power(poly_value)
         poly_readable = gf.poly_str(poly_value)
@@ -199,7 +367,7 @@ def main():
     print("\n" + "=" * 60)
     print("GF(2^6) Element Table (first 20 elements)")
     print("=" * 60)
-    gf6 = GaloisField(6)
+    gf6 = get_field(6)
     print(f"{'Power':<12} {'Decimal':<10} {'Binary':<10} {'Polynomial':<20}")
     print("-" * 52)
     print(f"{'0':<12} {'0':<10} {'000000':<10} {'0':<20}")
@@ -211,7 +379,7 @@ def main():
     print("\n" + "=" * 60)
     print("GF(2^8) Element Table (first 20 elements)")
     print("=" * 60)
-    gf8 = GaloisField(8)
+    gf8 = get_field(8)
     print(f"{'Power':<12} {'Decimal':<10} {'Binary':<12} {'Polynomial':<25}")
     print("-" * 60)
     print(f"{'0':<12} {'0':<10} {'00000000':<12} {'0':<25}")
@@ -223,7 +391,7 @@ def main():
     print("\n" + "=" * 60)
     print("GF(2^10) Element Table (first 20 elements)")
     print("=" * 60)
-    gf10 = GaloisField(10)
+    gf10 = get_field(10)
     print(f"{'Power':<12} {'Decimal':<10} {'Binary':<14} {'Polynomial':<30}")
     print("-" * 66)
     print(f"{'0':<12} {'0':<10} {'0000000000':<14} {'0':<30}")
@@ -253,7 +421,7 @@ def interactive():
             
             result = poly_to_power(poly_str, m)
             
-            gf = GaloisField(m)
+            gf = get_field(m)
             poly_value = parse_poly_input(poly_str)
             poly_readable = gf.poly_str(poly_value)
             
@@ -272,12 +440,54 @@ def interactive():
 if __name__ == "__main__":
     import sys
     
-    if len(sys.argv) == 3:
+    if len(sys.argv) >= 2 and sys.argv[1] in ("-h", "--help"):
+        print(f"Usage: {sys.argv[0]} <poly> <m>          convert one value")
+        print(f"       {sys.argv[0]} -i                  interactive mode")
+        print(f"       {sys.argv[0]} -s [m=N] [fmt=auto|bin|hex|dec] [FILE|-] [out=FILE]")
+        print()
+        print("Streaming mode reads one value per line ('<value>' or '<m>:<value>')")
+        print("and appends m and the power form to each line.")
+    
+    elif len(sys.argv) >= 2 and sys.argv[1] in ("-s", "--stream"):
+        # Streaming mode: python script.py -s [m=N] [fmt=auto|bin|hex|dec] [FILE|-] [out=FILE]
+        def usage_error(message):
+            print(message)
+            print(f"Use '{sys.argv[0]} --help' for usage information.")
+            sys.exit(1)
+
+        m, fmt, src, dst = None, 'auto', '-', None
+        for arg in sys.argv[2:]:
+            if arg.startswith("m="):
+                if not arg[2:].isdigit() or int(arg[2:]) not in PRIMITIVE_POLYS:
+                    usage_error(f"Unsupported field parameter {arg}. "
+                                f"Supported: {list(PRIMITIVE_POLYS.keys())}")
+                m = int(arg[2:])
+            elif arg.startswith("fmt="):
+                if arg[4:] not in STREAM_FORMATS:
+                    usage_error(f"Unknown format '{arg[4:]}'. Supported: {list(STREAM_FORMATS)}")
+                fmt = arg[4:]
+            elif arg.startswith("out="):
+                dst = arg[4:]
+            else:
+                src = arg
+        
+        fin = sys.stdin if src == '-' else open(src)
+        fout = sys.stdout if dst is None else open(dst, 'w')
+        try:
+            for out_line in convert_stream(fin, m=m, fmt=fmt):
+                fout.write(out_line + "\n")
+        finally:
+            if fin is not sys.stdin:
+                fin.close()
+            if fout is not sys.stdout:
+                fout.close()
+    
+    elif len(sys.argv) == 3:
         # Command line mode: python script.py <poly> <m>
         poly_input = sys.argv[1]
         m = int(sys.argv[2])
         
-        gf = GaloisField(m)
+        gf = get_field(m)
         poly_value = parse_poly_input(poly_input)
         power = gf.poly_to_power(poly_value)
         poly_readable = gf.poly_str(poly_value)
@@ -0,0 +1,296 @@
+#!/usr/bin/env python3
+"""
+Syndrome-Indexed Lookup Decoder for the (63,51) Code
+
+The (63,51), t=2 code has only 2^12 syndromes: S1 and S3 are 6 bits each
+(S2 = S1^2 and S4 = S1^4 follow from S1). A table indexed by
+
+    key = S1 | (S3 << 6)
+
+holds the decoder outcome of every syndrome: the error pattern as a 63-bit
+mask, the error positions and the number of errors (-1 = uncorrectable).
+The table is built once from decode_bch_batch's stages (key-equation solver
++ Chien search) and cached on disk (TABLE_FILE next to this script).
+
+Decoding is then table-only: the key is linear in the received word, so it
+is the XOR of one KEY_BYTES lookup per byte of the packed 64-bit word,
+followed by one table hit and one XOR. decode_lookup_batch() gives the
+same success flags, corrections and error positions as
+decode_bch_batch(R, 1).
+
+verilog_rom() emits the table as a case ROM for a ROM-based decoder.
+"""
+
+import os
+
+import numpy as np
+
+from bch_decoders import (BCH_PARAMS, _gf_multiply_batch, cached, chien_search_batch,
+                          get_field, solve_key_equation_batch)
+
+CODE_TYPE = 1
+N = BCH_PARAMS[CODE_TYPE]['n']
+M = BCH_PARAMS[CODE_TYPE]['m']
+T = BCH_PARAMS[CODE_TYPE]['t']
+KEY_BITS = 2 * M
+NUM_KEYS = 1 << KEY_BITS
+
+TABLE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'syndrome_table_63.npz')
+TABLE_VERSION = 1
+
+
+def syndromes_from_keys(keys, gf):
+    """[S1, S2, S3, S4] of each key (S2 = S1^2, S4 = S2^2), shape [len(keys), 4]"""
+    keys = np.asarray(keys, dtype=np.int64)
+    S1 = keys & gf.n
+    S3 = keys >> M
+    S2 = _gf_multiply_batch(S1, S1, gf)
+    S4 = _gf_multiply_batch(S2, S2, gf)
+    return np.stack([S1, S2, S3, S4], axis=1)
+
+
+def build_table(solver='bm'):
+    """
+    Decoder outcome of every syndrome key
+
+    Runs the key-equation solver and Chien search of decode_bch_batch on
+    all 2^12 syndromes at once.
+
+    Returns:
+        Dict of arrays indexed by key:
+        'mask': uint64 error pattern (bit i = position i)
+        'locations': int8 [NUM_KEYS, t], ascending positions padded with -1
+        'num_errors': int8, -1 for uncorrectable syndromes
+    """
+    gf = get_field(M, use_tables=True)
+    keys = np.arange(NUM_KEYS)
+    S = syndromes_from_keys(keys, gf)
+
+    sigma, l, valid = solve_key_equation_batch(S[1:], gf, T, solver)
+    roots = chien_search_batch(sigma, gf, N)
+    found = roots.sum(axis=1)
+    ok = np.concatenate([[True], valid & (found == l) & (found <= T)])
+    roots = np.concatenate([np.zeros((1, N), dtype=bool), roots])
+
+    weights = np.uint64(1) << np.arange(N, dtype=np.uint64)
+    mask = np.where(ok, (roots * weights).sum(axis=1, dtype=np.uint64), 0).astype(np.uint64)
+    num_errors = np.where(ok, roots.sum(axis=1), -1).astype(np.int8)
+
+    locations = np.full((NUM_KEYS, T), -1, dtype=np.int8)
+    rows, cols = np.nonzero(roots & ok[:, None])
+    rank = np.arange(rows.size) - np.searchsorted(rows, rows)
+    locations[rows, rank] = cols
+    return {'mask': mask, 'locations': locations, 'num_errors': num_errors}
+
+
+def _table_valid(data):
+    return (int(data['version']) == TABLE_VERSION
+            and int(data['primitive_poly']) == get_field(M).primitive_poly
+            and data['mask'].shape == (NUM_KEYS,))
+
+
+def load_table(path=TABLE_FILE, rebuild=False):
+    """
+    The lookup table, read from path or built and written there
+
+    A missing, outdated or unreadable file is rebuilt; if path cannot be
+    written the freshly built table is still returned. The result is kept
+    in the process-wide cache.
+    """
+    def load():
+        if not rebuild and os.path.exists(path):
+            try:
+                with np.load(path) as data:
+                    if _table_valid(data):
+                        return {name: data[name] for name in ('mask', 'locations', 'num_errors')}
+            except (OSError, ValueError, KeyError):
+                pass
+        table = build_table()
+        try:
+            tmp = path + '.tmp.npz'
+            np.savez(tmp, version=TABLE_VERSION, primitive_poly=get_field(M).primitive_poly,
+                     **table)
+            os.replace(tmp, path)
+        except OSError:
+            pass
+        return table
+
+    if rebuild:
+        return load()
+    return cached(('syndrome_lookup', path), load)
+
+
+def key_byte_table():
+    """
+    KEY_BYTES[b, v]: key contribution of byte b of the packed word with value v
+
+    Byte b holds positions 8b .. 8b+7 (bit i of the byte = position 8b+i).
+    """
+    def build():
+        gf = get_field(M)
+        per_bit = np.zeros(64, dtype=np.uint16)
+        for pos in range(N):
+            per_bit[pos] = gf.alpha_power(pos) | (gf.alpha_power(3 * pos) << M)
+        values = np.arange(256)
+        table = np.zeros((8, 256), dtype=np.uint16)
+        for i in range(8):
+            hit = ((values >> i) & 1).astype(bool)
+            for b in range(8):
+                table[b, hit] ^= per_bit[8 * b + i]
+        return table
+    return cached(('syndrome_lookup.key_bytes',), build)
+
+
+def pack_words(R):
+    """[batch, 63] bits -> uint64 words, bit i = position i"""
+    R = np.asarray(R, dtype=np.uint8)
+    if R.ndim == 1:
+        R = R[None, :]
+    padded = np.zeros((R.shape[0], 64), dtype=np.uint8)
+    padded[:, :N] = R
+    return np.packbits(padded, axis=1, bitorder='little').view('<u8').ravel()
+
+
+def unpack_words(words):
+    """uint64 words -> [batch, 63] bits"""
+    data = np.ascontiguousarray(words, dtype='<u8').view(np.uint8).reshape(-1, 8)
+    return np.unpackbits(data, axis=1, bitorder='little')[:, :N]
+
+
+def syndrome_keys(words):
+    """Syndrome key of each packed word: XOR of one KEY_BYTES lookup per byte"""
+    table = key_byte_table()
+    data = np.ascontiguousarray(words, dtype='<u8').view(np.uint8).reshape(-1, 8)
+    keys = table[0][data[:, 0]]
+    for b in range(1, 8):
+        keys = keys ^ table[b][data[:, b]]
+    return keys
+
+
+def decode_lookup_packed(words, table=None):
+    """
+    Decode packed words with the lookup table only
+
+    Args:
+        words: uint64 array of received words (bit i = position i)
+        table: Result of load_table() (default: the cached one)
+
+    Returns:
+        success: bool array
+        corrected: uint64 array; failed words are returned unchanged
+        keys: Syndrome key of each word
+    """
+    if table is None:
+        table = load_table()
+    words = np.asarray(words, dtype=np.uint64)
+    keys = syndrome_keys(words)
+    success = table['num_errors'][keys] >= 0
+    return success, words ^ table['mask'][keys], keys
+
+
+def decode_lookup_batch(R, table=None):
+    """
+    Lookup decoding of [batch, 63] bit arrays
+
+    Returns:
+        success, num_errors, error_locations, corrected as decode_bch_batch(R, 1);
+        for failed words num_errors is 0 and error_locations is all -1
+        (decode_bch_batch reports the roots it found there)
+    """
+    if table is None:
+        table = load_table()
+    success, corrected, keys = decode_lookup_packed(pack_words(R), table)
+    num_errors = np.maximum(table['num_errors'][keys].astype(np.int64), 0)
+    locations = table['locations'][keys].astype(np.int64)
+    return success, num_errors, locations, unpack_words(corrected)
+
+
+def verilog_rom(table=None, name='syndrome_rom_63'):
+    """
+    Case ROM of the table: key (S3, S1) -> {ok, num[1:0], pos2[5:0], pos1[5:0]}
+
+    pos1 < pos2 are the error positions (0 when unused); ok = 0 marks an
+    uncorrectable syndrome.
+    """
+    if table is None:
+        table = load_table()
+    width = 1 + 2 + 2 * M
+    lines = [f"\t// (63,51) syndrome decoder ROM: key = {{S3, S1}}",
+             f"\t// -> {{ok, num[1:0], pos2[{M - 1}:0], pos1[{M - 1}:0]}}",
+             f"\tfunction automatic [{width - 1}:0] {name};",
+             f"\t\tinput [{KEY_BITS - 1}:0] key;",
+             "\t\tbegin",
+             "\t\t\tcase (key)"]
+    for key in range(NUM_KEYS):
+        num = int(table['num_errors'][key])
+        if num < 0:
+            continue
+        pos = [int(p) if p >= 0 else 0 for p in table['locations'][key]]
+        word = (1 << (width - 1)) | (num << (2 * M)) | (pos[1] << M) | pos[0]
+        lines.append(f"\t\t\t\t{KEY_BITS}'d{key}: {name} = {width}'b{word:0{width}b};")
+    lines.append(f"\t\t\t\tdefault: {name} = {width}'d0;")
+    lines += ["\t\t\tendcase", "\t\tend", "\tendfunction", ""]
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    import sys
+    import time
+
+    from bch_decoders import decode_bch_batch
+
+    if len(sys.argv) >= 2 and sys.argv[1] in ['-h', '--help', 'help']:
+        print(f"Usage: {sys.argv[0]} [options]")
+        print()
+        print("Options (key=value):")
+        print(f"  table=FILE   Table cache (default: {os.path.basename(TABLE_FILE)} next to this script)")
+        print("  rebuild=1    Rebuild the table even if the cache is valid")
+        print("  rom=FILE     Write the table as a Verilog case ROM")
+        print("  bench=N      Compare with decode_bch_batch on N random words (default: 100000)")
+        sys.exit(0)
+
+    options = {'table': TABLE_FILE, 'rebuild': '0', 'rom': None, 'bench': '100000'}
+    for arg in sys.argv[1:]:
+        key, _, value = arg.partition('=')
+        if key not in options or not value:
+            print(f"Unknown argument: {arg}")
+            sys.exit(1)
+        options[key] = value
+
+    start = time.time()
+    table = load_table(options['table'], rebuild=options['rebuild'] not in ('0', ''))
+    counts = np.bincount(table['num_errors'].astype(np.int64) + 1, minlength=T + 2)
+    print(f"Table: {NUM_KEYS} keys, {counts[1]} clean, "
+          + ", ".join(f"{counts[k + 1]} with {k} error(s)" for k in range(1, T + 1))
+          + f", {counts[0]} uncorrectable ({(time.time() - start) * 1e3:.1f} ms)")
+
+    if options['rom']:
+        with open(options['rom'], 'w') as f:
+            f.write(verilog_rom(table))
+        print(f"ROM written to {options['rom']}")
+
+    batch = int(options['bench'])
+    if batch:
+        rng = np.random.default_rng(0)
+        R = np.zeros((batch, N), dtype=np.uint8)
+        for b, count in enumerate(rng.integers(0, T + 3, batch)):
+            R[b, rng.choice(N, count, replace=False)] = 1
+
+        start = time.time()
+        expected = decode_bch_batch(R, CODE_TYPE)
+        t_bm = time.time() - start
+        start = time.time()
+        got = decode_lookup_batch(R, table)
+        t_lookup = time.time() - start
+        words = pack_words(R)
+        start = time.time()
+        decode_lookup_packed(words, table)
+        t_packed = time.time() - start
+
+        same = (np.array_equal(expected[0], got[0])
+                and np.array_equal(expected[3], got[3])
+                and np.array_equal(np.where(expected[0][:, None], expected[2], 0),
+                                   np.where(got[0][:, None], got[2], 0)))
+        print(f"{batch} words: decode_bch_batch {t_bm:.3f} s, lookup {t_lookup:.3f} s, "
+              f"packed lookup {t_packed:.4f} s; results {'identical' if same else 'DIFFER'}")
+        sys.exit(0 if same else 1)
@@ -0,0 +1,367 @@
+#!/usr/bin/env python3
+"""
+VCD Trace Annotator for bch.v
+
+Streams a VCD dump (e.g. fsdb2vcd of the test.v waveform) and prints every
+value change of the selected GF registers as alpha^k, using the cached
+log tables of poly_to_power. The file is read line by line; only the
+current value of each signal is kept.
+
+The field of a value comes from the signal spec (`sig=S_r*:10`) or, by
+default, from the code register (code_r: 1 -> m=6, 2 -> m=8, 3 -> m=10).
+
+With a pattern file the annotator also checks each codeword against the
+golden decoder in bch_decoders.py:
+- syndromes: S_r[0][j] when state_r leaves S_LOAD, against S_(j+1)
+- sigma:     delta_r[0][i] when state_r enters S_CHI_HARD / S_CHI_SOFT1,
+             against the Berlekamp-Massey locator (up to the common scale
+             factor of the inversionless RTL update, i.e. delta / delta_0)
+Codewords are counted on every S_IDLE -> S_LOAD transition.
+"""
+
+import fnmatch
+import re
+from collections import namedtuple
+
+from bch_decoders import BCH_PARAMS, berlekamp_massey, compute_syndromes, get_field
+from poly_to_power import power_labels
+
+CODE_TO_M = {code: params['m'] for code, params in BCH_PARAMS.items()}
+
+# bch.v state encoding (see bch_model.py)
+S_IDLE = 0
+S_LOAD = 1
+S_CHI_HARD = 6
+S_CHI_SOFT1 = 7
+
+Change = namedtuple('Change', ['time', 'name', 'value', 'm'])
+
+_RANGE = re.compile(r'\[\d+:\d+\]$')
+
+
+def parse_signal_spec(spec):
+    """'pattern[:m]' -> (pattern, m or None)"""
+    pattern, _, m = spec.partition(':')
+    if m and not m.isdigit():
+        # A ':' inside a bit range, e.g. 'x[3:0]'
+        return spec, None
+    return pattern, int(m) if m else None
+
+
+class VcdReader:
+    """
+    Incremental VCD reader
+
+    read_header() collects the declarations in `names` (id_code -> list of
+    hierarchical names); iter_changes() then yields (time, id_code, value)
+    with value an int, or None for values containing x/z.
+    """
+
+    def __init__(self, f):
+        self.f = f
+        self.names = {}
+        self.time = 0
+
+    def read_header(self):
+        scope = []
+        for line in self.f:
+            tokens = line.split()
+            if not tokens:
+                continue
+            if tokens[0] == '$scope':
+                scope.append(tokens[2])
+            elif tokens[0] == '$upscope':
+                scope.pop()
+            elif tokens[0] == '$var':
+                id_code = tokens[3]
+                ref = _RANGE.sub('', ''.join(tokens[4:tokens.index('$end')]))
+                self.names.setdefault(id_code, []).append('.'.join(scope + [ref]))
+            elif tokens[0] == '$enddefinitions':
+                return
+
+    def iter_changes(self):
+        for line in self.f:
+            line = line.strip()
+            if not line:
+                continue
+            c = line[0]
+            if c == '#':
+                self.time = int(line[1:])
+            elif c in 'bB':
+                bits, id_code = line[1:].split()
+                yield self.time, id_code, int(bits, 2) if set(bits) <= {'0', '1'} else None
+            elif c in '01':
+                yield self.time, line[1:], int(c)
+            elif c in 'xXzZ':
+                yield self.time, line[1:], None
+            # $dumpvars / $end / $comment lines and real values are skipped
+
+
+def _short(name):
+    return name.rsplit('.', 1)[-1]
+
+
+def _match(name, patterns):
+    for pattern, m in patterns:
+        if fnmatch.fnmatchcase(name, pattern) or fnmatch.fnmatchcase(_short(name), pattern):
+            return True, m
+    return False, None
+
+
+def golden_intermediates(record):
+    """Golden syndromes and locator (or None if BM fails) of one LLRRecord"""
+    params = BCH_PARAMS[record.code_type]
+    gf = get_field(params['m'])
+    S = compute_syndromes(record.r.tolist(), gf, params['t'])
+    try:
+        sigma, _ = berlekamp_massey(S, gf, params['t'])
+    except ValueError:
+        sigma = None
+    return S, sigma
+
+
+def check_codeword(index, record, syndromes, sigma_regs):
+    """
+    Compare captured register values with the golden decoder
+
+    Args:
+        index: Codeword number
+        record: LLRRecord of the codeword
+        syndromes: {j: value} of S_(j+1) registers at the end of S_LOAD
+        sigma_regs: {i: value} of delta registers at the start of Chien
+
+    Returns:
+        List of mismatch messages (empty if all checked values agree)
+    """
+    params = BCH_PARAMS[record.code_type]
+    m, t = params['m'], params['t']
+    gf = get_field(m)
+    labels = power_labels(m)
+    S, sigma = golden_intermediates(record)
+    errors = []
+
+    for j, value in sorted(syndromes.items()):
+        if j < len(S) and value is not None and value != S[j]:
+            errors.append(f"codeword {index}: S{j + 1} rtl={labels[value & gf.n]} "
+                          f"golden={labels[S[j]]}")
+
+    if sigma is not None and sigma_regs and sigma_regs.get(0):
+        scale = gf.inverse(sigma_regs[0] & gf.n)
+        for i in range(t + 1):
+            value = sigma_regs.get(i)
+            if value is None:
+                continue
+            rtl = gf.multiply(value & gf.n, scale)
+            gold = sigma[i] if i < len(sigma) else 0
+            if rtl != gold:
+                errors.append(f"codeword {index}: sigma{i} rtl={labels[rtl]} "
+                              f"golden={labels[gold]}")
+    return errors
+
+
+def annotate(f, signals, code_signal='code_r', state_signal='state_r', default_m=None,
+             records=None, syndrome='S_r[0][{j}]', sigma='delta_r[0][{i}]'):
+    """
+    Annotate a VCD stream
+
+    Args:
+        f: Text file object of the VCD
+        signals: [(pattern, m or None), ...] of registers to print
+        code_signal, state_signal: Names of the code and FSM state registers
+        default_m: Field when neither the spec nor the code register gives one
+        records: Iterator of LLRRecords to check against (None: no checks)
+        syndrome, sigma: Register names with {j} / {i} for the checks
+
+    Yields:
+        ('change', Change) for every annotated value change, then
+        ('check', index, messages) per completed codeword if records given
+    """
+    reader = VcdReader(f)
+    reader.read_header()
+    ids = reader.names
+    annotated = {}
+    for id_code, names in ids.items():
+        for name in names:
+            hit, m = _match(name, signals)
+            if hit:
+                annotated[id_code] = (name, m)
+                break
+
+    def find(name):
+        for id_code, names in ids.items():
+            if any(n == name or _short(n) == name for n in names):
+                return id_code
+        return None
+
+    code_id = find(code_signal)
+    state_id = find(state_signal)
+    syn_ids = {}
+    sigma_ids = {}
+    if records is not None:
+        for j in range(8):
+            id_code = find(syndrome.format(j=j))
+            if id_code is not None:
+                syn_ids[id_code] = j
+        for i in range(7):
+            id_code = find(sigma.format(i=i))
+            if id_code is not None:
+                sigma_ids[id_code] = i
+
+    values = {}
+    code = None
+    state = None
+    index = -1
+    record = None
+    captured_syn, captured_sigma = {}, {}
+    pending = []
+
+    def flush():
+        """Resolve checkpoints once every change of a timestamp is applied"""
+        for kind in pending:
+            if kind == 'syndrome':
+                captured_syn.update({j: values.get(i) for i, j in syn_ids.items()})
+            elif kind == 'sigma':
+                captured_sigma.update({k: values.get(i) for i, k in sigma_ids.items()})
+        pending.clear()
+
+    def finish_codeword():
+        if record is not None and (captured_syn or captured_sigma):
+            return ('check', index, check_codeword(index, record, captured_syn, captured_sigma))
+        return None
+
+    last_time = None
+    for time, id_code, value in reader.iter_changes():
+        if time != last_time:
+            flush()
+            last_time = time
+        values[id_code] = value
+
+        if id_code == code_id:
+            code = value
+        if id_code == state_id:
+            if state == S_IDLE and value == S_LOAD and records is not None:
+                result = finish_codeword()
+                if result:
+                    yield result
+                index += 1
+                record = next(records, None)
+                captured_syn, captured_sigma = {}, {}
+            elif state == S_LOAD and value != S_LOAD:
+                pending.append('syndrome')
+            if value in (S_CHI_HARD, S_CHI_SOFT1) and state not in (S_CHI_HARD, S_CHI_SOFT1):
+                pending.append('sigma')
+            state = value
+
+        if id_code in annotated:
+            name, m = annotated[id_code]
+            if m is None:
+                m = CODE_TO_M.get(code, default_m)
+            yield ('change', Change(time, name, value, m))
+
+    flush()
+    if records is not None:
+        result = finish_codeword()
+        if result:
+            yield result
+
+
+def format_change(change):
+    """One annotated table row"""
+    if change.value is None:
+        text = 'x'
+    elif change.m is None:
+        text = '?'
+    elif change.value >> change.m:
+        text = f"out of GF(2^{change.m})"
+    else:
+        text = power_labels(change.m)[change.value]
+    raw = 'x' if change.value is None else f"{change.value:x}"
+    return f"{change.time:>12}  {_short(change.name):<20} {raw:>4}  {text}"
+
+
+if __name__ == "__main__":
+    import sys
+
+    from check_pattern import pattern_files
+    from bch_decoders import BCH_PARAMS
+    from pattern_io import iter_llr_records, pattern_config, pattern_number
+
+    if len(sys.argv) < 2 or sys.argv[1] in ['-h', '--help', 'help']:
+        print(f"Usage: {sys.argv[0]} <dump.vcd> [options]")
+        print()
+        print("Options (key=value, sig= may repeat):")
+        print("  sig=PATTERN[:m]       Registers to annotate (glob on the name, default S_r*, delta_r*)")
+        print("  m=N                   Field when code_r is not dumped")
+        print("  code=code_r           Code register (selects m per codeword)")
+        print("  state=state_r         FSM state register (codeword boundaries, checks)")
+        print("  pattern=N|p.txt       Check against the golden decoder (N = PATTERN number)")
+        print("  pcode=FILE pmode=FILE Side files for mixed patterns")
+        print("  pcode_type=1|2|3      Code of every codeword of pattern= (needed unless the")
+        print("                        file is p100 .. p600 or pcode= is given)")
+        print("  pattern_mode=hard|soft Mode of every codeword of pattern=")
+        print("  syndrome=S_r[0][{j}]  Syndrome registers, j = 0 .. 2t-1")
+        print("  sigma=delta_r[0][{i}] Locator registers, i = 0 .. t")
+        print("  quiet=1               Only print the checks")
+        sys.exit(0)
+
+    vcd_path = sys.argv[1]
+    signals = []
+    options = {'m': None, 'code': 'code_r', 'state': 'state_r', 'pattern': None,
+               'pcode': None, 'pmode': None, 'pcode_type': None, 'pattern_mode': None,
+               'syndrome': 'S_r[0][{j}]',
+               'sigma': 'delta_r[0][{i}]', 'quiet': '0'}
+    for arg in sys.argv[2:]:
+        key, _, value = arg.partition('=')
+        if key == 'sig':
+            signals.append(parse_signal_spec(value))
+        elif key in options:
+            options[key] = value
+        else:
+            print(f"Unknown argument: {arg}")
+            sys.exit(1)
+    if not signals:
+        signals = [('S_r*', None), ('delta_r*', None)]
+
+    code_type = options['pcode_type']
+    if code_type is not None:
+        if code_type not in [str(ct) for ct in BCH_PARAMS]:
+            print(f"Unknown pcode_type: {code_type} (use 1, 2 or 3)")
+            sys.exit(1)
+        code_type = int(code_type)
+    if options['pattern_mode'] not in (None, 'hard', 'soft'):
+        print(f"Unknown pattern_mode: {options['pattern_mode']} (use hard or soft)")
+        sys.exit(1)
+
+    records = None
+    if options['pattern']:
+        if options['pattern'].isdigit():
+            p_path, _, pcode, pmode = pattern_files(int(options['pattern']))
+        else:
+            p_path, pcode, pmode = options['pattern'], options['pcode'], options['pmode']
+        number = pattern_number(p_path)
+        if code_type is None and pcode is None and (not number or pattern_config(number) is None):
+            print(f"Cannot infer the code of {p_path}; pass pcode_type=1|2|3")
+            sys.exit(1)
+        records = iter(iter_llr_records(p_path, code_type=code_type, mode=options['pattern_mode'],
+                                        pcode_path=pcode, pmode_path=pmode))
+
+    quiet = options['quiet'] not in ('0', '')
+    checked = mismatched = 0
+    with open(vcd_path) as f:
+        for item in annotate(f, signals, options['code'], options['state'],
+                             int(options['m']) if options['m'] else None, records,
+                             options['syndrome'], options['sigma']):
+            if item[0] == 'change':
+                if not quiet:
+                    print(format_change(item[1]))
+            else:
+                _, index, messages = item
+                checked += 1
+                if messages:
+                    mismatched += 1
+                    for message in messages:
+                        print(f"MISMATCH {message}")
+
+    if records is not None:
+        print(f"Checked {checked} codeword(s): {mismatched} with mismatches")
+        sys.exit(1 if mismatched else 0)
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+GF(2^m) Constant Multipliers as XOR Networks
+
+Multiplication by a constant alpha^k is linear over GF(2): out = M_k in,
+with M_k an m x m binary matrix (column j = bits of alpha^(k+j)). A bank
+of such products, or any other GF(2)-linear map, is a binary matrix
+[outputs, inputs] whose rows are XORs of input bits.
+
+cse_network() implements such a matrix with 2-input XOR gates, sharing
+common subexpressions greedily: the pair of signals that appears together
+in the most rows becomes a new signal, until no pair is shared. Remaining
+row terms are combined shallowest-first. An optional depth bound keeps
+every output within a given number of XOR levels.
+"""
+
+from collections import namedtuple
+
+import numpy as np
+
+XorNetwork = namedtuple('XorNetwork', ['num_inputs', 'gates', 'outputs', 'depth'])
+XorNetwork.__doc__ = """2-input XOR network
+
+    num_inputs: Signals 0 .. num_inputs-1 are the inputs
+    gates: [(a, b), ...]; gate g drives signal num_inputs + g = a ^ b
+    outputs: Per output row the driving signal, or None for constant 0
+    depth: XOR levels on the critical path
+"""
+
+
+def const_mult_matrix(gf, k):
+    """
+    Binary matrix of multiplication by alpha^k in GF(2^m)
+
+    Args:
+        gf: GaloisField
+        k: Exponent (any integer, taken mod 2^m - 1)
+
+    Returns:
+        uint8 array [m, m]: out bit i = XOR of in bit j where M[i, j] = 1
+    """
+    cols = [gf.alpha_power(k + j) for j in range(gf.m)]
+    return ((np.array(cols)[None, :] >> np.arange(gf.m)[:, None]) & 1).astype(np.uint8)
+
+
+def xor_count_naive(M):
+    """XOR gates of a matrix without sharing: sum of (row weight - 1)"""
+    weights = np.asarray(M, dtype=np.int64).sum(axis=1)
+    return int(np.maximum(weights - 1, 0).sum())
+
+
+def min_depth(M):
+    """Lowest possible XOR depth of a matrix: ceil(log2(max row weight))"""
+    weight = int(np.asarray(M, dtype=np.int64).sum(axis=1).max(initial=0))
+    return max(weight - 1, 0).bit_length()
+
+
+def cse_network(M, max_depth=None):
+    """
+    Greedy common-subexpression XOR network for a binary matrix
+
+    Args:
+        M: Binary array [outputs, inputs]
+        max_depth: XOR depth every output must stay within (None: no
+                   limit, fewest gates). Raised to min_depth(M) if lower.
+                   A pair is only shared if every row using it can still
+                   be finished in time (sum of 2^depth of its terms at
+                   most 2^max_depth).
+
+    Returns:
+        XorNetwork
+    """
+    M = np.asarray(M, dtype=np.uint8)
+    num_outputs, num_inputs = M.shape
+    rows = M.astype(bool)
+    depth = [0] * num_inputs
+    gates = []
+    if max_depth is not None:
+        max_depth = max(max_depth, min_depth(M))
+        # Per-row room left below 2^max_depth (inputs have depth 0)
+        slack = (1 << max_depth) - rows.sum(axis=1).astype(np.int64)
+
+    while rows.shape[1] > 1:
+        # Pair co-occurrence counts; float32 goes through BLAS and is exact here
+        R = rows.astype(np.float32)
+        shared = np.triu((R.T @ R).astype(np.int64), 1)
+        d = np.asarray(depth)
+        pair_depth = np.maximum(d[:, None], d[None, :]) + 1
+
+        # Most shared pairs first, shallowest result among equals
+        choice = None
+        while choice is None:
+            best = shared.max() if shared.size else 0
+            if best < 2:
+                break
+            cand = np.argwhere(shared == best)
+            cand = cand[np.argsort(pair_depth[cand[:, 0], cand[:, 1]], kind='stable')]
+            for a, b in cand:
+                if max_depth is not None:
+                    cost = (1 << int(pair_depth[a, b])) - (1 << depth[a]) - (1 << depth[b])
+                    if cost > slack[rows[:, a] & rows[:, b]].min():
+                        shared[a, b] = 0
+                        continue
+                choice = (int(a), int(b))
+                break
+        if choice is None:
+            break
+
+        a, b = choice
+        gates.append((a, b))
+        depth.append(max(depth[a], depth[b]) + 1)
+        both = rows[:, a] & rows[:, b]
+        if max_depth is not None:
+            slack[both] -= (1 << depth[-1]) - (1 << depth[a]) - (1 << depth[b])
+        rows[both, a] = False
+        rows[both, b] = False
+        rows = np.concatenate([rows, both[:, None]], axis=1)
+
+    # Remaining terms of each row: XOR the two shallowest until one is left
+    outputs = []
+    for row in rows:
+        terms = sorted(np.flatnonzero(row).tolist(), key=lambda s: depth[s])
+        while len(terms) > 1:
+            a, b = terms.pop(0), terms.pop(0)
+            gates.append((a, b))
+            depth.append(max(depth[a], depth[b]) + 1)
+            terms.append(len(depth) - 1)
+            terms.sort(key=lambda s: depth[s])
+        outputs.append(terms[0] if terms else None)
+
+    net_depth = max((depth[s] for s in outputs if s is not None), default=0)
+    return XorNetwork(num_inputs, gates, outputs, net_depth)
+
+
+def evaluate_network(net, bits):
+    """
+    Evaluate an XorNetwork
+
+    Args:
+        net: XorNetwork
+        bits: Binary array [num_inputs] or [batch, num_inputs]
+
+    Returns:
+        uint8 array [outputs] or [batch, outputs]
+    """
+    bits = np.asarray(bits, dtype=np.uint8)
+    signals = list(np.moveaxis(bits, -1, 0))
+    for a, b in net.gates:
+        signals.append(signals[a] ^ signals[b])
+    zero = np.zeros_like(signals[0]) if signals else np.uint8(0)
+    return np.stack([signals[s] if s is not None else zero for s in net.outputs], axis=-1)